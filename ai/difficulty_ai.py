@@ -1,82 +1,38 @@
-import sqlite3
-from pathlib import Path
 from fastapi import APIRouter
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, Iterable, List, Optional
+
+from app.core.responses import model_json
+from app.services.pace_store import EMA_ALPHA, pace_store
 
 router = APIRouter(prefix="/ai", tags=["difficulty"])
 
 # =====================
 # 📌 DB (pace_factor)
 # =====================
-DB_PATH = Path(__file__).resolve().parents[1] / "study.db"  # Study_Manager/study.db
-
-
-def _ensure_pace_table(conn: sqlite3.Connection):
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS subject_pace (
-            subject_name TEXT PRIMARY KEY,
-            pace_factor REAL NOT NULL DEFAULT 1.0,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-        )
-        """
-    )
-    conn.commit()
-
+# 저장/캐시는 app.services.pace_store.PaceStore가 담당 (study.db의 subject_pace 테이블)
+# user_id=None → 로그인 없이 쓰는 공용 pace
 
-def get_pace_factor(subject_name: str) -> float:
-    conn = sqlite3.connect(DB_PATH)
-    _ensure_pace_table(conn)
-    cur = conn.cursor()
 
-    cur.execute(
-        "SELECT pace_factor FROM subject_pace WHERE subject_name = ?",
-        (subject_name,),
-    )
-    row = cur.fetchone()
+def get_pace_factor(subject_name: str, user_id: Optional[int] = None) -> float:
+    return pace_store.get(user_id, subject_name)
 
-    if row is None:
-        cur.execute(
-            "INSERT INTO subject_pace(subject_name, pace_factor) VALUES(?, ?)",
-            (subject_name, 1.0),
-        )
-        conn.commit()
-        pace = 1.0
-    else:
-        pace = float(row[0])
 
-    conn.close()
-    return pace
+def get_pace_factors(subject_names: Iterable[str], user_id: Optional[int] = None) -> Dict[str, float]:
+    """여러 과목을 한 번에 조회 (DB 왕복 최대 1번)"""
+    return pace_store.get_many(user_id, subject_names)
 
 
-def update_pace_factor(subject_name: str, avg_efficiency_ratio: float, alpha: float = 0.2) -> float:
+def update_pace_factor(
+    subject_name: str, avg_efficiency_ratio: float, alpha: float = EMA_ALPHA, user_id: Optional[int] = None
+) -> float:
     """
     EMA 업데이트:
       new = old*(1-alpha) + avg_efficiency_ratio*alpha
     alpha=0.2면 최근 기록 20% 반영(안정적)
     """
-    old = get_pace_factor(subject_name)
-    new = round(old * (1 - alpha) + avg_efficiency_ratio * alpha, 2)
-
-    conn = sqlite3.connect(DB_PATH)
-    _ensure_pace_table(conn)
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        INSERT INTO subject_pace(subject_name, pace_factor, updated_at)
-        VALUES(?, ?, CURRENT_TIMESTAMP)
-        ON CONFLICT(subject_name)
-        DO UPDATE SET pace_factor=excluded.pace_factor, updated_at=CURRENT_TIMESTAMP
-        """,
-        (subject_name, new),
-    )
-    conn.commit()
-    conn.close()
-
-    return new
+    changes = pace_store.update_ema_many(user_id, {subject_name: avg_efficiency_ratio}, alpha=alpha)
+    return changes[subject_name][1]
 
 
 # =====================
@@ -95,6 +51,20 @@ class DifficultyAdjustRequest(BaseModel):
     recent_records: List[StudyRecord]
 
 
+class DifficultyAdjustBatchRequest(BaseModel):
+    """하루 마감 때 과목 전체를 한 번에 조정"""
+    subjects: List[DifficultyAdjustRequest] = Field(..., min_length=1, max_length=200)
+
+    @field_validator("subjects")
+    @classmethod
+    def _unique_subjects(cls, v: List[DifficultyAdjustRequest]):
+        # 같은 과목이 두 번 오면 EMA 적용 순서가 모호하므로 막음
+        names = [s.subject_name for s in v]
+        if len(set(names)) != len(names):
+            raise ValueError("subject_name은 배치 안에서 중복될 수 없습니다.")
+        return v
+
+
 # =====================
 # 📌 출력 모델
 # =====================
@@ -114,11 +84,15 @@ class DifficultyAdjustResponse(BaseModel):
     message: str
 
 
+class DifficultyAdjustBatchResponse(BaseModel):
+    results: List[DifficultyAdjustResponse]  # 요청 순서
+
+
 # =====================
 # 📌 AI 로직
 # =====================
-@router.post("/adjust-difficulty", response_model=DifficultyAdjustResponse)
-def adjust_difficulty(request: DifficultyAdjustRequest):
+def _analyze(request: DifficultyAdjustRequest) -> dict:
+    """기록으로 효율 비율 / 페이지 보정 / 난이도 제안 계산 (DB 접근 없음)"""
     ratios = []
 
     for r in request.recent_records:
@@ -151,11 +125,27 @@ def adjust_difficulty(request: DifficultyAdjustRequest):
         difficulty_suggestion = "DOWN"
         suggested_difficulty = max(1, request.current_difficulty - 1)
 
-    # 3) pace_factor 업데이트 (과목 단위)
-    old_pace = get_pace_factor(request.subject_name)
-    new_pace = update_pace_factor(request.subject_name, avg_efficiency_ratio)
-
-    # 4) 메시지
+    return {
+        "avg_efficiency_ratio": avg_efficiency_ratio,
+        "page_multiplier": page_multiplier,
+        "latest_target_pages": latest_target_pages,
+        "recommended_target_pages": recommended_target_pages,
+        "difficulty_suggestion": difficulty_suggestion,
+        "suggested_difficulty": suggested_difficulty,
+    }
+
+
+def _build_response(
+    request: DifficultyAdjustRequest, analysis: dict, old_pace: float, new_pace: float
+) -> DifficultyAdjustResponse:
+    avg_efficiency_ratio = analysis["avg_efficiency_ratio"]
+    page_multiplier = analysis["page_multiplier"]
+    latest_target_pages = analysis["latest_target_pages"]
+    recommended_target_pages = analysis["recommended_target_pages"]
+    difficulty_suggestion = analysis["difficulty_suggestion"]
+    suggested_difficulty = analysis["suggested_difficulty"]
+
+    # 메시지
     message_parts = []
 
     delta_pages = recommended_target_pages - latest_target_pages
@@ -187,7 +177,8 @@ def adjust_difficulty(request: DifficultyAdjustRequest):
     elif difficulty_suggestion == "DOWN":
         message_parts.append("속도 격차가 매우 커서, 난이도를 한 단계 낮추는 것도 고려해볼 수 있어요.")
 
-    return DifficultyAdjustResponse(
+    # 직접 계산한 값이라 검증 없이 생성
+    return DifficultyAdjustResponse.model_construct(
         subject_name=request.subject_name,
         avg_efficiency_ratio=avg_efficiency_ratio,
         page_multiplier=page_multiplier,
@@ -198,3 +189,32 @@ def adjust_difficulty(request: DifficultyAdjustRequest):
         new_pace_factor=new_pace,
         message=" ".join(message_parts),
     )
+
+
+@router.post("/adjust-difficulty", response_model=DifficultyAdjustResponse)
+def adjust_difficulty(request: DifficultyAdjustRequest):
+    analysis = _analyze(request)
+
+    # pace_factor 업데이트 (과목 단위)
+    old_pace, new_pace = pace_store.update_ema_many(
+        None, {request.subject_name: analysis["avg_efficiency_ratio"]}
+    )[request.subject_name]
+
+    return model_json(_build_response(request, analysis, old_pace, new_pace))
+
+
+@router.post("/adjust-difficulty/batch", response_model=DifficultyAdjustBatchResponse)
+def adjust_difficulty_batch(request: DifficultyAdjustBatchRequest):
+    """
+    과목 여러 개를 한 번에 조정.
+    pace 조회는 IN 쿼리 1번, EMA 반영은 bulk UPDATE/INSERT를 한 트랜잭션(commit 1번)으로.
+    """
+    analyses = [_analyze(item) for item in request.subjects]
+    changes = pace_store.update_ema_many(
+        None, {item.subject_name: a["avg_efficiency_ratio"] for item, a in zip(request.subjects, analyses)}
+    )
+
+    return model_json(DifficultyAdjustBatchResponse.model_construct(results=[
+        _build_response(item, a, *changes[item.subject_name])
+        for item, a in zip(request.subjects, analyses)
+    ]))
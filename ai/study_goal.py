@@ -1,13 +1,20 @@
 from fastapi import FastAPI
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 
-from ai.difficulty_ai import get_pace_factor
+import numpy as np
+
+from ai.difficulty_ai import get_pace_factors
+from app.core.responses import ORJSONResponse, model_json, trusted_json
+from app.services.goal_batch import allocate_batch
+from app.services.pace_store import pace_store
 
 from ai.difficulty_ai import router as difficulty_router
 from ai.weekly_summary_ai import router as weekly_summary_router
 
-app = FastAPI(title="Study AI API")
+app = FastAPI(title="Study AI API", default_response_class=ORJSONResponse)
+
+# pace 테이블(subject_pace)은 `python -m app.migrations`로 생성
 
 app.include_router(difficulty_router)
 app.include_router(weekly_summary_router)
@@ -52,6 +59,21 @@ class DailyGoalResponse(BaseModel):
     total_minutes: int
     goals: List[SubjectGoal]
 
+# --- 배치 (여러 유저 한 번에) ---
+class DailyGoalBatchItem(DailyGoalRequest):
+    # 결과를 맞춰 보기 위한 표시용. 인증 없는 엔드포인트라 pace는 항상 공용 pace (단건 /ai/daily-goal과 동일)
+    # 유저별 pace는 인증된 경로(POST /study-goal/calculate, 야간 preplan)에서만 조회
+    user_id: Optional[int] = None
+
+class DailyGoalBatchRequest(BaseModel):
+    items: List[DailyGoalBatchItem] = Field(..., min_length=1, max_length=10000)
+
+class DailyGoalBatchResult(DailyGoalResponse):
+    user_id: Optional[int] = None
+
+class DailyGoalBatchResponse(BaseModel):
+    results: List[DailyGoalBatchResult]  # 요청 순서
+
 # =====================
 # 📌 헬스 체크
 # =====================
@@ -63,7 +85,12 @@ def ping():
 # 📌 AI: 하루 학습 목표량 계산
 # =====================
 @app.post("/ai/daily-goal", response_model=DailyGoalResponse)
-def calculate_daily_goal(request: DailyGoalRequest):
+def daily_goal(request: DailyGoalRequest):
+    # response_model 재검증 없이 바로 JSON으로 (app.core.responses)
+    return model_json(calculate_daily_goal(request))
+
+
+def calculate_daily_goal(request: DailyGoalRequest) -> DailyGoalResponse:
     """
     개선 포인트:
     - 시간 배분을 importance만 보지 않고 importance * total_pages로 가중치 부여
@@ -81,13 +108,16 @@ def calculate_daily_goal(request: DailyGoalRequest):
 
     goals: List[SubjectGoal] = []
 
+    # 과목별 개인 pace_factor는 한 번에 조회
+    paces = get_pace_factors(s.name for s in request.subjects)
+
     for subject, w in zip(request.subjects, weights):
         # 2) 분량+중요도 기반 시간 배분
         time_ratio = w / total_weight
         subject_minutes = request.total_minutes * time_ratio
 
         # 3) 난이도 + 개인 pace_factor 기반 학습 속도
-        pace = get_pace_factor(subject.name)  # 과목별 개인 속도 보정
+        pace = paces[subject.name]  # 과목별 개인 속도 보정
         pages_per_hour = PAGES_PER_HOUR_BY_DIFFICULTY[subject.difficulty] * pace
         pages_per_minute = pages_per_hour / 60
 
@@ -96,8 +126,9 @@ def calculate_daily_goal(request: DailyGoalRequest):
         raw_pages = round(subject_minutes * pages_per_minute)
         recommended_pages = min(raw_pages, subject.total_pages)
 
+        # 직접 계산한 값이라 검증 없이 생성 (model_construct)
         goals.append(
-            SubjectGoal(
+            SubjectGoal.model_construct(
                 name=subject.name,
                 study_minutes=round(subject_minutes),
                 recommended_pages=recommended_pages,
@@ -105,8 +136,66 @@ def calculate_daily_goal(request: DailyGoalRequest):
             )
         )
 
-    return DailyGoalResponse(
+    return DailyGoalResponse.model_construct(
         total_minutes=request.total_minutes,
         goals=goals
     )
 
+
+# =====================
+# 📌 AI: 여러 유저의 하루 목표를 한 번에 (NumPy)
+# =====================
+def _shared_paces(items: List[DailyGoalBatchItem]) -> dict:
+    """배치 전체 과목의 {과목명: 공용 pace}. 조회 1번 (item.user_id로 개인 pace를 읽지 않음)"""
+    return pace_store.get_many(None, {s.name for item in items for s in item.subjects})
+
+
+def plan_daily_goals(items: List[DailyGoalBatchItem]) -> List[dict]:
+    """
+    calculate_daily_goal과 같은 계산을 전체 배치의 과목을 한 배열로 펴서 한 번에.
+    반환: item 순서대로 {"user_id", "total_minutes", "goals": [...]} (과목 순서 유지)
+    """
+    paces = _shared_paces(items)
+    counts = [len(item.subjects) for item in items]
+    subjects = [s for item in items for s in item.subjects]
+
+    owner = np.repeat(np.arange(len(items)), counts)
+    pace = np.fromiter((paces[s.name] for s in subjects), float, len(subjects))
+    minutes, pages, _ = allocate_batch(
+        owner,
+        np.fromiter((item.total_minutes for item in items), float, len(items)),
+        np.fromiter((s.importance for s in subjects), float, len(subjects)),
+        np.fromiter((s.total_pages for s in subjects), float, len(subjects)),
+        np.fromiter((s.difficulty for s in subjects), np.int64, len(subjects)),
+        pace,
+    )
+
+    study_minutes = np.rint(minutes).astype(np.int64).tolist()
+    pages = pages.tolist()
+    pace_out = pace.tolist()
+
+    results = []
+    pos = 0
+    for item, n in zip(items, counts):
+        results.append({
+            "user_id": item.user_id,
+            "total_minutes": item.total_minutes,
+            "goals": [
+                {
+                    "name": subjects[i].name,
+                    "study_minutes": study_minutes[i],
+                    "recommended_pages": pages[i],
+                    "pace_factor": round(pace_out[i], 2),
+                }
+                for i in range(pos, pos + n)
+            ],
+        })
+        pos += n
+    return results
+
+
+@app.post("/ai/daily-goal/batch", response_model=DailyGoalBatchResponse)
+def calculate_daily_goal_batch(request: DailyGoalBatchRequest):
+    """여러 유저(또는 여러 요청)의 하루 목표를 한 번에 계산. 공용 pace 조회 1번."""
+    # 최대 1만 건 × 과목 수라 재검증 비용이 큼 → 계산 결과 dict를 바로 직렬화
+    return trusted_json({"results": plan_daily_goals(request.items)})
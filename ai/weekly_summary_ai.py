@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional
 
 from fastapi import APIRouter
+from fastapi.responses import Response
 from pydantic import BaseModel, Field, field_validator
 
+from app.core.responses import model_json
+
 # pace_factor는 difficulty_ai에서 관리(저장/업데이트). 주간요약에서는 "조회만" 한다.
 try:
-    from ai.difficulty_ai import get_pace_factor
+    from ai.difficulty_ai import get_pace_factors
 except Exception:
-    get_pace_factor = None  # type: ignore
+    get_pace_factors = None  # type: ignore
 
 
 router = APIRouter(prefix="/ai", tags=["weekly-summary"])
@@ -124,63 +127,136 @@ def _calc_efficiency_ratio(
     return _safe_div(actual_speed, target_speed)
 
 
-def _minutes_weighted_avg(pairs: List[Tuple[float, int]]) -> float:
-    """
-    (값, 가중치=분) minutes-weighted average
-    """
-    total_w = sum(w for _, w in pairs)
-    if total_w <= 0:
-        return 0.0
-    return sum(val * w for val, w in pairs) / total_w
-
-
-def _consistency_score(ratios: List[float]) -> float:
+def _consistency_from_var(var: float, n: int) -> float:
     """
     대충 '안정성' 점수:
     - ratio가 1.0 근처 + 변동 적을수록 높게
     - 표준편차 기반 간단 스코어(0~100)
     """
-    if not ratios:
+    if n <= 0:
         return 50.0
-    n = len(ratios)
-    mean = sum(ratios) / n
-    var = sum((x - mean) ** 2 for x in ratios) / n
-    std = var ** 0.5
+    std = max(var, 0.0) ** 0.5
 
     # std가 0이면 100, std가 0.5면 대략 0에 가깝게
     score = max(0.0, 100.0 - (std * 200.0))
     return _round2(score)
 
 
-def _trend_label(records_sorted: List[WeeklyStudyRecord]) -> str:
-    """
-    초반/후반(반으로 나눠) efficiency 비교해서 간단 트렌드.
-    """
-    if len(records_sorted) < 4:
-        return "UNKNOWN"
-
-    mid = len(records_sorted) // 2
-    first = records_sorted[:mid]
-    second = records_sorted[mid:]
-
-    def avg_eff(rs: List[WeeklyStudyRecord]) -> float:
-        pairs = []
-        for r in rs:
-            ratio = _calc_efficiency_ratio(r.target_pages, r.target_minutes, r.actual_pages, r.actual_minutes)
-            pairs.append((ratio, r.actual_minutes))
-        return _minutes_weighted_avg(pairs)
-
-    a = avg_eff(first)
-    b = avg_eff(second)
-
+def _trend_from_halves(first: float, second: float) -> str:
     # 5% 이상 차이 날 때만 의미있게
-    if b >= a * 1.05:
+    if second >= first * 1.05:
         return "UP"
-    if b <= a * 0.95:
+    if second <= first * 0.95:
         return "DOWN"
     return "FLAT"
 
 
+# =====================
+# 스트리밍 집계
+# =====================
+class _SubjectAccumulator:
+    """
+    과목 하나의 기록을 한 번씩만 보면서 주간 지표를 누적.
+    - 합계 / minutes-weighted efficiency: 누적합
+    - consistency: Welford 평균/분산 (ratio 목록을 따로 보관하지 않음)
+    - trend: 날짜별 [ratio*minutes 합, minutes 합, 기록 수]만 보관 (기록 수가 아니라 날짜 수만큼의 메모리)
+      초반/후반은 날짜 단위로 나눔: 날짜순 n//2번째 기록이 걸친 날짜는 기록이 더 많이 속한 쪽으로
+    """
+
+    __slots__ = ("t_min", "a_min", "t_pages", "a_pages", "w_sum", "rw_sum", "n", "mean", "m2", "by_date")
+
+    def __init__(self):
+        self.t_min = self.a_min = self.t_pages = self.a_pages = 0
+        self.w_sum = 0
+        self.rw_sum = 0.0
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.by_date: Dict[date, list] = {}
+
+    def add(self, r: WeeklyStudyRecord) -> float:
+        ratio = _calc_efficiency_ratio(r.target_pages, r.target_minutes, r.actual_pages, r.actual_minutes)
+        w = r.actual_minutes
+
+        self.t_min += r.target_minutes
+        self.a_min += w
+        self.t_pages += r.target_pages
+        self.a_pages += r.actual_pages
+        self.w_sum += w
+        self.rw_sum += ratio * w
+
+        self.n += 1
+        delta = ratio - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (ratio - self.mean)
+
+        day = self.by_date.get(r.record_date)
+        if day is None:
+            day = self.by_date[r.record_date] = [0.0, 0, 0]
+        day[0] += ratio * w
+        day[1] += w
+        day[2] += 1
+        return ratio
+
+    def weighted_efficiency(self) -> float:
+        return _safe_div(self.rw_sum, self.w_sum)
+
+    def consistency(self) -> float:
+        return _consistency_from_var(self.m2 / self.n if self.n else 0.0, self.n)
+
+    def trend(self) -> str:
+        """초반/후반(날짜순으로 반으로 나눠) efficiency 비교해서 간단 트렌드."""
+        if self.n < 4:
+            return "UNKNOWN"
+
+        mid = self.n // 2
+        seen = 0
+        sums = [[0.0, 0, 0], [0.0, 0, 0]]  # [초반, 후반] (ratio*minutes 합, minutes 합, 기록 수)
+        for d in sorted(self.by_date):
+            rw, w, k = self.by_date[d]
+            half = sums[0] if seen * 2 + k <= mid * 2 else sums[1]
+            half[0] += rw
+            half[1] += w
+            half[2] += k
+            seen += k
+        if not sums[0][2] or not sums[1][2]:
+            return "UNKNOWN"  # 기록이 한 날짜에 몰려 있으면 비교할 초반/후반이 없음
+
+        first = _safe_div(sums[0][0], sums[0][1])
+        second = _safe_div(sums[1][0], sums[1][1])
+        return _trend_from_halves(first, second)
+
+
+class _WeeklyAggregator:
+    """기록 iterable(제너레이터 가능)을 한 번 훑어서 과목별/전체 지표를 만든다."""
+
+    def __init__(self):
+        self.subjects: Dict[str, _SubjectAccumulator] = {}
+        self.first_date: Optional[date] = None
+        self.last_date: Optional[date] = None
+        self.w_sum = 0
+        self.rw_sum = 0.0
+
+    def feed(self, records: Iterable[WeeklyStudyRecord]) -> "_WeeklyAggregator":
+        subjects = self.subjects
+        for r in records:
+            acc = subjects.get(r.subject_name)
+            if acc is None:
+                acc = subjects[r.subject_name] = _SubjectAccumulator()
+            ratio = acc.add(r)
+
+            self.w_sum += r.actual_minutes
+            self.rw_sum += ratio * r.actual_minutes
+            if self.first_date is None or r.record_date < self.first_date:
+                self.first_date = r.record_date
+            if self.last_date is None or r.record_date > self.last_date:
+                self.last_date = r.record_date
+        return self
+
+    def weighted_efficiency(self) -> float:
+        return _safe_div(self.rw_sum, self.w_sum)
+
+
 def _pace_sentence(subject_name: str, pace_factor: float) -> str:
     diff_pct = round((pace_factor - 1.0) * 100)
     if diff_pct > 0:
@@ -234,17 +310,24 @@ def _overall_feedback(eff: float, total_minutes: int) -> List[str]:
 # =====================
 # 엔드포인트
 # =====================
-@router.post("/weekly-summary", response_model=WeeklySummaryResponse)
-def weekly_summary(request: WeeklySummaryRequest) -> WeeklySummaryResponse:
-    # 날짜 범위(없으면 records에서 계산)
-    dates = sorted({r.record_date for r in request.records})
-    week_start = request.week_start or (dates[0] if dates else None)
-    week_end = request.week_end or (dates[-1] if dates else None)
+def build_weekly_summary(
+    records: Iterable,
+    paces: Optional[Dict[str, float]] = None,
+    week_start: Optional[date] = None,
+    week_end: Optional[date] = None,
+) -> WeeklySummaryResponse:
+    """
+    기록 iterable로 주간 요약을 만든다 (엔드포인트 / 스터디 단위 리포트 공용).
+    records: WeeklyStudyRecord와 같은 속성을 가진 객체들 (record_date, subject_name, target_/actual_ minutes·pages)
+    paces: {과목명: pace_factor}. 없으면 pace 항목을 비워둔다.
+    """
+    # 기록을 한 번만 훑으면서 과목별 누적 (정렬/그룹 리스트 없음)
+    agg = _WeeklyAggregator().feed(records)
+    paces = paces or {}
 
-    # 과목별로 그룹핑
-    by_subject: Dict[str, List[WeeklyStudyRecord]] = {}
-    for r in request.records:
-        by_subject.setdefault(r.subject_name, []).append(r)
+    # 날짜 범위(없으면 records에서 계산)
+    week_start = week_start or agg.first_date
+    week_end = week_end or agg.last_date
 
     subjects_out: List[SubjectWeeklySummary] = []
 
@@ -254,15 +337,9 @@ def weekly_summary(request: WeeklySummaryRequest) -> WeeklySummaryResponse:
     overall_target_pages = 0
     overall_actual_pages = 0
 
-    overall_ratio_pairs: List[Tuple[float, int]] = []  # (ratio, actual_minutes)
-
-    for subject_name, records in by_subject.items():
-        records_sorted = sorted(records, key=lambda x: (x.record_date, x.subject_name))
-
-        t_min = sum(r.target_minutes for r in records_sorted)
-        a_min = sum(r.actual_minutes for r in records_sorted)
-        t_pages = sum(r.target_pages for r in records_sorted)
-        a_pages = sum(r.actual_pages for r in records_sorted)
+    for subject_name, acc in agg.subjects.items():
+        t_min, a_min = acc.t_min, acc.a_min
+        t_pages, a_pages = acc.t_pages, acc.a_pages
 
         overall_target_minutes += t_min
         overall_actual_minutes += a_min
@@ -272,38 +349,21 @@ def weekly_summary(request: WeeklySummaryRequest) -> WeeklySummaryResponse:
         target_speed = _safe_div(t_pages, t_min)  # pages/min
         actual_speed = _safe_div(a_pages, a_min)  # pages/min
 
-        ratio_pairs: List[Tuple[float, int]] = []
-        ratios_raw: List[float] = []
-        for r in records_sorted:
-            ratio = _calc_efficiency_ratio(r.target_pages, r.target_minutes, r.actual_pages, r.actual_minutes)
-            ratio_pairs.append((ratio, r.actual_minutes))
-            ratios_raw.append(ratio)
-
-        weighted_eff = _minutes_weighted_avg(ratio_pairs)
-        weighted_eff = _round2(weighted_eff)
-
-        for ratio, w in ratio_pairs:
-            overall_ratio_pairs.append((ratio, w))
-
-        consistency = _consistency_score(ratios_raw)
-        trend = _trend_label(records_sorted)
+        weighted_eff = _round2(acc.weighted_efficiency())
+        consistency = acc.consistency()
+        trend = acc.trend()
 
-        # pace_factor 조회(가능하면)
         pace_factor: Optional[float] = None
         pace_msg: Optional[str] = None
-        if get_pace_factor is not None:
-            try:
-                pace_factor = float(get_pace_factor(subject_name))
-                pace_factor = _round2(pace_factor)
-                pace_msg = _pace_sentence(subject_name, pace_factor)
-            except Exception:
-                pace_factor = None
-                pace_msg = None
+        if subject_name in paces:
+            pace_factor = _round2(float(paces[subject_name]))
+            pace_msg = _pace_sentence(subject_name, pace_factor)
 
         feedback = _feedback_from_efficiency(subject_name, weighted_eff)
 
+        # 직접 계산한 값이라 검증 없이 생성 (스터디 리포트는 멤버 수만큼 호출됨)
         subjects_out.append(
-            SubjectWeeklySummary(
+            SubjectWeeklySummary.model_construct(
                 subject_name=subject_name,
                 total_target_minutes=t_min,
                 total_actual_minutes=a_min,
@@ -325,12 +385,11 @@ def weekly_summary(request: WeeklySummaryRequest) -> WeeklySummaryResponse:
 
     overall_target_speed = _safe_div(overall_target_pages, overall_target_minutes)
     overall_actual_speed = _safe_div(overall_actual_pages, overall_actual_minutes)
-    overall_eff = _minutes_weighted_avg(overall_ratio_pairs)
-    overall_eff = _round2(overall_eff)
+    overall_eff = _round2(agg.weighted_efficiency())
 
     overall_fb = _overall_feedback(overall_eff, overall_actual_minutes)
 
-    overall_out = WeeklyOverallSummary(
+    overall_out = WeeklyOverallSummary.model_construct(
         week_start=week_start,
         week_end=week_end,
         total_target_minutes=overall_target_minutes,
@@ -343,4 +402,22 @@ def weekly_summary(request: WeeklySummaryRequest) -> WeeklySummaryResponse:
         overall_feedback=overall_fb,
     )
 
-    return WeeklySummaryResponse(overall=overall_out, subjects=subjects_out)
+    return WeeklySummaryResponse.model_construct(overall=overall_out, subjects=subjects_out)
+
+
+@router.post("/weekly-summary", response_model=WeeklySummaryResponse)
+def weekly_summary(request: WeeklySummaryRequest) -> Response:
+    # pace_factor 조회(가능하면) - 과목 전체를 한 번에
+    paces: Dict[str, float] = {}
+    if get_pace_factors is not None:
+        try:
+            paces = get_pace_factors(dict.fromkeys(r.subject_name for r in request.records))
+        except Exception:
+            paces = {}
+
+    return model_json(build_weekly_summary(
+        (r for r in request.records),
+        paces,
+        week_start=request.week_start,
+        week_end=request.week_end,
+    ))
@@ -1,14 +1,13 @@
 from fastapi import APIRouter, Request, Depends
 from sqlalchemy.orm import Session
 from authlib.integrations.starlette_client import OAuth
-from fastapi import Header, HTTPException, status
-from jose import jwt, JWTError
 from fastapi.responses import RedirectResponse
 from urllib.parse import urlencode
 from fastapi import status
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.query_budget import query_budget
 from app.models.user import User
 from app.core.security import create_access_token
 
@@ -27,6 +26,7 @@ oauth.register(
 )
 
 @router.get("/login")
+@query_budget(1)
 async def login(request: Request):
     # 1. 현재 요청의 프로토콜(http/https)과 호스트(domain:port)를 자동으로 가져옴
     # ngrok으로 접속하면 ngrok 주소를, localhost로 접속하면 localhost를 가져옵니다.
@@ -42,6 +42,7 @@ async def login(request: Request):
 
 
 @router.get("/callback")
+@query_budget(4)
 async def callback(request: Request, db: Session = Depends(get_db)):
     # 세션 디버깅 (필요 시 유지)
     print("DEBUG SESSION:", request.session) 
@@ -88,29 +89,3 @@ async def callback(request: Request, db: Session = Depends(get_db)):
         url=f"{frontend_url}/?{params}", 
         status_code=status.HTTP_302_FOUND
     )
-
-# 토큰을 검증해서 현재 유저 객체를 반환하는 함수
-async def get_current_user(
-    authorization: str = Header(None), 
-    db: Session = Depends(get_db)
-):
-    if not authorization:
-        raise HTTPException(status_code=401, detail="토큰이 없습니다.")
-
-    try:
-        # "Bearer <token>" 형태에서 토큰만 추출
-        token = authorization.split(" ")[1]
-        # 토큰 해독 (보안 설정에 맞춰 SECRET_KEY 등이 필요할 수 있음)
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        user_id: int = payload.get("user_id")
-        
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다.")
-    except (JWTError, IndexError):
-        raise HTTPException(status_code=401, detail="토큰 해독에 실패했습니다.")
-
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise HTTPException(status_code=401, detail="사용자를 찾을 수 없습니다.")
-    
-    return user
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+운영용 CLI.
+
+    python -m app.cli weekly-summary backfill [--user-id N] [--since YYYY-MM-DD]
+    python -m app.cli weekly-summary check    [--user-id N] [--since YYYY-MM-DD]
+    python -m app.cli daily-stats rebuild     [--user-id N]
+    python -m app.cli daily-stats check       [--user-id N]
+    python -m app.cli settlement run          [--date YYYY-MM-DD] [--study-id N]   (기본: 어제까지 밀린 날 마감)
+    python -m app.cli pace replay             [--alpha 0.2] [--user-id N] [--dry-run]
+    python -m app.cli preplan run             [--date YYYY-MM-DD] [--chunk-size N] [--restart]   (기본: 내일)
+"""
+import argparse
+import json
+import sys
+from datetime import date, timedelta
+
+from app.core.database import SessionLocal
+
+
+def _weekly_summary(args) -> int:
+    from app.services import weekly_summary
+
+    with SessionLocal() as db:
+        if args.action == "backfill":
+            count = weekly_summary.backfill(db, user_id=args.user_id, since=args.since)
+            db.commit()
+            print(f"주간 요약 {count}건 재계산 완료")
+            return 0
+
+        mismatches = weekly_summary.check(db, user_id=args.user_id, since=args.since)
+        for m in mismatches:
+            print(json.dumps(m, ensure_ascii=False))
+        print(f"불일치 {len(mismatches)}건")
+        return 1 if mismatches else 0
+
+
+def _daily_stats(args) -> int:
+    from app.services import daily_stats
+
+    with SessionLocal() as db:
+        if args.action == "rebuild":
+            daily_stats.rebuild(db, user_id=args.user_id)
+            db.commit()
+            print("daily_stats 재계산 완료")
+            return 0
+
+        mismatches = daily_stats.check(db, user_id=args.user_id)
+        for m in mismatches:
+            print(json.dumps(m, ensure_ascii=False))
+        print(f"불일치 {len(mismatches)}건")
+        return 1 if mismatches else 0
+
+
+def _settlement(args) -> int:
+    from app.services import settlement
+
+    through = args.date or date.today() - timedelta(days=1)
+    with SessionLocal() as db:
+        results = settlement.run(db, through=through, study_id=args.study_id)
+    absent = sum(r["absent"] for r in results)
+    missed = sum(r["missed"] for r in results)
+    dropped = sum(r["dropped"] for r in results)
+    fine = sum(r["fine"] for r in results)
+    print(f"{through}까지 마감: 스터디·날짜 {len(results)}건, 결석 {absent}건 (벌금 {fine:,}원), "
+          f"목표 미달 처리 {missed}건, 받아보지 않은 미리 계산 목표 삭제 {dropped}건")
+    return 0
+
+
+def _pace(args) -> int:
+    from app.services import pace_replay
+
+    alpha = args.alpha if args.alpha is not None else pace_replay.EMA_ALPHA
+    result = pace_replay.replay_committed(alpha=alpha, user_id=args.user_id, dry_run=args.dry_run)
+    print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+def _preplan(args) -> int:
+    from app.services import preplan
+
+    def progress(p):
+        print(f"  ~user {p['last_user_id']}: 유저 {p['users']}명, 목표 {p['records']}건", file=sys.stderr)
+
+    with SessionLocal() as db:
+        result = preplan.run(db, plan_date=args.date, chunk_size=args.chunk_size, restart=args.restart, on_chunk=progress)
+    print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Study Manager 운영 명령")
+    sub = parser.add_subparsers(dest="group", required=True)
+
+    ws = sub.add_parser("weekly-summary", help="주간 요약 테이블 재계산 / 점검")
+    ws.add_argument("action", choices=["backfill", "check"])
+    ws.add_argument("--user-id", type=int, default=None)
+    ws.add_argument("--since", type=date.fromisoformat, default=None, help="이 날짜가 속한 주부터")
+    ws.set_defaults(func=_weekly_summary)
+
+    ds = sub.add_parser("daily-stats", help="(user, 과목, 날짜) 롤업 재계산 / 점검")
+    ds.add_argument("action", choices=["rebuild", "check"])
+    ds.add_argument("--user-id", type=int, default=None)
+    ds.set_defaults(func=_daily_stats)
+
+    st = sub.add_parser("settlement", help="일 마감 정산 (결석 처리 + 벌금 + 월 장부)")
+    st.add_argument("action", choices=["run"])
+    st.add_argument("--date", type=date.fromisoformat, default=None, help="이 날짜까지 밀린 날을 마감 (기본: 어제)")
+    st.add_argument("--study-id", type=int, default=None)
+    st.set_defaults(func=_settlement)
+
+    pc = sub.add_parser("pace", help="study_records 이력으로 pace_factor 재계산")
+    pc.add_argument("action", choices=["replay"])
+    pc.add_argument("--alpha", type=float, default=None, help="EMA 반영 비율 (기본: pace_store.EMA_ALPHA)")
+    pc.add_argument("--user-id", type=int, default=None)
+    pc.add_argument("--dry-run", action="store_true", help="계산만 하고 저장하지 않음")
+    pc.set_defaults(func=_pace)
+
+    pp = sub.add_parser("preplan", help="다음 날 목표(PENDING) 미리 계산 (중단되면 이어서 실행)")
+    pp.add_argument("action", choices=["run"])
+    pp.add_argument("--date", type=date.fromisoformat, default=None, help="계획 날짜 (기본: 내일)")
+    pp.add_argument("--chunk-size", type=int, default=None, help="청크(commit)당 유저 수 (기본: PREPLAN_CHUNK_SIZE)")
+    pp.add_argument("--restart", action="store_true", help="진행 위치를 지우고 처음부터 (이미 목표가 있는 유저는 건너뜀)")
+    pp.set_defaults(func=_preplan)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,8 +13,69 @@ class Settings(BaseSettings):
 
     authlib_insecure_transport: str = "false"
 
+    # --- 관리자 (/admin/* 엔드포인트) ---
+    ADMIN_EMAILS: str = os.getenv("ADMIN_EMAILS", "")  # 쉼표로 구분
+
+    # --- 인증 캐시 (검증된 토큰 → 사용자) ---
+    # 캐시는 워커(프로세스)마다 따로라서 수정/삭제 즉시 무효화는 그 요청을 처리한 워커에만 적용된다.
+    # 다른 워커는 TTL이 지나야 DB를 다시 읽으므로 권한에 영향을 주는 캐시는 TTL을 짧게 둔다.
+    AUTH_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))  # 토큰 서명 검증 결과 (exp를 넘지 않음)
+    AUTH_USER_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "10"))  # user_id → User
+    AUTH_CACHE_MAXSIZE: int = int(os.getenv("AUTH_CACHE_MAXSIZE", "10000"))
+    MEMBERSHIP_CACHE_TTL_SECONDS: int = int(os.getenv("MEMBERSHIP_CACHE_TTL_SECONDS", "5"))  # user_id → {study_id: role}
+
+    # --- DB ---
+    # 예) sqlite:///./study.db, postgresql+psycopg2://user:pw@host:5432/study
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./study.db")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # 초
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 초
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+
+    # SQLite 전용 튜닝
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+
+    # --- 스터디 주간 리포트 ---
+    # 스터디 전체 기록 수가 이 값 이상이고 워커가 2개 이상이면 점수 계산을 프로세스 풀로 나눠서 처리
+    # (기록 1건당 계산은 수 µs라 작은 스터디는 프로세스 간 전달 비용이 더 큼)
+    REPORT_POOL_MIN_RECORDS: int = int(os.getenv("REPORT_POOL_MIN_RECORDS", "50000"))
+    REPORT_POOL_WORKERS: int = int(os.getenv("REPORT_POOL_WORKERS", str(os.cpu_count() or 2)))
+
+    # --- 운영 지표 (GET /metrics, Prometheus 텍스트 포맷) ---
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # --- 요청당 SQL 예산 / N+1 감지 (개발·테스트용, app.core.query_budget) ---
+    QUERY_BUDGET_MODE: str = os.getenv("QUERY_BUDGET_MODE", "off").lower()  # off | warn | raise
+    QUERY_BUDGET_DEFAULT: int = int(os.getenv("QUERY_BUDGET_DEFAULT", "20"))  # @query_budget 선언이 없는 라우트
+    QUERY_REPEAT_LIMIT: int = int(os.getenv("QUERY_REPEAT_LIMIT", "3"))  # 같은 모양의 SQL이 이보다 많으면 N+1
+
+    # --- 요청 단위 프로파일링 (관리자 전용, app.core.profiling) ---
+    # 기본 꺼짐: false면 미들웨어/훅 자체가 없음. true면 미들웨어만 붙고, 관리자가 PUT /admin/profiling?active=true로
+    # 켠 동안에만 SQL 훅을 붙이고 X-Profile: 1 헤더(또는 ?__profile=1)를 붙인 관리자 요청을 프로파일
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_INTERVAL_MS: float = float(os.getenv("PROFILING_INTERVAL_MS", "1"))  # 샘플 간격
+    PROFILING_KEEP: int = int(os.getenv("PROFILING_KEEP", "50"))  # 메모리에 보관할 최근 프로파일 수 (워커별)
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "")  # 지정하면 <id>.json / <id>.collapsed 파일로도 저장
+
+    # --- 다음 날 목표 미리 계산 (app.services.preplan) ---
+    # 켜면 앱 프로세스 안에서 매일 PREPLAN_AT(서버 로컬 시각)에 실행. 인스턴스가 여러 개면 한 곳에서만 켤 것
+    PREPLAN_ENABLED: bool = os.getenv("PREPLAN_ENABLED", "false").lower() == "true"
+    PREPLAN_AT: str = os.getenv("PREPLAN_AT", "03:00")
+    PREPLAN_CHUNK_SIZE: int = int(os.getenv("PREPLAN_CHUNK_SIZE", "500"))  # 청크(commit)당 유저 수
+    PREPLAN_ACTIVE_DAYS: int = int(os.getenv("PREPLAN_ACTIVE_DAYS", "7"))  # 이 기간 안에 기록이 있으면 활성 유저
+    PREPLAN_RETRY_SECONDS: int = int(os.getenv("PREPLAN_RETRY_SECONDS", "300"))
+
+    @property
+    def admin_emails(self) -> set:
+        return {e.strip().lower() for e in self.ADMIN_EMAILS.split(",") if e.strip()}
+
     class Config:
         env_file = ".env"
         extra = "ignore"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -1,15 +1,122 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
 
-DATABASE_URL = "sqlite:///./study.db"
+from app.core import metrics, profiling, query_budget
+from app.core.config import settings
+
+DATABASE_URL = settings.DATABASE_URL
 
 class Base(DeclarativeBase):
     pass
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+
+def _apply_sqlite_pragmas(dbapi_conn, _record):
+    # 커넥션이 새로 열릴 때마다 적용 (pragma는 커넥션 단위 설정)
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")          # 읽기/쓰기 동시 진행 허용
+    cur.execute("PRAGMA synchronous=NORMAL")        # WAL에서는 NORMAL이면 충분히 안전
+    cur.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")  # lock 대기 후 재시도
+    cur.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cur.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.close()
+
+
+# 비동기 경로에서 쓰는 드라이버
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_url(url: str = DATABASE_URL) -> str:
+    """sqlite:///./study.db → sqlite+aiosqlite:///./study.db 처럼 async 드라이버로 바꿔줌"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _engine_options(url: str, is_async: bool) -> dict:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+
+    kwargs = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    connect_args = {}
+
+    if backend == "sqlite":
+        if not is_async:
+            connect_args["check_same_thread"] = False
+        # busy_timeout과 같은 값(초)으로 드라이버 레벨 lock 대기도 맞춰줌
+        connect_args["timeout"] = settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+        if parsed.database not in (None, "", ":memory:"):
+            kwargs["pool_size"] = settings.DB_POOL_SIZE
+            kwargs["max_overflow"] = settings.DB_MAX_OVERFLOW
+            kwargs["pool_timeout"] = settings.DB_POOL_TIMEOUT
+    else:
+        kwargs["pool_size"] = settings.DB_POOL_SIZE
+        kwargs["max_overflow"] = settings.DB_MAX_OVERFLOW
+        kwargs["pool_timeout"] = settings.DB_POOL_TIMEOUT
+        kwargs["pool_recycle"] = settings.DB_POOL_RECYCLE
+        if backend == "postgresql":
+            if is_async:
+                connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+            else:
+                connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+    if settings.METRICS_ENABLED and "pool_size" in kwargs:
+        # 커넥션 대기 시간 기록 (app.core.metrics)
+        kwargs["poolclass"] = metrics.TimedAsyncQueuePool if is_async else metrics.TimedQueuePool
+
+    kwargs["connect_args"] = connect_args
+    return kwargs
+
+
+def build_engine(url: str = DATABASE_URL, **overrides) -> Engine:
+    """
+    settings 기반으로 엔진 생성.
+    - sqlite: WAL + busy_timeout 등 pragma를 connect 시점에 적용
+    - postgresql: 커넥션 풀 + statement_timeout
+    """
+    kwargs = _engine_options(url, is_async=False)
+    kwargs.update(overrides)
+
+    new_engine = create_engine(url, **kwargs)
+    if make_url(url).get_backend_name() == "sqlite":
+        event.listen(new_engine, "connect", _apply_sqlite_pragmas)
+    if settings.METRICS_ENABLED:
+        metrics.instrument_engine(new_engine, "sync")
+    if settings.QUERY_BUDGET_MODE != "off":
+        query_budget.instrument_engine(new_engine)
+    if settings.PROFILING_ENABLED:
+        profiling.register_engine(new_engine)
+    return new_engine
+
+
+def build_async_engine(url: str = DATABASE_URL, **overrides) -> AsyncEngine:
+    """build_engine과 같은 설정의 async 엔진 (aiosqlite / asyncpg)"""
+    url = async_url(url)
+    kwargs = _engine_options(url, is_async=True)
+    kwargs.update(overrides)
+
+    new_engine = create_async_engine(url, **kwargs)
+    if make_url(url).get_backend_name() == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    if settings.METRICS_ENABLED:
+        metrics.instrument_engine(new_engine.sync_engine, "async")
+    if settings.QUERY_BUDGET_MODE != "off":
+        query_budget.instrument_engine(new_engine.sync_engine)
+    if settings.PROFILING_ENABLED:
+        profiling.register_engine(new_engine.sync_engine)
+    return new_engine
+
+
+engine = build_engine()
 
 SessionLocal = sessionmaker(
     bind=engine,
@@ -23,3 +130,33 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def upsert_insert(db: Session, table):
+    """
+    ON CONFLICT DO UPDATE / DO NOTHING을 붙일 수 있는 INSERT (sqlite / postgresql 전용 insert).
+    동시 요청이 같은 키를 처음 넣을 때 unique 위반(500) 대신 한쪽이 UPDATE로 합쳐지게 할 때 쓴다.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"upsert를 지원하지 않는 DB입니다: {dialect}")
+
+
+# =====================
+# 비동기 경로 (async def 라우터용)
+# =====================
+async_engine = build_async_engine()
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,17 +1,59 @@
+import time
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models.user import User
 
 # ✅ Swagger에서 "Bearer 토큰 입력" UI가 뜨는 방식
 bearer_scheme = HTTPBearer(auto_error=False)
 
-def get_current_user(
-    db: Session = Depends(get_db),
+# ✅ 검증 끝난 토큰 → user_id, user_id → User(세션에서 분리된 읽기 전용 객체)
+# - 토큰 캐시는 토큰의 exp를 넘지 않게 만료 (서명 검증 결과라 DB 상태와 무관)
+# - 사용자 캐시는 User가 수정/삭제되면 바로 비움. 단, ORM 이벤트는 그 변경을 처리한 워커에서만 발생하므로
+#   다른 워커는 최대 AUTH_USER_CACHE_TTL_SECONDS(기본 10초) 동안 이전 사용자(삭제된 사용자 포함)를 볼 수 있다.
+#   워커 간 즉시 무효화가 필요하면 이 TTL을 0으로 두면 매 요청 DB에서 읽는다.
+token_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAXSIZE, ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS)
+user_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAXSIZE, ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: int) -> None:
+    user_cache.pop(user_id)
+    token_cache.discard_where(lambda _, cached_user_id: cached_user_id == user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _on_user_changed(_mapper, _connection, target: User):
+    invalidate_user(target.id)
+
+
+def _verify_token(token: str) -> int:
+    """JWT 검증 후 user_id 반환. 실패하면 JWTError/ValueError"""
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    user_id = payload.get("user_id")
+    if user_id is None:
+        raise ValueError("user_id 없음")
+
+    exp = payload.get("exp")
+    ttl = exp - time.time() if exp is not None else None
+    if ttl is None or ttl > 0:
+        token_cache.set(token, user_id, ttl=ttl)
+    return user_id
+
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db),
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
 ):
     credentials_exception = HTTPException(
@@ -27,14 +69,26 @@ def get_current_user(
     token = credentials.credentials  # ✅ "Bearer <token>"에서 <token>만 추출
 
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id = payload.get("user_id")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+        user_id = _verify_token(token)
+    except (JWTError, ValueError):
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    user = (await db.execute(select(User).where(User.id == user_id))).scalars().first()
     if user is None:
         raise credentials_exception
+
+    # 요청 세션에서 떼어내 다른 요청과 공유 (라우터에서는 읽기 전용으로 사용)
+    db.expunge(user)
+    user_cache.set(user_id, user)
     return user
+
+
+async def require_admin(current_user: User = Depends(get_current_user)):
+    """ADMIN_EMAILS(쉼표 구분)에 있는 계정만 통과"""
+    if current_user.email.lower() not in settings.admin_emails:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자만 사용할 수 있습니다.")
+    return current_user
@@ -1,22 +1,79 @@
+from typing import Dict, Optional
+
 from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.models.study import StudyMember
 from app.models.user import User
 
+# ✅ user_id -> {study_id: role}
+# 유저별로 한 번만 조회해두고, 권한 체크는 dict 조회로 처리.
+# 멤버십이 바뀌는 곳(create_study / accept_invite / leave_study / delete_study)에서 commit 후 invalidate.
+# invalidate는 그 요청을 처리한 워커에만 적용되므로, 다른 워커에서는 강퇴/탈퇴한 멤버가
+# 최대 MEMBERSHIP_CACHE_TTL_SECONDS(기본 5초) 동안 권한을 유지할 수 있다. 한 화면에서 연달아 부르는
+# 권한 체크를 묶어주는 정도로만 캐시하고, 0이면 매번 DB에서 읽는다.
+membership_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAXSIZE, ttl_seconds=settings.MEMBERSHIP_CACHE_TTL_SECONDS)
+
+
+def _roles_stmt(user_id: int):
+    return select(StudyMember.study_id, StudyMember.role).where(StudyMember.user_id == user_id)
+
+
+def get_roles(db: Session, user: User) -> Dict[int, str]:
+    """{study_id: role} 복사본 (호출한 쪽에서 바꿔도 캐시는 그대로)"""
+    roles = membership_cache.get(user.id)
+    if roles is None:
+        roles = dict(db.execute(_roles_stmt(user.id)).all())
+        membership_cache.set(user.id, roles)
+    return dict(roles)
+
+
+async def get_roles_async(db: AsyncSession, user: User) -> Dict[int, str]:
+    roles = membership_cache.get(user.id)
+    if roles is None:
+        roles = dict((await db.execute(_roles_stmt(user.id))).all())
+        membership_cache.set(user.id, roles)
+    return dict(roles)
+
+
+def invalidate_memberships(user_id: Optional[int] = None, study_id: Optional[int] = None) -> None:
+    """user_id: 해당 유저 맵만 비움 / study_id: 그 스터디가 들어있는 모든 유저 맵을 비움"""
+    if user_id is not None:
+        membership_cache.pop(user_id)
+    if study_id is not None:
+        membership_cache.discard_where(lambda _, roles: study_id in roles)
 
-def require_study_member(study_id: int, db: Session, user: User) -> StudyMember:
-    m = db.query(StudyMember).filter(
-        StudyMember.study_id == study_id,
-        StudyMember.user_id == user.id
-    ).first()
-    if not m:
+
+def _check_member(roles: Dict[int, str], study_id: int) -> str:
+    role = roles.get(study_id)
+    if role is None:
         raise HTTPException(status_code=403, detail="스터디 멤버만 가능합니다.")
-    return m
+    return role
 
 
-def require_owner(study_id: int, db: Session, user: User) -> StudyMember:
-    m = require_study_member(study_id, db, user)
-    if m.role != "owner":
+def _check_owner(roles: Dict[int, str], study_id: int) -> str:
+    role = _check_member(roles, study_id)
+    if role != "owner":
         raise HTTPException(status_code=403, detail="owner만 가능합니다.")
-    return m
+    return role
+
+
+def require_study_member(study_id: int, db: Session, user: User) -> str:
+    return _check_member(get_roles(db, user), study_id)
+
+
+def require_owner(study_id: int, db: Session, user: User) -> str:
+    return _check_owner(get_roles(db, user), study_id)
+
+
+# --- async 라우터용 ---
+async def require_study_member_async(study_id: int, db: AsyncSession, user: User) -> str:
+    return _check_member(await get_roles_async(db, user), study_id)
+
+
+async def require_owner_async(study_id: int, db: AsyncSession, user: User) -> str:
+    return _check_owner(await get_roles_async(db, user), study_id)
@@ -0,0 +1,426 @@
+"""
+요청 단위 프로파일링 (관리자 전용, 필요할 때만).
+
+관리자가
+    X-Profile: 1  헤더  또는  ?__profile=1  쿼리
+를 붙여 보낸 요청 하나만 샘플링 프로파일러로 돌리고, 그 요청의 SQL 타임라인과 함께 보관한다.
+요청은 항상 관리자 자신의 토큰으로 실행된다 (다른 유저로 실행하는 기능은 두지 않음).
+- 응답 헤더 X-Profile-Id → GET /admin/profiles/{id} (요약 + SQL 타임라인)
+                           GET /admin/profiles/{id}/collapsed (flamegraph.pl / speedscope / inferno 입력)
+- 최근 PROFILING_KEEP개를 메모리에 보관 (워커별). PROFILING_DIR을 주면 파일로도 저장
+
+샘플러는 별도 스레드에서 PROFILING_INTERVAL_MS마다 sys._current_frames()로 스택을 읽는다.
+- 이벤트 루프 스레드: 이 요청의 코루틴이 실행 중일 때만 기록 (다른 요청 것은 제외)
+  AsyncSession.run_sync 안의 코드는 greenlet에서 돌아 스택이 끊기므로 greenlet 전환을 추적해 이어 붙임
+  실행 중이 아니면(DB 응답 대기 / 다른 요청 처리) "<waiting>"으로 기록 → 샘플 합 ≈ 요청 전체 시간
+- 스레드풀 / run_sync 스레드: 이 요청의 SQL을 실행한 스레드를 그때부터 함께 기록
+켜는 단계는 둘:
+- PROFILING_ENABLED=true(기본 false)로 띄운 인스턴스에만 미들웨어가 붙고 엔진이 등록된다. false면 아무것도 붙지 않음
+- 그 상태에서도 관리자가 PUT /admin/profiling?active=true로 켜야(set_active) DB 훅을 붙이고 플래그를 받기 시작한다.
+  꺼져 있으면 미들웨어는 bool 확인 한 번으로 통과하고 SQL 훅은 없음. 켜고 끄는 상태는 워커(프로세스)별
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+import greenlet
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HEADER = b"x-profile"
+QUERY_FLAG = "__profile"
+WAITING = "<waiting>"
+MAX_SQL_LENGTH = 2000
+
+_ROOTS = sorted(
+    {str(Path(p).resolve()) for p in sys.path if p and os.path.isdir(p)} | {str(Path(__file__).resolve().parents[2])},
+    key=len,
+    reverse=True,
+)
+
+
+# =====================
+# 샘플러
+# =====================
+def _label(code) -> str:
+    filename = code.co_filename
+    for root in _ROOTS:
+        if filename.startswith(root):
+            filename = filename[len(root):].lstrip(os.sep)
+            break
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({filename}:{code.co_firstlineno})"
+
+
+class _SwitchInterval:
+    """프로파일 중에는 GIL 전환 간격을 샘플 간격에 맞춰 줄임 (동시에 여러 개면 마지막이 끝날 때 복구)"""
+
+    _lock = threading.Lock()
+    _active = 0
+    _saved = 0.0
+
+    @classmethod
+    def enter(cls, interval: float) -> None:
+        with cls._lock:
+            if cls._active == 0:
+                cls._saved = sys.getswitchinterval()
+                sys.setswitchinterval(min(cls._saved, interval))
+            cls._active += 1
+
+    @classmethod
+    def exit(cls) -> None:
+        with cls._lock:
+            cls._active -= 1
+            if cls._active == 0:
+                sys.setswitchinterval(cls._saved)
+
+
+class _GreenletTracker:
+    """
+    프로파일 중인 스레드에서 지금 실행 중인 greenlet을 기록 (greenlet.settrace는 스레드 단위).
+    run_sync 안쪽 프레임은 부모 greenlet(이벤트 루프)의 스택과 이어지지 않아서 부모의 gr_frame으로 연결한다.
+    """
+
+    _lock = threading.Lock()
+    _active: Dict[int, int] = {}
+    _previous: Dict[int, object] = {}
+    current: Dict[int, object] = {}
+
+    @classmethod
+    def _trace(cls, event_name, args):
+        ident = threading.get_ident()
+        if event_name in ("switch", "throw"):
+            cls.current[ident] = args[1]
+        previous = cls._previous.get(ident)
+        if previous is not None:
+            previous(event_name, args)
+
+    @classmethod
+    def enter(cls) -> None:
+        ident = threading.get_ident()
+        with cls._lock:
+            if cls._active.get(ident, 0) == 0:
+                cls.current[ident] = greenlet.getcurrent()
+                cls._previous[ident] = greenlet.settrace(cls._trace)
+            cls._active[ident] = cls._active.get(ident, 0) + 1
+
+    @classmethod
+    def exit(cls) -> None:
+        ident = threading.get_ident()
+        with cls._lock:
+            cls._active[ident] -= 1
+            if cls._active[ident] == 0:
+                greenlet.settrace(cls._previous.pop(ident))
+                del cls._active[ident]
+                cls.current.pop(ident, None)
+
+
+class Sampler:
+    def __init__(self, interval: float, loop_thread: int, anchor):
+        self.interval = interval
+        self.loop_thread = loop_thread
+        self.anchor = anchor  # 이 요청을 처리하는 미들웨어 코루틴의 프레임
+        self.threads: set = set()  # 이 요청의 SQL을 실행한 다른 스레드
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        """이벤트 루프 스레드에서 호출"""
+        _SwitchInterval.enter(self.interval)
+        _GreenletTracker.enter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        _GreenletTracker.exit()
+        _SwitchInterval.exit()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            self.samples += 1
+            stack = self._loop_stack(frames.get(self.loop_thread))
+            self.stacks[stack or (WAITING,)] += 1
+            for ident in list(self.threads):
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.stacks[("<thread>",) + self._full_stack(frame)] += 1
+
+    def _loop_stack(self, frame) -> Optional[tuple]:
+        """이벤트 루프 스레드가 지금 이 요청을 실행 중이면 미들웨어 아래 스택, 아니면 None"""
+        stack: List[str] = []
+        current = _GreenletTracker.current.get(self.loop_thread)
+        while True:
+            while frame is not None:
+                if frame is self.anchor:
+                    return tuple(reversed(stack))
+                stack.append(_label(frame.f_code))
+                frame = frame.f_back
+            # greenlet 바닥까지 왔으면 부모 greenlet이 멈춰 있는 지점에서 이어서
+            parent = getattr(current, "parent", None)
+            if parent is None:
+                return None
+            frame, current = parent.gr_frame, parent
+
+    @staticmethod
+    def _full_stack(frame) -> tuple:
+        stack = []
+        while frame is not None:
+            stack.append(_label(frame.f_code))
+            frame = frame.f_back
+        return tuple(reversed(stack))
+
+
+# =====================
+# 요청 단위 상태 / SQL 타임라인
+# =====================
+class Session:
+    __slots__ = ("started", "sampler", "sql")
+
+    def __init__(self, sampler: Sampler):
+        self.started = time.perf_counter()
+        self.sampler = sampler
+        self.sql: List[dict] = []
+
+
+_current: ContextVar[Optional[Session]] = ContextVar("request_profile", default=None)
+_STARTED_KEY = "profiling_statement_started"
+
+
+# SQL 타임라인 훅: 켜져 있을 때만 엔진에 붙음. 프로파일 중인 요청이 아니면 ContextVar 조회 한 번으로 끝남
+def _before(conn, cursor, statement, parameters, context, executemany):
+    session = _current.get()
+    if session is not None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+        ident = threading.get_ident()
+        if ident != session.sampler.loop_thread:
+            session.sampler.threads.add(ident)
+
+
+def _after(conn, cursor, statement, parameters, context, executemany):
+    session = _current.get()
+    if session is None or not conn.info.get(_STARTED_KEY):
+        return
+    started = conn.info[_STARTED_KEY].pop()
+    session.sql.append({
+        "offset_ms": round((started - session.started) * 1000, 3),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        "sql": statement[:MAX_SQL_LENGTH],
+        "executemany": executemany,
+        "rowcount": cursor.rowcount if cursor is not None else None,
+    })
+
+
+def _error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get(_STARTED_KEY):
+        conn.info[_STARTED_KEY].pop()
+
+
+_HOOKS = (("before_cursor_execute", _before), ("after_cursor_execute", _after), ("handle_error", _error))
+_engines: list = []
+_active = False
+_toggle_lock = threading.Lock()
+
+
+def register_engine(engine) -> None:
+    """PROFILING_ENABLED일 때 엔진(async면 sync_engine)을 등록만 함. 훅은 set_active(True)에서 붙임"""
+    with _toggle_lock:
+        _engines.append(engine)
+        if _active:
+            for name, fn in _HOOKS:
+                event.listen(engine, name, fn)
+
+
+def set_active(active: bool) -> bool:
+    """이 워커에서 프로파일링 켜기/끄기: 등록된 엔진에 SQL 훅을 붙이거나 떼고 미들웨어가 플래그를 받기 시작/중단"""
+    global _active
+    with _toggle_lock:
+        if active != _active:
+            for engine in _engines:
+                for name, fn in _HOOKS:
+                    (event.listen if active else event.remove)(engine, name, fn)
+            _active = active
+    return _active
+
+
+def is_active() -> bool:
+    return _active
+
+
+# =====================
+# 보관
+# =====================
+_profiles: "OrderedDict[str, dict]" = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def _store(profile: dict) -> None:
+    with _profiles_lock:
+        _profiles[profile["id"]] = profile
+        while len(_profiles) > settings.PROFILING_KEEP:
+            _profiles.popitem(last=False)
+    if settings.PROFILING_DIR:
+        try:
+            directory = Path(settings.PROFILING_DIR)
+            directory.mkdir(parents=True, exist_ok=True)
+            summary = {k: v for k, v in profile.items() if k != "stacks"}
+            (directory / f"{profile['id']}.json").write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+            (directory / f"{profile['id']}.collapsed").write_text(collapsed(profile), encoding="utf-8")
+        except OSError:
+            logger.exception("profile write failed: %s", profile["id"])
+
+
+def get_profile(profile_id: str) -> Optional[dict]:
+    with _profiles_lock:
+        return _profiles.get(profile_id)
+
+
+def list_profiles() -> List[dict]:
+    with _profiles_lock:
+        profiles = list(_profiles.values())
+    keys = ("id", "method", "path", "status", "started_at", "duration_ms", "samples", "admin_user_id")
+    return [{k: p[k] for k in keys} | {"sql_statements": len(p["sql"])} for p in reversed(profiles)]
+
+
+def collapsed(profile: dict) -> str:
+    """flamegraph.pl 등에서 쓰는 collapsed stack 형식: "frame;frame;frame 개수" 한 줄씩"""
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in profile["stacks"])
+
+
+def _summary(session: Session, interval: float, duration_ms: float) -> dict:
+    self_samples: Counter = Counter()
+    for stack, count in session.sampler.stacks.items():
+        self_samples[stack[-1]] += count
+    # 샘플러 스레드도 GIL을 기다리므로 실제 간격은 설정값보다 길 수 있음 → 요청 시간을 샘플 비율로 나눠 추정
+    samples = session.sampler.samples
+    ms_per_sample = duration_ms / samples if samples else 0.0
+    sql_ms = sum(s["duration_ms"] for s in session.sql)
+    return {
+        "interval_ms": round(interval * 1000, 3),
+        "samples": samples,
+        "top_self": [
+            {"frame": frame, "samples": n, "approx_ms": round(n * ms_per_sample, 1)}
+            for frame, n in self_samples.most_common(30)
+        ],
+        "sql_summary": {"statements": len(session.sql), "total_ms": round(sql_ms, 3)},
+        "sql": session.sql,
+        "stacks": sorted(session.sampler.stacks.items(), key=lambda kv: -kv[1]),
+    }
+
+
+# =====================
+# 미들웨어
+# =====================
+def _requested(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == HEADER:
+            return value not in (b"", b"0", b"false")
+    query = scope.get("query_string", b"")
+    if QUERY_FLAG.encode() in query:
+        values = parse_qs(query.decode("latin-1")).get(QUERY_FLAG, [])
+        return bool(values) and values[-1] not in ("", "0", "false")
+    return False
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def _admin_user_id(scope) -> Optional[int]:
+    """Authorization 헤더의 사용자가 ADMIN_EMAILS에 있으면 user_id (require_admin과 같은 기준)"""
+    from jose import JWTError
+    from sqlalchemy import select
+
+    from app.core.database import AsyncSessionLocal
+    from app.core.dependencies import _verify_token, user_cache
+    from app.models.user import User
+
+    auth = _header(scope, b"authorization") or ""
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        user_id = _verify_token(token)
+    except (JWTError, ValueError):
+        return None
+    user = user_cache.get(user_id)
+    if user is None:
+        async with AsyncSessionLocal() as db:
+            user = (await db.execute(select(User).where(User.id == user_id))).scalars().first()
+    if user is None or user.email.lower() not in settings.admin_emails:
+        return None
+    return user_id
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _active or not _requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        admin_id = await _admin_user_id(scope)
+        if admin_id is None:
+            # 관리자가 아니면 플래그를 무시하고 평소처럼 처리
+            await self.app(scope, receive, send)
+            return
+
+        await self._profile(scope, receive, send, admin_id)
+
+    async def _profile(self, scope, receive, send, admin_id: int):
+        profile_id = uuid.uuid4().hex[:16]
+        interval = settings.PROFILING_INTERVAL_MS / 1000
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        sampler = Sampler(interval, threading.get_ident(), sys._getframe())
+        session = Session(sampler)
+        token = _current.set(session)
+        started_at = datetime.utcnow()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            _current.reset(token)
+            duration_ms = (time.perf_counter() - session.started) * 1000
+            _store({
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "route": getattr(scope.get("route"), "path", None),
+                "status": status_holder[0],
+                "admin_user_id": admin_id,
+                "started_at": started_at.isoformat(timespec="milliseconds"),
+                "duration_ms": round(duration_ms, 3),
+                **_summary(session, interval, duration_ms),
+            })
+            logger.info("request profiled: %s %s → %s (%.1f ms)", scope["method"], scope["path"], profile_id, duration_ms)
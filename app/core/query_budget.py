@@ -0,0 +1,214 @@
+"""
+요청당 SQL 예산 / N+1 감지 (개발 · 테스트용).
+
+- 라우트 옆에 예산 선언:
+      @router.post("/calculate")
+      @query_budget(6)
+      async def calculate_dynamic_goal(...):
+  선언이 없으면 QUERY_BUDGET_DEFAULT
+- 요청마다 실행된 SQL을 세고, 같은 모양의 문장(파라미터 값만 다른 것)이 QUERY_REPEAT_LIMIT번을 넘으면 N+1로 본다
+- QUERY_BUDGET_MODE
+    off   : 훅/미들웨어를 아예 붙이지 않음 (기본, 운영)
+    warn  : 로그 경고 + 응답 헤더 X-Query-Count / X-Query-Budget
+    raise : 예산을 넘은 요청은 500 + 위반 내용(JSON)으로 응답 → 테스트에서 바로 실패
+- track(): 그 안에서 처리된 요청의 위반을 모아줌 (pytest fixture: app.pytest_plugin)
+- counting(): 요청 밖에서 함수 하나가 실행한 SQL 개수 (서비스 테스트용)
+"""
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_ATTR = "__query_budget__"
+
+
+class Budget(NamedTuple):
+    max_statements: int
+    max_repeats: Optional[int] = None  # None이면 QUERY_REPEAT_LIMIT
+
+
+def query_budget(max_statements: int, max_repeats: Optional[int] = None) -> Callable:
+    """라우트 함수에 요청당 SQL 예산을 붙인다 (함수는 그대로 반환, 실행 비용 없음)"""
+
+    def decorator(fn):
+        setattr(fn, _ATTR, Budget(max_statements, max_repeats))
+        return fn
+
+    return decorator
+
+
+def budget_of(endpoint) -> Budget:
+    return getattr(endpoint, _ATTR, None) or Budget(settings.QUERY_BUDGET_DEFAULT)
+
+
+# =====================
+# 문장 지문(fingerprint)
+# =====================
+_PARAM = re.compile(r"%\(\w+\)s|\$\d+|:\w+|\?")
+_GROUP = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """파라미터 자리와 IN (...) / VALUES (...), (...) 길이를 지워서 '같은 모양'의 SQL을 하나로 묶음"""
+    text = _PARAM.sub("?", statement)
+    text = _GROUP.sub("(?)", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+# =====================
+# 요청 단위 기록
+# =====================
+class RequestQueries:
+    __slots__ = ("total", "shapes")
+
+    def __init__(self):
+        self.total = 0
+        self.shapes: Counter = Counter()
+
+
+class Violation(NamedTuple):
+    method: str
+    route: str
+    statements: int
+    budget: int
+    repeated: List[tuple]  # [(fingerprint, 횟수)]
+
+    def describe(self) -> str:
+        lines = [f"{self.method} {self.route}: SQL {self.statements}회 (예산 {self.budget})"]
+        lines += [f"  x{count}: {shape[:200]}" for shape, count in self.repeated]
+        return "\n".join(lines)
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+_recorders: List[list] = []
+_recorders_lock = threading.Lock()
+
+
+@contextmanager
+def track() -> Iterator[list]:
+    """with track() as violations: ... → 블록 안에서 처리된 요청의 위반 목록"""
+    found: list = []
+    with _recorders_lock:
+        _recorders.append(found)
+    try:
+        yield found
+    finally:
+        with _recorders_lock:
+            _recorders.remove(found)
+
+
+@contextmanager
+def counting() -> Iterator[RequestQueries]:
+    """
+    with counting() as queries: ... → 블록 안(같은 스레드 / 태스크)에서 실행된 SQL 수(queries.total)와
+    모양별 횟수(queries.shapes). 요청 없이 서비스 함수의 SQL 개수를 테스트할 때 (QUERY_BUDGET_MODE가 off가 아닐 때만 셈)
+    """
+    queries = RequestQueries()
+    token = _current.set(queries)
+    try:
+        yield queries
+    finally:
+        _current.reset(token)
+
+
+def _record(violation: Violation) -> None:
+    with _recorders_lock:
+        for found in _recorders:
+            found.append(violation)
+
+
+def instrument_engine(engine) -> None:
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        queries = _current.get()
+        if queries is not None:
+            queries.total += 1
+            queries.shapes[fingerprint(statement)] += 1
+
+
+def check(method: str, scope, queries: RequestQueries) -> Optional[Violation]:
+    route = scope.get("route")
+    budget = budget_of(getattr(route, "endpoint", None))
+    repeat_limit = budget.max_repeats if budget.max_repeats is not None else settings.QUERY_REPEAT_LIMIT
+    repeated = [(shape, n) for shape, n in queries.shapes.most_common() if n > repeat_limit]
+    if queries.total <= budget.max_statements and not repeated:
+        return None
+    return Violation(method, getattr(route, "path", scope["path"]), queries.total, budget.max_statements, repeated)
+
+
+class QueryBudgetMiddleware:
+    """응답을 끝까지 모았다가(개발/테스트 전용) 예산을 확인한 뒤 내보낸다."""
+
+    def __init__(self, app, mode: str = "warn"):
+        self.app = app
+        self.mode = mode
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        messages = []
+
+        async def buffer(message):
+            messages.append(message)
+
+        queries = RequestQueries()
+        token = _current.set(queries)
+        try:
+            await self.app(scope, receive, buffer)
+        finally:
+            _current.reset(token)
+
+        violation = check(scope["method"], scope, queries)
+        if violation is not None:
+            _record(violation)
+            logger.warning("query budget exceeded\n%s", violation.describe())
+            if self.mode == "raise":
+                body = json.dumps({
+                    "detail": "query budget exceeded",
+                    "route": violation.route,
+                    "statements": violation.statements,
+                    "budget": violation.budget,
+                    "repeated": [{"sql": shape, "count": n} for shape, n in violation.repeated],
+                }, ensure_ascii=False).encode("utf-8")
+                await send({
+                    "type": "http.response.start",
+                    "status": 500,
+                    "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+                })
+                await send({"type": "http.response.body", "body": body})
+                return
+
+        for message in messages:
+            if message["type"] == "http.response.start":
+                budget = budget_of(getattr(scope.get("route"), "endpoint", None))
+                message = {**message, "headers": list(message.get("headers", [])) + [
+                    (b"x-query-count", str(queries.total).encode()),
+                    (b"x-query-budget", str(budget.max_statements).encode()),
+                ]}
+            await send(message)
+
+
+def routes_without_budget(app) -> List[str]:
+    """예산 선언이 없는 API 라우트 ("METHOD /path")"""
+    missing = []
+    for route in app.routes:
+        endpoint = getattr(route, "endpoint", None)
+        methods = getattr(route, "methods", None)
+        if endpoint is None or not methods or not getattr(route, "include_in_schema", True):
+            continue
+        if getattr(endpoint, _ATTR, None) is None:
+            missing.extend(f"{m} {route.path}" for m in sorted(methods))
+    return missing
@@ -0,0 +1,25 @@
+"""
+JSON 응답 빠른 경로.
+
+- ORJSONResponse: 앱 기본 응답 클래스 (json.dumps 대신 orjson, date/datetime/numpy도 바로 직렬화)
+- trusted_json(content): 서비스가 스키마 모양 그대로 만든 dict/list를 response_model 재검증 없이 바로 직렬화
+- model_json(model): 이미 만든 pydantic 모델을 pydantic-core로 바로 JSON bytes로 (dict로 풀었다가 다시 검증하지 않음)
+
+FastAPI는 라우터가 dict/모델을 돌려주면 response_model로 한 번 더 검증(모델이면 dict로 풀어서 다시 검증)하고
+jsonable로 바꾼 뒤 인코딩한다. 우리 코드가 DB 값으로 직접 만든 응답에는 그 검증이 중복이므로 Response를 바로 돌려준다.
+response_model은 OpenAPI 문서용으로 그대로 둔다. 요청 본문 등 외부 입력을 그대로 돌려주는 곳에는 쓰지 말 것.
+"""
+from typing import Any
+
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel
+
+__all__ = ["ORJSONResponse", "trusted_json", "model_json"]
+
+
+def trusted_json(content: Any, status_code: int = 200) -> ORJSONResponse:
+    return ORJSONResponse(content, status_code=status_code)
+
+
+def model_json(model: BaseModel, status_code: int = 200) -> Response:
+    return Response(model.model_dump_json(), status_code=status_code, media_type="application/json")
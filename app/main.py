@@ -1,5 +1,6 @@
+import asyncio
 import os
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from dotenv import load_dotenv
@@ -11,22 +12,26 @@ load_dotenv()
 os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
 os.environ['AUTHLIB_INSECURE_TRANSPORT'] = 'true'
 
-from app.core.database import Base, engine
 from app.auth.google import router as google_router
 from app.routers.user import router as user_router
 from app.core.config import settings
+from app.core import metrics, profiling, query_budget
+from app.core.responses import ORJSONResponse
 from app.routers.study import router as study_router
 from app.routers.subject import router as subject_router
 from app.routers.study_goal import router as study_goal_router
 from app.routers.record import router as record_router
 from app.routers.invite import invite_router
 from app.routers.ai import router as ai_router
+from app.routers.admin import router as admin_router
+from app.services import preplan, study_report
 
 # 2️⃣ FastAPI 앱 초기화
 app = FastAPI(
     title="Study Manager API",
     description="스터디 관리 서비스 API",
     version="0.1.0",
+    default_response_class=ORJSONResponse,  # json.dumps 대신 orjson (app.core.responses)
 )
 
 # 3️⃣ 미들웨어 설정
@@ -49,8 +54,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 4️⃣ DB 테이블 생성 (Alembic 미사용 시)
-Base.metadata.create_all(bind=engine)
+# ✅ 관리자 전용 요청 프로파일링 (PROFILING_ENABLED=true일 때만. 실제로 켜는 건 PUT /admin/profiling?active=true)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(profiling.ProfilingMiddleware)
+
+# ✅ 개발/테스트: 요청당 SQL 예산 초과·N+1 감지 (QUERY_BUDGET_MODE=warn|raise, 기본 off)
+if settings.QUERY_BUDGET_MODE != "off":
+    app.add_middleware(query_budget.QueryBudgetMiddleware, mode=settings.QUERY_BUDGET_MODE)
+
+# ✅ 지표: 라우트별 지연/상태 코드/SQL 문 개수 (GET /metrics). 가장 바깥에서 전체 처리 시간을 잼
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# 4️⃣ DB 스키마는 앱 시작 시 만들지 않음 → 배포/실행 전에 `python -m app.migrations` 실행
 
 # 5️⃣ 라우터 등록
 app.include_router(user_router)
@@ -61,13 +77,36 @@ app.include_router(study_goal_router)
 app.include_router(record_router)
 app.include_router(invite_router)
 app.include_router(ai_router)
+app.include_router(admin_router)
 
-# 6️⃣ 헬스체크 및 환경 확인
+# 6️⃣ 백그라운드 작업 (설정으로 켤 때만)
+# 다음 날 목표 미리 계산: PREPLAN_ENABLED=true면 매일 PREPLAN_AT에 실행 (수동 실행은 `python -m app.cli preplan run`)
+@app.on_event("startup")
+async def start_background_jobs():
+    app.state.background_tasks = []
+    if settings.PREPLAN_ENABLED:
+        app.state.background_tasks.append(asyncio.create_task(preplan.nightly_loop()))
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    for task in app.state.background_tasks:
+        task.cancel()
+    # 스터디 주간 리포트용 프로세스 풀 (큰 스터디 리포트를 만든 적이 있을 때만 떠 있음)
+    study_report.shutdown_pool()
+
+# 7️⃣ 헬스체크 및 환경 확인
 @app.get("/ping", tags=["Health"])
+@query_budget.query_budget(0)
 def ping():
     return {"message": "pong", "status": "active"}
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    def read_metrics():
+        return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/")
+@query_budget.query_budget(0)
 def read_root():
     return {"message": "Study Manager API is running!"}
 
@@ -0,0 +1,96 @@
+"""
+DB 스키마 마이그레이션 러너 (Alembic 대신 쓰는 간단한 in-repo 버전)
+
+- app/migrations/versions/vNNNN_*.py 를 버전 순서대로 한 번씩 실행
+- 각 모듈은 VERSION, DESCRIPTION, upgrade(conn) 를 가진다
+- 적용 이력은 schema_migrations 테이블에 기록
+
+실행:
+    python -m app.migrations            # 최신 버전까지 적용
+    python -m app.migrations status     # 적용/미적용 목록
+"""
+import importlib
+import pkgutil
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.migrations import versions as _versions_pkg
+
+_meta = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _meta,
+    Column("version", String, primary_key=True),
+    Column("description", String),
+    Column("applied_at", DateTime, default=datetime.utcnow),
+)
+
+
+# =====================
+# 마이그레이션에서 쓰는 헬퍼
+# =====================
+def has_table(conn: Connection, table: str) -> bool:
+    return inspect(conn).has_table(table)
+
+
+def has_column(conn: Connection, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+
+def has_index(conn: Connection, table: str, index: str) -> bool:
+    return any(i["name"] == index for i in inspect(conn).get_indexes(table))
+
+
+def create_indexes(conn: Connection, table: Table, names: List[str]) -> None:
+    """모델(__table_args__)에 선언된 인덱스 중 names에 해당하는 것만 생성"""
+    for idx in table.indexes:
+        if idx.name in names:
+            idx.create(conn, checkfirst=True)
+
+
+# =====================
+# 러너
+# =====================
+def _load_migrations():
+    modules = []
+    for info in pkgutil.iter_modules(_versions_pkg.__path__):
+        if info.name.startswith("v"):
+            modules.append(importlib.import_module(f"{_versions_pkg.__name__}.{info.name}"))
+    modules.sort(key=lambda m: m.VERSION)
+    return modules
+
+
+def applied_versions(bind: Engine) -> List[str]:
+    with bind.begin() as conn:
+        schema_migrations.create(conn, checkfirst=True)
+        return [row[0] for row in conn.execute(select(schema_migrations.c.version))]
+
+
+def upgrade(bind: Engine, target: Optional[str] = None) -> List[str]:
+    """미적용 마이그레이션을 순서대로 실행. 버전마다 트랜잭션 1개. 적용한 버전 목록 반환."""
+    done = set(applied_versions(bind))
+    applied = []
+    for module in _load_migrations():
+        if module.VERSION in done:
+            continue
+        if target is not None and module.VERSION > target:
+            break
+        with bind.begin() as conn:
+            module.upgrade(conn)
+            conn.execute(
+                schema_migrations.insert().values(
+                    version=module.VERSION,
+                    description=module.DESCRIPTION,
+                    applied_at=datetime.utcnow(),
+                )
+            )
+        applied.append(module.VERSION)
+    return applied
+
+
+def status(bind: Engine) -> List[tuple]:
+    done = set(applied_versions(bind))
+    return [(m.VERSION, m.DESCRIPTION, m.VERSION in done) for m in _load_migrations()]
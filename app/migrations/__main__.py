@@ -0,0 +1,27 @@
+import argparse
+
+from app.core.database import engine
+from app.migrations import status, upgrade
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.migrations", description="DB 스키마 마이그레이션")
+    parser.add_argument("command", nargs="?", default="upgrade", choices=["upgrade", "status"])
+    parser.add_argument("--target", default=None, help="이 버전까지만 적용 (예: 0002)")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        for version, description, is_applied in status(engine):
+            mark = "x" if is_applied else " "
+            print(f"[{mark}] {version}  {description}")
+        return
+
+    applied = upgrade(engine, target=args.target)
+    if applied:
+        print("적용 완료:", ", ".join(applied))
+    else:
+        print("이미 최신 버전입니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+기존 create_all 시절 스키마를 기준선으로 생성.
+예전 ai/difficulty_ai가 만들던 subject_pace(subject_name PK, user_id 없음) 테이블은
+SubjectPace 모델 형태로 옮기고, 기존 값은 공용 pace(user_id=NULL)로 보존한다.
+"""
+from sqlalchemy import text
+
+import app.models  # noqa: F401  (모든 모델을 metadata에 등록)
+from app.core.database import Base
+from app.migrations import has_column, has_table
+
+VERSION = "0001"
+DESCRIPTION = "baseline schema (+ legacy subject_pace 변환)"
+
+BASELINE_TABLES = [
+    "users",
+    "studies",
+    "study_members",
+    "subjects",
+    "study_records",
+    "study_invites",
+    "weekly_summaries",
+    "subject_pace",
+]
+
+
+def _upgrade_legacy_pace(conn):
+    if not has_table(conn, "subject_pace") or has_column(conn, "subject_pace", "user_id"):
+        return
+
+    conn.execute(text("ALTER TABLE subject_pace RENAME TO subject_pace_legacy"))
+    Base.metadata.tables["subject_pace"].create(conn)
+    conn.execute(
+        text(
+            "INSERT INTO subject_pace (user_id, subject_name, pace_factor, updated_at) "
+            "SELECT NULL, subject_name, pace_factor, updated_at FROM subject_pace_legacy"
+        )
+    )
+    conn.execute(text("DROP TABLE subject_pace_legacy"))
+
+
+def upgrade(conn):
+    _upgrade_legacy_pace(conn)
+    tables = [Base.metadata.tables[name] for name in BASELINE_TABLES]
+    Base.metadata.create_all(conn, tables=tables, checkfirst=True)
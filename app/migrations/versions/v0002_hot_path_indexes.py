@@ -0,0 +1,30 @@
+"""
+자주 쓰는 조회 조건에 맞춘 복합/부분 인덱스.
+- study_records: (user_id, record_date), (user_id, subject_id, status), (user_id, created_at)
+- study_records: PENDING만 담는 부분 인덱스 (complete-records의 최신 PENDING 조회)
+- study_members: (study_id, user_id), (user_id, study_id)
+- study_invites: 폐기되지 않은 초대만 담는 부분 인덱스
+"""
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.migrations import create_indexes
+
+VERSION = "0002"
+DESCRIPTION = "composite / partial indexes for hot queries"
+
+
+def upgrade(conn):
+    tables = Base.metadata.tables
+    create_indexes(conn, tables["study_records"], [
+        "ix_study_records_user_date",
+        "ix_study_records_user_subject_status",
+        "ix_study_records_user_created",
+        "ix_study_records_pending",
+    ])
+    create_indexes(conn, tables["study_members"], [
+        "ix_study_members_study_user",
+        "ix_study_members_user_study",
+    ])
+    create_indexes(conn, tables["study_invites"], [
+        "ix_study_invites_active",
+    ])
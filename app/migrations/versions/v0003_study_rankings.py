@@ -0,0 +1,16 @@
+"""
+스터디 랭킹 테이블(study_rankings) 생성 + 기존 study_records 이력으로 채우기.
+"""
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.migrations import has_table
+from app.services import ranking
+
+VERSION = "0003"
+DESCRIPTION = "study_rankings (incremental leaderboard) + backfill"
+
+
+def upgrade(conn):
+    if not has_table(conn, "study_rankings"):
+        Base.metadata.tables["study_rankings"].create(conn)
+    ranking.rebuild(conn)
@@ -0,0 +1,22 @@
+"""
+weekly_summaries를 (user_id, week_start)당 한 행으로 쓰기 위한 준비.
+- updated_at 컬럼 추가
+- 예전 형식(AI 결과 텍스트) 행 정리: 앱에서 쓴 적이 없고 backfill로 다시 채워짐
+- (user_id, week_start) unique 인덱스
+기존 이력 채우기는 `python -m app.cli weekly-summary backfill`.
+"""
+from sqlalchemy import text
+
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.migrations import create_indexes, has_column
+
+VERSION = "0004"
+DESCRIPTION = "weekly_summaries: updated_at + unique (user_id, week_start)"
+
+
+def upgrade(conn):
+    if not has_column(conn, "weekly_summaries", "updated_at"):
+        conn.execute(text("ALTER TABLE weekly_summaries ADD COLUMN updated_at TIMESTAMP"))
+    conn.execute(text("""DELETE FROM weekly_summaries WHERE summary_text NOT LIKE '{"subjects"%'"""))
+    create_indexes(conn, Base.metadata.tables["weekly_summaries"], ["ux_weekly_summaries_user_week"])
@@ -0,0 +1,17 @@
+"""
+(user, 과목, 날짜)별 롤업 테이블(daily_stats) 생성 + 기존 study_records 이력으로 채우기.
+다시 채우기: `python -m app.cli daily-stats rebuild`
+"""
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.migrations import has_table
+from app.services import daily_stats
+
+VERSION = "0005"
+DESCRIPTION = "daily_stats (user/subject/day rollup) + backfill"
+
+
+def upgrade(conn):
+    if not has_table(conn, "daily_stats"):
+        Base.metadata.tables["daily_stats"].create(conn)
+    daily_stats.rebuild(conn)
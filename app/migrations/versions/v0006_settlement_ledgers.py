@@ -0,0 +1,15 @@
+"""
+스터디별 월 정산 장부(settlement_ledgers) 생성.
+장부는 일 마감 작업이 채운다: `python -m app.cli settlement run [--date YYYY-MM-DD]`
+"""
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.migrations import has_table
+
+VERSION = "0006"
+DESCRIPTION = "settlement_ledgers (per-study monthly ledger)"
+
+
+def upgrade(conn):
+    if not has_table(conn, "settlement_ledgers"):
+        Base.metadata.tables["settlement_ledgers"].create(conn)
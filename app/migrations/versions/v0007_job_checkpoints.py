@@ -0,0 +1,15 @@
+"""
+배치 작업 진행 위치(job_checkpoints) 생성.
+첫 사용처는 다음 날 목표 미리 계산: `python -m app.cli preplan run [--date YYYY-MM-DD]`
+"""
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.migrations import has_table
+
+VERSION = "0007"
+DESCRIPTION = "job_checkpoints (resumable batch jobs)"
+
+
+def upgrade(conn):
+    if not has_table(conn, "job_checkpoints"):
+        Base.metadata.tables["job_checkpoints"].create(conn)
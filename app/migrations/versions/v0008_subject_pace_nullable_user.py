@@ -0,0 +1,38 @@
+"""
+subject_pace.user_id를 NULL 허용으로 변경 (공용 pace = user_id NULL).
+예전 create_all로 만든 DB는 user_id가 NOT NULL이라 공용 pace INSERT가 실패한다.
+- SQLite: 컬럼 제약을 바꿀 수 없어서 새 테이블을 만들고 복사한 뒤 교체
+- 그 외(Postgres): ALTER COLUMN user_id DROP NOT NULL
+"""
+from sqlalchemy import inspect, text
+
+import app.models  # noqa: F401
+from app.core.database import Base
+
+VERSION = "0008"
+DESCRIPTION = "subject_pace.user_id nullable (shared paces)"
+
+COLUMNS = "id, user_id, subject_name, pace_factor, updated_at"
+
+
+def _user_id_nullable(conn) -> bool:
+    return next(c["nullable"] for c in inspect(conn).get_columns("subject_pace") if c["name"] == "user_id")
+
+
+def _rebuild_sqlite(conn):
+    # 새 테이블이 같은 이름의 인덱스를 만들 수 있도록 기존 인덱스를 먼저 지움 (UNIQUE 제약의 자동 인덱스는 제외)
+    for index in inspect(conn).get_indexes("subject_pace"):
+        conn.execute(text(f'DROP INDEX "{index["name"]}"'))
+    conn.execute(text("ALTER TABLE subject_pace RENAME TO subject_pace_old"))
+    Base.metadata.tables["subject_pace"].create(conn)
+    conn.execute(text(f"INSERT INTO subject_pace ({COLUMNS}) SELECT {COLUMNS} FROM subject_pace_old"))
+    conn.execute(text("DROP TABLE subject_pace_old"))
+
+
+def upgrade(conn):
+    if _user_id_nullable(conn):
+        return
+    if conn.dialect.name == "sqlite":
+        _rebuild_sqlite(conn)
+    else:
+        conn.execute(text("ALTER TABLE subject_pace ALTER COLUMN user_id DROP NOT NULL"))
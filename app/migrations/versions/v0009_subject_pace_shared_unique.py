@@ -0,0 +1,35 @@
+"""
+공용 pace(user_id NULL)를 과목명당 한 행으로.
+UNIQUE(user_id, subject_name)는 NULL끼리 같은 값으로 보지 않아 동시 upsert에서 중복 행이 생길 수 있었다.
+- 중복된 공용 pace는 가장 최근에 갱신된 행만 남김
+- 부분 unique 인덱스 ux_subject_pace_shared_subject (subject_name) WHERE user_id IS NULL
+"""
+from sqlalchemy import delete, select
+
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.migrations import create_indexes
+
+VERSION = "0009"
+DESCRIPTION = "subject_pace: unique shared pace per subject"
+
+
+def _dedupe_shared(conn, table):
+    rows = conn.execute(
+        select(table.c.id, table.c.subject_name)
+        .where(table.c.user_id.is_(None))
+        .order_by(table.c.subject_name, table.c.updated_at.desc().nulls_last(), table.c.id.desc())
+    ).all()
+    seen, drop = set(), []
+    for row_id, name in rows:
+        if name in seen:
+            drop.append(row_id)
+        seen.add(name)
+    if drop:
+        conn.execute(delete(table).where(table.c.id.in_(drop)))
+
+
+def upgrade(conn):
+    table = Base.metadata.tables["subject_pace"]
+    _dedupe_shared(conn, table)
+    create_indexes(conn, table, ["ux_subject_pace_shared_subject"])
@@ -0,0 +1,21 @@
+"""
+결석을 기록 단위(PENDING → X)가 아니라 멤버 단위로.
+- study_absences: (study, user, 날짜)당 1행, 결석 벌금은 여기에만
+- settlement_ledgers.absence_count: 결석한 날 수 (x_count는 목표 미달 기록 수)
+이미 마감된 달의 장부는 다음 마감 때 다시 채워진다.
+"""
+from sqlalchemy import text
+
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.migrations import has_column, has_table
+
+VERSION = "0010"
+DESCRIPTION = "study_absences + settlement_ledgers.absence_count"
+
+
+def upgrade(conn):
+    if not has_table(conn, "study_absences"):
+        Base.metadata.tables["study_absences"].create(conn)
+    if not has_column(conn, "settlement_ledgers", "absence_count"):
+        conn.execute(text("ALTER TABLE settlement_ledgers ADD COLUMN absence_count INTEGER NOT NULL DEFAULT 0"))
@@ -0,0 +1,19 @@
+"""
+study_records.source: 목표를 누가 만들었는지.
+- NULL: 유저가 /study-goal/calculate로 직접 계산
+- "preplan": 야간 배치(app.services.preplan)가 미리 만든 목표
+- "preplan_opened": 유저가 /study-goal/today로 받아본 preplan 목표
+일 마감 정산은 받아보지 않은 preplan 목표를 목표 미달(X)로 바꾸지 않고 지운다.
+이 컬럼이 생기기 전에 만든 preplan 목표는 NULL(직접 계산)로 남는다.
+"""
+from sqlalchemy import text
+
+from app.migrations import has_column
+
+VERSION = "0011"
+DESCRIPTION = "study_records.source (preplan goals)"
+
+
+def upgrade(conn):
+    if not has_column(conn, "study_records", "source"):
+        conn.execute(text("ALTER TABLE study_records ADD COLUMN source VARCHAR"))
@@ -3,4 +3,9 @@ from .study import Study, StudyMember
 from .subject import Subject
 from .record import StudyRecord
 from .invite import StudyInvite
-from .summary import WeeklySummary
\ No newline at end of file
+from .summary import WeeklySummary
+from .pace import SubjectPace
+from .ranking import StudyRanking
+from .daily_stat import DailyStat
+from .settlement import SettlementLedger, StudyAbsence
+from .job import JobCheckpoint
\ No newline at end of file
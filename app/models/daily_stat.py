@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, Index
+from datetime import datetime
+from app.core.database import Base
+
+class DailyStat(Base):
+    """
+    (user, 과목, 날짜)별 학습 기록 롤업.
+    complete-records에서 O/X가 확정될 때마다 증분 반영 → 기간 분석/월 정산은 study_records 대신 이 테이블을 읽음.
+    PENDING(아직 완료 안 된 목표)은 포함하지 않는다.
+    """
+    __tablename__ = "daily_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=False)
+    stat_date = Column(Date, nullable=False)  # study_records.record_date
+
+    target_minutes = Column(Integer, nullable=False, default=0)
+    actual_minutes = Column(Integer, nullable=False, default=0)
+    target_pages = Column(Integer, nullable=False, default=0)
+    actual_pages = Column(Integer, nullable=False, default=0)
+
+    o_count = Column(Integer, nullable=False, default=0)
+    triangle_count = Column(Integer, nullable=False, default=0)  # 🔺
+    x_count = Column(Integer, nullable=False, default=0)
+    fine = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ux_daily_stats_user_subject_date", "user_id", "subject_id", "stat_date", unique=True),
+        # 기간 조회: user_id + 날짜 범위
+        Index("ix_daily_stats_user_date", "user_id", "stat_date"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Boolean
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Boolean, Index, false
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -17,4 +17,13 @@ class StudyInvite(Base):
     is_revoked = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # 폐기되지 않은 초대만 담는 부분 인덱스
+        Index(
+            "ix_study_invites_active", "study_id",
+            sqlite_where=is_revoked == false(),
+            postgresql_where=is_revoked == false(),
+        ),
+    )
+
     study = relationship("Study")
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index
+from datetime import datetime
+from app.core.database import Base
+
+class JobCheckpoint(Base):
+    """
+    배치 작업 진행 위치. (job, run_key)당 1행.
+    user_id 순으로 나눠 처리하는 작업이 청크마다 last_id를 저장해두고, 중단되면 그 다음부터 이어서 처리한다.
+    """
+    __tablename__ = "job_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job = Column(String, nullable=False)      # 예) "preplan"
+    run_key = Column(String, nullable=False)  # 예) 계획 날짜 "2025-03-02"
+
+    last_id = Column(Integer, nullable=False, default=0)  # 여기까지 처리 완료
+    processed = Column(Integer, nullable=False, default=0)
+    done = Column(Boolean, nullable=False, default=False)
+
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ux_job_checkpoints_job_run", "job", "run_key", unique=True),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -7,10 +7,19 @@ class SubjectPace(Base):
     __tablename__ = "subject_pace"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # None이면 로그인 없이 쓰는 ai/ API용 공용 pace
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     subject_name = Column(String, nullable=False) # 과목명 매칭
     pace_factor = Column(Float, default=1.0)      # AI 학습 속도 보정값
     updated_at = Column(DateTime, default=datetime.utcnow)
 
-    __table_args__ = (UniqueConstraint('user_id', 'subject_name', name='_user_subject_pace_uc'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'subject_name', name='_user_subject_pace_uc'),
+        # UNIQUE(user_id, subject_name)는 NULL끼리 중복을 막지 못하므로 공용 pace는 과목명만으로 unique
+        Index(
+            "ux_subject_pace_shared_subject", "subject_name", unique=True,
+            sqlite_where=user_id.is_(None),
+            postgresql_where=user_id.is_(None),
+        ),
+    )
     user = relationship("User", back_populates="pace_entries")
\ No newline at end of file
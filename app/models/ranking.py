@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, UniqueConstraint
+from datetime import datetime
+from app.core.database import Base
+
+class StudyRanking(Base):
+    """
+    스터디별 멤버 누적 성적 (랭킹용).
+    complete-records에서 O/X가 확정될 때마다 증분 반영 → 조회 시 study_records 재집계 안 함.
+    """
+    __tablename__ = "study_rankings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    study_id = Column(Integer, ForeignKey("studies.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    attendance_count = Column(Integer, nullable=False, default=0)  # 'O' 개수
+    total_minutes = Column(Integer, nullable=False, default=0)     # 실제 공부 시간 합
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("study_id", "user_id", name="_study_user_ranking_uc"),
+        # 순위 정렬 그대로 읽히도록 (study_id, 출석↓, 시간↓, user_id)
+        Index(
+            "ix_study_rankings_order",
+            "study_id", attendance_count.desc(), total_minutes.desc(), "user_id",
+        ),
+    )
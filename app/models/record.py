@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from datetime import datetime, date
@@ -19,7 +19,21 @@ class StudyRecord(Base):
     
     status = Column(String) 
     fine = Column(Integer, default=0)
+    # 목표를 만든 곳: None(직접 계산) / "preplan"(야간 배치) / "preplan_opened"(/today로 받아본 preplan 목표)
+    source = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_study_records_user_date", "user_id", "record_date"),
+        Index("ix_study_records_user_subject_status", "user_id", "subject_id", "status"),
+        Index("ix_study_records_user_created", "user_id", "created_at"),
+        # PENDING 목표만 담는 부분 인덱스 (complete-records 조회용)
+        Index(
+            "ix_study_records_pending", "user_id", "subject_id", "id",
+            sqlite_where=status == "PENDING",
+            postgresql_where=status == "PENDING",
+        ),
+    )
+
     user = relationship("User", back_populates="records")
     subject = relationship("Subject", back_populates="records")
\ No newline at end of file
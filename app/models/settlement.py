@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index
+from datetime import datetime
+from app.core.database import Base
+
+class SettlementLedger(Base):
+    """
+    스터디별 · 월별 멤버 정산 장부.
+    일 마감 정산 작업(app.services.settlement)이 하루를 마감할 때마다 해당 월 행을 다시 채운다.
+    """
+    __tablename__ = "settlement_ledgers"
+
+    id = Column(Integer, primary_key=True, index=True)
+    study_id = Column(Integer, ForeignKey("studies.id"), nullable=False)
+    month = Column(String, nullable=False)  # "YYYY-MM"
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    o_count = Column(Integer, nullable=False, default=0)
+    triangle_count = Column(Integer, nullable=False, default=0)  # 🔺
+    x_count = Column(Integer, nullable=False, default=0)          # 목표 미달 기록 수
+    absence_count = Column(Integer, nullable=False, default=0)    # 결석한 날 수 (study_absences)
+    total_fine = Column(Integer, nullable=False, default=0)
+
+    settled_through = Column(Date, nullable=False)  # 이 날짜까지 마감된 값
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ux_settlement_ledgers_study_month_user", "study_id", "month", "user_id", unique=True),
+    )
+
+class StudyAbsence(Base):
+    """
+    결석: 스터디 멤버가 그날 그 스터디 과목에 제출한 기록이 하나도 없는 날. (study, user, 날짜)당 1행.
+    목표를 세웠는지와 상관없이 멤버십 기준으로 일 마감 정산이 만든다. 벌금(Study.fine_per_absence)은 여기에만 붙는다.
+    """
+    __tablename__ = "study_absences"
+
+    id = Column(Integer, primary_key=True, index=True)
+    study_id = Column(Integer, ForeignKey("studies.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    absence_date = Column(Date, nullable=False)
+    fine = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ux_study_absences_study_user_date", "study_id", "user_id", "absence_date", unique=True),
+        # 개인 월 정산: user_id + 날짜 범위
+        Index("ix_study_absences_user_date", "user_id", "absence_date"),
+    )
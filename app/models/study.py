@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -28,5 +28,10 @@ class StudyMember(Base):
     role = Column(String, default="member")
     joined_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_study_members_study_user", "study_id", "user_id"),
+        Index("ix_study_members_user_study", "user_id", "study_id"),
+    )
+
     study = relationship("Study", back_populates="members")
     user = relationship("User", back_populates="study_members")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey, Date, DateTime
+from sqlalchemy import Column, Integer, Text, ForeignKey, Date, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -10,7 +10,12 @@ class WeeklySummary(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     week_start = Column(Date, nullable=False)
     week_end = Column(Date, nullable=False)
-    summary_text = Column(Text, nullable=False) # AI 결과 텍스트
+    summary_text = Column(Text, nullable=False) # AI 결과 텍스트 (과목별 주간 합계 JSON)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ux_weekly_summaries_user_week", "user_id", "week_start", unique=True),
+    )
 
     user = relationship("User", back_populates="summaries")
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+pytest 플러그인: 요청당 SQL 예산 / N+1 검사 (app.core.query_budget).
+
+사용:
+    # conftest.py
+    pytest_plugins = ["app.pytest_plugin"]
+
+- 이 모듈이 import될 때 QUERY_BUDGET_MODE=raise로 설정 (앱보다 먼저 로드할 것) → 예산을 넘은 요청은 500으로 응답
+- query_budget fixture: 테스트 중 처리된 요청에 위반이 있으면 테스트 실패 (위반 내용 + 반복된 SQL 표시)
+- assert_every_route_has_budget(app): 예산 선언(@query_budget)이 빠진 라우트가 있으면 실패
+"""
+import os
+
+import pytest
+
+# app.core.config가 settings를 만들기 전에 설정해야 하므로 플러그인 모듈을 import하는 시점에.
+# (pytest_configure는 conftest / 테스트 모듈이 앱을 먼저 import하면 이미 늦음)
+os.environ.setdefault("QUERY_BUDGET_MODE", "raise")
+
+
+@pytest.fixture
+def query_budget():
+    from app.core import query_budget as qb
+    from app.core.config import settings
+
+    if settings.QUERY_BUDGET_MODE == "off":
+        pytest.fail("QUERY_BUDGET_MODE=off 상태에서는 SQL 예산을 검사할 수 없습니다.")
+    with qb.track() as violations:
+        yield violations
+    if violations:
+        pytest.fail("SQL 예산 초과 / N+1 의심:\n" + "\n".join(v.describe() for v in violations), pytrace=False)
+
+
+def assert_every_route_has_budget(app) -> None:
+    from app.core.query_budget import routes_without_budget
+
+    missing = routes_without_budget(app)
+    assert not missing, "@query_budget 선언이 없는 라우트: " + ", ".join(missing)
@@ -0,0 +1,67 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.core import profiling
+from app.core.config import settings
+from app.core.dependencies import require_admin
+from app.core.query_budget import query_budget
+from app.services import pace_replay
+from app.services.pace_store import EMA_ALPHA
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+# ✅ 관리자만: study_records 이력으로 pace_factor 전체 재계산
+# 이력 전체를 읽고 계산하는 오래 걸리는 작업이라 sync 세션으로 스레드에서 (이벤트 루프를 막지 않음)
+@router.post("/pace/replay")
+@query_budget(6)
+async def replay_pace(
+    alpha: float = Query(EMA_ALPHA, gt=0, le=1),
+    user_id: Optional[int] = None,
+    dry_run: bool = False,
+):
+    return await asyncio.to_thread(pace_replay.replay_committed, alpha, user_id, dry_run)
+
+
+# ✅ 관리자만: 이 워커의 요청 프로파일링 켜기/끄기 (PROFILING_ENABLED=true로 띄운 인스턴스만)
+@router.get("/profiling")
+@query_budget(2)
+async def get_profiling():
+    return {"enabled": settings.PROFILING_ENABLED, "active": profiling.is_active()}
+
+
+@router.put("/profiling")
+@query_budget(2)
+async def set_profiling(active: bool):
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=409, detail="PROFILING_ENABLED=true로 띄운 인스턴스에서만 켤 수 있습니다.")
+    return {"enabled": True, "active": profiling.set_active(active)}
+
+
+# ✅ 관리자만: 요청 프로파일 조회 (관리자가 X-Profile: 1 로 남긴 것)
+@router.get("/profiles")
+@query_budget(2)
+async def list_profiles():
+    return profiling.list_profiles()
+
+
+@router.get("/profiles/{profile_id}")
+@query_budget(2)
+async def get_profile(profile_id: str):
+    profile = profiling.get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="프로파일이 없습니다. (다른 워커에서 남겼거나 보관 개수를 넘어 지워짐)")
+    return {k: v for k, v in profile.items() if k != "stacks"}
+
+
+@router.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+@query_budget(2)
+async def get_profile_collapsed(profile_id: str):
+    # flamegraph.pl / speedscope / inferno-flamegraph 입력 형식
+    profile = profiling.get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="프로파일이 없습니다. (다른 워커에서 남겼거나 보관 개수를 넘어 지워짐)")
+    return profiling.collapsed(profile)
@@ -1,47 +1,82 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.models.record import StudyRecord
-from app.models.pace import SubjectPace
-from app.auth.google import get_current_user
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.schemas.analytics import AnalyticsResponse
+from app.services import analytics, weekly_summary
+from app.core.dependencies import get_current_user
+from app.core.query_budget import query_budget
 from datetime import date, timedelta
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/ai", tags=["AI Analytics"])
 
-# --- 주간 요약용 헬퍼 함수 ---
-def _safe_div(a, b): return a / b if b else 0.0
+MAX_RANGE_DAYS = 366
+
+
+def _check_range(start: date, end: date) -> None:
+    if start > end:
+        raise HTTPException(status_code=400, detail="start는 end보다 늦을 수 없습니다.")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"조회 기간은 최대 {MAX_RANGE_DAYS}일입니다.")
+
 
 @router.get("/weekly-summary")
-def get_weekly_summary(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    # 최근 7일 데이터 조회
-    seven_days_ago = date.today() - timedelta(days=7)
-    records = db.query(StudyRecord).filter(
-        StudyRecord.user_id == current_user.id,
-        StudyRecord.record_date >= seven_days_ago
-    ).all()
-
-    if not records:
-        return {"message": "최근 7일간의 기록이 없습니다."}
-
-    # 과목별 그룹화 및 분석 (보내주신 3번 파일 로직 적용)
-    subject_data = {}
-    for r in records:
-        if r.subject_id not in subject_data:
-            subject_data[r.subject_id] = {"t_min": 0, "a_min": 0, "t_pg": 0, "a_pg": 0}
-        subject_data[r.subject_id]["t_min"] += r.target_minutes
-        subject_data[r.subject_id]["a_min"] += r.actual_minutes
-        subject_data[r.subject_id]["t_pg"] += r.target_pages
-        subject_data[r.subject_id]["a_pg"] += r.actual_pages
-
-    summary = []
-    for s_id, data in subject_data.items():
-        eff_ratio = _safe_div(data["a_pg"]/data["a_min"], data["t_pg"]/data["t_min"]) if data["a_min"] > 0 and data["t_min"] > 0 else 1.0
-        summary.append({
-            "subject_id": s_id,
-            "efficiency_ratio": round(eff_ratio, 2),
-            "feedback": "잘하고 있어요!" if 0.8 <= eff_ratio <= 1.2 else "조정이 필요해요."
-        })
-
-    return {"week_range": f"{seven_days_ago} ~ {date.today()}", "subjects": summary}
\ No newline at end of file
+@query_budget(4)
+async def get_weekly_summary(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
+):
+    if start is None and end is None:
+        # 이번 주(월~일) 요약: 기록 완료 때마다 갱신되는 weekly_summaries 행 하나만 조회
+        start, end = weekly_summary.week_bounds(date.today())
+        stored = await db.run_sync(weekly_summary.read_week, current_user.id, start)
+        if not stored:
+            return {"message": "이번 주 완료된 기록이 없습니다."}
+        names = await db.run_sync(analytics.subject_names, list(stored))
+        rows = [
+            {
+                "subject_id": s_id,
+                "subject_name": names.get(s_id),
+                "efficiency_ratio": round(analytics.efficiency(data["t_min"], data["a_min"], data["t_pg"], data["a_pg"]), 2),
+            }
+            for s_id, data in stored.items()
+        ]
+    else:
+        # 임의 기간: DB에서 과목별 SUM / GROUP BY
+        end = end or date.today()
+        start = start or end - timedelta(days=6)
+        _check_range(start, end)
+        rows = await db.run_sync(analytics.aggregate, current_user.id, start, end, "subject")
+        if not rows:
+            return {"message": "해당 기간에 완료된 기록이 없습니다."}
+
+    summary = [
+        {
+            "subject_id": r["subject_id"],
+            "subject_name": r["subject_name"],
+            "efficiency_ratio": r["efficiency_ratio"],
+            "feedback": analytics.feedback(r["efficiency_ratio"]),
+        }
+        for r in rows
+    ]
+    return {"week_range": f"{start} ~ {end}", "subjects": summary}
+
+
+@router.get("/analytics", response_model=AnalyticsResponse)
+@query_budget(4)
+async def get_analytics(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    group_by: Literal["subject", "day", "week"] = "subject",
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user),
+):
+    """기간별 학습 집계. 기본 기간은 오늘 포함 최근 7일."""
+    end = end or date.today()
+    start = start or end - timedelta(days=6)
+    _check_range(start, end)
+    rows = await db.run_sync(analytics.aggregate, current_user.id, start, end, group_by)
+    return {"start": start, "end": end, "group_by": group_by, "rows": rows}
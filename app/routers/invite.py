@@ -6,6 +6,8 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.query_budget import query_budget
+from app.core.permissions import get_roles, invalidate_memberships
 from app.models.invite import StudyInvite
 from app.models.study import StudyMember, Study
 from app.models.user import User
@@ -27,6 +29,7 @@ def _validate_invite(inv: StudyInvite):
 
 
 @invite_router.get("/{token}", response_model=InvitePreviewResponse)
+@query_budget(3)
 def preview_invite(token: str, db: Session = Depends(get_db)):
     token_hash = _hash_token(token)
     inv = db.query(StudyInvite).filter(StudyInvite.token_hash == token_hash).first()
@@ -45,6 +48,7 @@ def preview_invite(token: str, db: Session = Depends(get_db)):
 
 
 @invite_router.post("/{token}/accept")
+@query_budget(6)
 def accept_invite(
     token: str,
     db: Session = Depends(get_db),
@@ -54,13 +58,10 @@ def accept_invite(
     inv = db.query(StudyInvite).filter(StudyInvite.token_hash == token_hash).first()
     _validate_invite(inv)
 
-    exists = db.query(StudyMember).filter(
-        StudyMember.study_id == inv.study_id,
-        StudyMember.user_id == current_user.id
-    ).first()
-    if exists:
+    if inv.study_id in get_roles(db, current_user):
         return {"message": "이미 가입된 멤버입니다.", "study_id": inv.study_id}
 
     db.add(StudyMember(study_id=inv.study_id, user_id=current_user.id, role="member"))
     db.commit()
+    invalidate_memberships(user_id=current_user.id)
     return {"message": "스터디에 가입했습니다.", "study_id": inv.study_id}
@@ -1,20 +1,27 @@
 import hashlib
 import secrets
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import delete, select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.dependencies import get_current_user
-from app.core.permissions import require_owner
+from app.core.query_budget import query_budget
+from app.core.responses import trusted_json
+from app.core.permissions import get_roles_async, invalidate_memberships, require_owner_async, require_study_member_async
 from app.models.study import Study, StudyMember
 from app.models.user import User
 from app.models.invite import StudyInvite
 from app.schemas.study import StudyCreate, StudyResponse, MyStudyResponse
 from app.schemas.invite import InviteCreateRequest, InviteCreateResponse
+from app.schemas.ranking import RankingItem, RankingPage
+from app.schemas.report import StudyWeeklyReport
+from app.schemas.settlement import StudySettlement
+from app.services import ranking, settlement, study_report, weekly_summary
 
 router = APIRouter(prefix="/studies", tags=["Studies"])
 
@@ -24,9 +31,10 @@ def _hash_token(token: str) -> str:
 
 
 @router.post("/", response_model=StudyResponse)
-def create_study(
+@query_budget(5)
+async def create_study(
     study_in: StudyCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     new_study = Study(
@@ -37,28 +45,29 @@ def create_study(
 
     db.add(new_study)
     try:
-        db.flush()
+        await db.flush()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=409, detail="이미 존재하는 스터디 방 이름입니다.")
 
     db.add(StudyMember(study_id=new_study.id, user_id=current_user.id, role="owner"))
-    db.commit()
-    db.refresh(new_study)
+    await db.commit()
+    invalidate_memberships(user_id=current_user.id)
+    await db.refresh(new_study)
     return new_study
 
 
 @router.get("/list", response_model=List[MyStudyResponse])
-def get_my_studies(
-    db: Session = Depends(get_db),
+@query_budget(3)
+async def get_my_studies(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    results = (
-        db.query(Study, StudyMember.role)
+    results = (await db.execute(
+        select(Study, StudyMember.role)
         .join(StudyMember, Study.id == StudyMember.study_id)
-        .filter(StudyMember.user_id == current_user.id)
-        .all()
-    )
+        .where(StudyMember.user_id == current_user.id)
+    )).all()
 
     my_studies = []
     for study, role in results:
@@ -73,73 +82,79 @@ def get_my_studies(
         }
         my_studies.append(study_data)
 
-    return my_studies # 최종적으로 [{}, {}] 형태의 리스트 반환
+    # DB 값으로 직접 만든 dict라 response_model 재검증 없이 바로 직렬화 (스키마는 문서용)
+    return trusted_json(my_studies)
 
 
 @router.delete("/{study_id}/leave")
-def leave_study(
+@query_budget(4)
+async def leave_study(
     study_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    membership = db.query(StudyMember).filter(
-        StudyMember.study_id == study_id,
-        StudyMember.user_id == current_user.id
-    ).first()
-    if not membership:
+    roles = await get_roles_async(db, current_user)
+    if study_id not in roles:
         raise HTTPException(status_code=404, detail="가입된 스터디가 아닙니다.")
 
-    db.delete(membership)
-    db.commit()
+    await db.execute(
+        delete(StudyMember).where(
+            StudyMember.study_id == study_id,
+            StudyMember.user_id == current_user.id
+        )
+    )
+    await db.commit()
+    invalidate_memberships(user_id=current_user.id)
     return {"message": "스터디에서 탈퇴했습니다."}
 
 
 @router.delete("/{study_id}/delete")
-def delete_study(
+@query_budget(10)
+async def delete_study(
     study_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    # 1. 내 멤버십 정보와 역할을 조회
-    membership = db.query(StudyMember).filter(
-        StudyMember.study_id == study_id,
-        StudyMember.user_id == current_user.id
-    ).first()
+    # 1. 내 멤버십 정보와 역할을 조회 (캐시된 {study_id: role})
+    role = (await get_roles_async(db, current_user)).get(study_id)
 
     # 2. 권한 검증
-    if not membership:
+    if role is None:
         raise HTTPException(status_code=404, detail="스터디 멤버가 아닙니다.")
     
     # role이 'owner'인 경우만 삭제 가능하도록 설정
-    if membership.role != "owner":
+    if role != "owner":
         raise HTTPException(status_code=403, detail="방장(owner)만 스터디를 삭제할 수 있습니다.")
 
     # 3. 스터디 조회 및 삭제
-    study = db.query(Study).filter(Study.id == study_id).first()
+    study = await db.get(Study, study_id)
     if not study:
         raise HTTPException(status_code=404, detail="스터디를 찾을 수 없습니다.")
 
     try:
         # 스터디를 삭제하면 Cascade 설정에 따라 멤버들도 함께 지워집니다.
-        db.delete(study)
-        db.commit()
+        await db.delete(study)
+        await db.commit()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="삭제 처리 중 오류가 발생했습니다.")
 
+    invalidate_memberships(study_id=study_id)
+
     return {"message": f"'{study.name}' 스터디가 삭제되었습니다."}
 
 
 # ✅ owner만: 초대 링크 생성 (기본 무기한)
 @router.post("/{study_id}/invites", response_model=InviteCreateResponse)
-def create_invite(
+@query_budget(5)
+async def create_invite(
     study_id: int,
     request: Request,
     req: Optional[InviteCreateRequest] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    require_owner(study_id, db, current_user)
+    await require_owner_async(study_id, db, current_user)
 
     token = secrets.token_urlsafe(32)
     token_hash = _hash_token(token)
@@ -156,8 +171,8 @@ def create_invite(
         is_revoked=False
     )
     db.add(inv)
-    db.commit()
-    db.refresh(inv)
+    await db.commit()
+    await db.refresh(inv)
 
     base_url = str(request.base_url).rstrip("/")
     invite_url = f"{base_url}/invites/{token}"
@@ -166,41 +181,99 @@ def create_invite(
 
 # ✅ owner만: 초대 링크 폐기
 @router.post("/{study_id}/invites/{invite_id}/revoke")
-def revoke_invite(
+@query_budget(5)
+async def revoke_invite(
     study_id: int,
     invite_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    require_owner(study_id, db, current_user)
-
-    inv = db.query(StudyInvite).filter(
-        StudyInvite.id == invite_id,
-        StudyInvite.study_id == study_id
-    ).first()
+    await require_owner_async(study_id, db, current_user)
+
+    inv = (await db.execute(
+        select(StudyInvite).where(
+            StudyInvite.id == invite_id,
+            StudyInvite.study_id == study_id
+        )
+    )).scalars().first()
     if not inv:
         raise HTTPException(status_code=404, detail="초대 링크를 찾을 수 없습니다.")
 
     inv.is_revoked = True
-    db.commit()
+    await db.commit()
     return {"message": "초대 링크를 폐기했습니다."}
 
 
 # ✅ owner만: 벌금 설정
 @router.patch("/{study_id}/fine", response_model=StudyResponse)
-def update_fine(
+@query_budget(6)
+async def update_fine(
     study_id: int,
     fine_per_absence: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    require_owner(study_id, db, current_user)
+    await require_owner_async(study_id, db, current_user)
 
-    study = db.query(Study).filter(Study.id == study_id).first()
+    study = await db.get(Study, study_id)
     if not study:
         raise HTTPException(status_code=404, detail="스터디를 찾을 수 없습니다.")
 
     study.fine_per_absence = fine_per_absence
-    db.commit()
-    db.refresh(study)
+    await db.commit()
+    await db.refresh(study)
     return study
+
+
+# ✅ 멤버만: 스터디 랭킹 (출석 수 → 총 공부시간 순, 동점은 같은 순위)
+@router.get("/{study_id}/ranking", response_model=RankingPage)
+@query_budget(6)
+async def get_ranking(
+    study_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    await require_study_member_async(study_id, db, current_user)
+    return await db.run_sync(ranking.top, study_id, limit, offset)
+
+
+# ✅ 멤버만: 내 순위
+@router.get("/{study_id}/ranking/me", response_model=RankingItem)
+@query_budget(5)
+async def get_my_ranking(
+    study_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    await require_study_member_async(study_id, db, current_user)
+    return await db.run_sync(ranking.my_rank, study_id, current_user)
+
+
+# ✅ 방장만: 멤버 전체 주간 리포트 (week_start가 속한 주, 기본 이번 주)
+@router.get("/{study_id}/weekly-report", response_model=StudyWeeklyReport)
+@query_budget(6)
+async def get_weekly_report(
+    study_id: int,
+    week_start: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    await require_owner_async(study_id, db, current_user)
+    start, end = weekly_summary.week_bounds(week_start or date.today())
+    # 멤버 수 × 과목 수만큼 중첩된 응답이라 재검증 비용이 큼 → 서비스가 만든 dict를 바로 직렬화
+    return trusted_json(await study_report.build_report(db, study_id, start, end))
+
+
+# ✅ 방장만: 멤버 전체 월 정산 (일 마감 작업이 채운 장부, month 기본 이번 달)
+@router.get("/{study_id}/settlement", response_model=StudySettlement)
+@query_budget(4)
+async def get_study_settlement(
+    study_id: int,
+    month: Optional[str] = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="YYYY-MM"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    await require_owner_async(study_id, db, current_user)
+    return await db.run_sync(settlement.read_ledger, study_id, month or settlement.month_key(date.today()))
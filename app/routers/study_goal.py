@@ -1,19 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.models.subject import Subject
-from app.models.record import StudyRecord
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.models.user import User
-from app.models.pace import SubjectPace
-from app.auth.google import get_current_user
+from app.services.completion import complete_pending
+from app.services.daily_plan import plan_day, read_pending
+from app.services import exam_schedule, preplan
+from app.schemas.schedule import ExamScheduleRequest, ExamScheduleResponse
+from app.core.dependencies import get_current_user
+from app.core.query_budget import query_budget
 from typing import List
 from pydantic import BaseModel
-from datetime import datetime, date
+from datetime import date, timedelta
 
 router = APIRouter(prefix="/study-goal", tags=["Daily Routine"])
 
-PAGES_PER_HOUR_BY_DIFFICULTY = {1: 13, 2: 11, 3: 9, 4: 8, 5: 7}
-
 # --- Schemas ---
 class SubjectDifficultyInput(BaseModel):
     subject_id: int
@@ -33,76 +33,73 @@ class BatchRecordUpdate(BaseModel):
 
 # --- Logic ---
 @router.post("/calculate")
-def calculate_dynamic_goal(request: DailyGoalRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    subjects_info = []
-    total_weight = 0
-    
-    for s_input in request.subjects:
-        db_subject = db.query(Subject).filter(Subject.id == s_input.subject_id).first()
-        if not db_subject: continue
-        
-        weight = db_subject.importance * db_subject.total_pages
-        total_weight += weight
-        subjects_info.append((db_subject, s_input.difficulty, weight))
-
-    if not subjects_info or total_weight == 0:
+@query_budget(6)
+async def calculate_dynamic_goal(request: DailyGoalRequest, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    # 과목 IN 조회 1번 + pace 조회 1번 + (기존 PENDING 삭제 + bulk INSERT)
+    goals = await db.run_sync(
+        plan_day,
+        current_user.id,
+        request.total_minutes,
+        [(s.subject_id, s.difficulty) for s in request.subjects],
+        date.today(),
+    )
+    if not goals:
         raise HTTPException(status_code=400, detail="유효한 과목 데이터가 없습니다.")
 
-    created_goals = []
-    for db_subject, diff, weight in subjects_info:
-        time_ratio = weight / total_weight
-        allocated_minutes = round(request.total_minutes * time_ratio)
-
-        # Pace Factor 조회
-        pace_entry = db.query(SubjectPace).filter_by(user_id=current_user.id, subject_name=db_subject.name).first()
-        pace = pace_entry.pace_factor if pace_entry else 1.0
-        
-        pages_per_min = (PAGES_PER_HOUR_BY_DIFFICULTY.get(diff, 9) * pace) / 60
-        recommended_pages = min(round(allocated_minutes * pages_per_min), db_subject.total_pages)
-
-        new_record = StudyRecord(
-            user_id=current_user.id,
-            subject_id=db_subject.id,
-            record_date=date.today(),
-            target_minutes=allocated_minutes,
-            target_pages=recommended_pages,
-            actual_minutes=0,
-            actual_pages=0,
-            status="PENDING"
-        )
-        db.add(new_record)
-        created_goals.append({"subject_name": db_subject.name, "target_minutes": allocated_minutes, "target_pages": recommended_pages})
-
-    db.commit()
+    await db.commit()
+    created_goals = [
+        {"subject_name": g["subject_name"], "target_minutes": g["target_minutes"], "target_pages": g["target_pages"]}
+        for g in goals
+    ]
     return {"goals": created_goals}
 
-@router.post("/complete-records")
-def complete_records(data: BatchRecordUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    results = []
-    for item in data.records:
-        record = db.query(StudyRecord).filter(
-            StudyRecord.user_id == current_user.id,
-            StudyRecord.subject_id == item.subject_id,
-            StudyRecord.status == "PENDING"
-        ).order_by(StudyRecord.id.desc()).first()
-
-        if not record: continue
-
-        # 성취도 및 Pace Factor(EMA) 반영
-        target_speed = record.target_pages / record.target_minutes if record.target_minutes > 0 else 0
-        actual_speed = item.actual_minutes and item.actual_pages / item.actual_minutes or 0
-        ratio = actual_speed / target_speed if target_speed > 0 else 1.0
+@router.get("/today")
+@query_budget(3)
+async def get_today_goals(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    # 야간 배치(app.services.preplan)가 미리 만든 오늘 목표를 읽기만 함. 비어 있으면 /calculate로 직접 계산
+    goals = await db.run_sync(read_pending, current_user.id, date.today())
+    if any(g["source"] == preplan.SOURCE for g in goals):
+        # 받아본 목표는 정산에서 목표 미달로 처리되도록 표시 (처음 열 때만 UPDATE 1번)
+        await db.run_sync(preplan.mark_opened, current_user.id, date.today())
+        await db.commit()
+    created_goals = [
+        {"subject_name": g["subject_name"], "target_minutes": g["target_minutes"], "target_pages": g["target_pages"]}
+        for g in goals
+    ]
+    return {"goals": created_goals}
 
-        # Pace Factor 업데이트
-        db_subject = db.query(Subject).filter(Subject.id == item.subject_id).first()
-        pace_entry = db.query(SubjectPace).filter_by(user_id=current_user.id, subject_name=db_subject.name).first()
-        if pace_entry:
-            pace_entry.pace_factor = round(pace_entry.pace_factor * 0.8 + ratio * 0.2, 2)
-            pace_entry.updated_at = datetime.utcnow()
+@router.post("/schedule", response_model=ExamScheduleResponse)
+@query_budget(5)
+async def plan_exam_schedule(request: ExamScheduleRequest, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    # 시험 날짜까지 날짜별 계획. 진행도(daily_stats)와 pace를 매번 새로 읽으므로 기록이 들어온 뒤 다시 부르면 그대로 재계획
+    start = request.start_date or date.today()
+    last_day = max(e.exam_date for e in request.exams) - (timedelta(0) if request.study_on_exam_day else timedelta(days=1))
+    n_days = (last_day - start).days + 1
+    if n_days <= 0:
+        raise HTTPException(status_code=400, detail="시작일 이후의 시험 날짜가 필요합니다.")
+    if n_days > exam_schedule.MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"계획 기간은 최대 {exam_schedule.MAX_DAYS}일입니다.")
+
+    subjects = await db.run_sync(
+        exam_schedule.load_subjects,
+        current_user.id,
+        [(e.subject_id, e.exam_date, e.difficulty) for e in request.exams],
+    )
+    if not subjects:
+        raise HTTPException(status_code=400, detail="유효한 과목 데이터가 없습니다.")
 
-        record.actual_minutes, record.actual_pages = item.actual_minutes, item.actual_pages
-        record.status = "O" if item.actual_pages >= record.target_pages else "X"
-        results.append({"subject": db_subject.name, "status": record.status})
+    capacity = exam_schedule.capacity_for(
+        start, n_days, request.daily_minutes, request.weekday_minutes,
+        {d.date: d.minutes for d in request.day_minutes},
+    )
+    plan = exam_schedule.plan_schedule(start, capacity, subjects, request.study_on_exam_day)
+    return {"start_date": start, **plan}
 
-    db.commit()
+@router.post("/complete-records")
+@query_budget(14)
+async def complete_records(data: BatchRecordUpdate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    # 최신 PENDING 조회 1번 + 과목 조회 1번 + bulk UPDATE, pace(EMA)는 모아서 한 번에
+    completed = await db.run_sync(complete_pending, current_user.id, data.records)
+    await db.commit()
+    results = [{"subject": c["subject"], "status": c["status"]} for c in completed]
     return {"results": results}
\ No newline at end of file
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.query_budget import query_budget
 from app.core.permissions import require_study_member
 from app.models.subject import Subject
 from app.models.user import User
@@ -12,6 +13,7 @@ router = APIRouter(prefix="/subjects", tags=["Subjects"])
 
 
 @router.post("/{study_id}", response_model=SubjectResponse)
+@query_budget(5)
 def create_subject(
     study_id: int,
     subject_in: SubjectCreate,
@@ -21,7 +23,7 @@ def create_subject(
     # ✅ 멤버면 과목 생성 가능 (owner 포함)
     require_study_member(study_id, db, current_user)
 
-    new_subject = Subject(name=subject_in.name, study_id=study_id)
+    new_subject = Subject(name=subject_in.name, study_id=study_id, user_id=current_user.id)
     db.add(new_subject)
     db.commit()
     db.refresh(new_subject)
@@ -2,12 +2,14 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.query_budget import query_budget
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.post("/", response_model=UserResponse)
+@query_budget(3)
 def create_user(user: UserCreate, db: Session = Depends(get_db)):
     db_user = User(
         email=user.email,
@@ -19,5 +21,6 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     return db_user
 
 @router.get("/", response_model=list[UserResponse])
+@query_budget(2)
 def get_users(db: Session = Depends(get_db)):
     return db.query(User).all()
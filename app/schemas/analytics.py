@@ -0,0 +1,24 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class AnalyticsRow(BaseModel):
+    period: Optional[date] = None  # group_by=day: 날짜 / week: 주 시작(월요일) / subject: null
+    subject_id: int
+    subject_name: str
+
+    record_count: int
+    target_minutes: int
+    actual_minutes: int
+    target_pages: int
+    actual_pages: int
+    efficiency_ratio: float
+
+
+class AnalyticsResponse(BaseModel):
+    start: date
+    end: date
+    group_by: str
+    rows: List[AnalyticsRow]
@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic import BaseModel
 
 
@@ -13,3 +15,9 @@ class RankingItem(BaseModel):
     class Config:
         from_attributes = True
 
+
+class RankingPage(BaseModel):
+    total: int
+    limit: int
+    offset: int
+    items: List[RankingItem]
@@ -0,0 +1,20 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from ai.weekly_summary_ai import WeeklySummaryResponse
+
+
+class MemberWeeklyReport(BaseModel):
+    user_id: int
+    name: str
+    email: str
+    summary: Optional[WeeklySummaryResponse] = None  # 이번 주 완료 기록이 없으면 null
+
+
+class StudyWeeklyReport(BaseModel):
+    study_id: int
+    week_start: date
+    week_end: date
+    members: List[MemberWeeklyReport]
@@ -0,0 +1,57 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ExamInput(BaseModel):
+    subject_id: int
+    exam_date: date
+    difficulty: Optional[int] = Field(None, ge=1, le=5)  # 없으면 과목에 저장된 난이도
+
+
+class DayMinutes(BaseModel):
+    date: date
+    minutes: int = Field(..., ge=0, le=1440)
+
+
+class ExamScheduleRequest(BaseModel):
+    exams: List[ExamInput] = Field(..., min_length=1, max_length=50)
+    daily_minutes: int = Field(..., ge=0, le=1440)
+    # 요일별 공부 시간 (월~일 7개). 있으면 daily_minutes 대신 사용
+    weekday_minutes: Optional[List[int]] = Field(None, min_length=7, max_length=7)
+    # 특정 날짜만 다르게 (예: 약속 있는 날 0분)
+    day_minutes: List[DayMinutes] = []
+    start_date: Optional[date] = None  # 기본: 오늘
+    study_on_exam_day: bool = False
+
+
+class ScheduleGoal(BaseModel):
+    subject_id: int
+    subject_name: str
+    minutes: int
+    pages: int
+
+
+class ScheduleDay(BaseModel):
+    date: date
+    capacity: int
+    free_minutes: int
+    goals: List[ScheduleGoal]
+
+
+class SubjectSchedule(BaseModel):
+    subject_id: int
+    subject_name: str
+    exam_date: date
+    remaining_pages: int
+    planned_pages: int
+    shortfall_pages: int  # 시간이 모자라 시험 전까지 못 끝내는 페이지
+    pace_factor: float
+
+
+class ExamScheduleResponse(BaseModel):
+    start_date: date
+    feasible: bool
+    subjects: List[SubjectSchedule]
+    days: List[ScheduleDay]
@@ -0,0 +1,24 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class MemberSettlement(BaseModel):
+    user_id: int
+    name: str
+    email: str
+
+    O_count: int
+    triangle_count: int
+    X_count: int  # 목표 미달
+    absence_count: int  # 결석한 날 수 (벌금은 결석에만)
+    total_fine: int
+
+
+class StudySettlement(BaseModel):
+    study_id: int
+    month: str  # "YYYY-MM"
+    settled_through: Optional[date] = None  # 아직 마감된 날이 없으면 null
+    total_fine: int
+    members: List[MemberSettlement]
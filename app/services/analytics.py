@@ -0,0 +1,110 @@
+"""
+학습 기록 기간 집계 (/ai/analytics, /ai/weekly-summary?start=&end=).
+
+- daily_stats 롤업(user, 과목, 날짜)에서 SUM / GROUP BY → 기간이 길어도 O(일수 × 과목)
+- 과목명은 subjects JOIN으로 같이 가져온다 (ORM 객체 로딩 없음)
+- group_by: subject(기간 전체) / day(날짜·과목별) / week(월요일 시작 주·과목별)
+- 완료된 기록만 집계 (PENDING 제외) - 주간 요약 테이블과 같은 기준
+"""
+from datetime import date
+from typing import List
+
+from sqlalchemy import Date, cast, func, literal_column, select
+from sqlalchemy.orm import Session
+
+from app.models.daily_stat import DailyStat
+from app.models.subject import Subject
+
+GROUP_BY = ("subject", "day", "week")
+
+
+def efficiency(t_min: int, a_min: int, t_pg: int, a_pg: int) -> float:
+    """실제 속도(쪽/분) / 목표 속도. 기록이 비어 있으면 1.0"""
+    if not (a_min and t_min):
+        return 1.0
+    target_speed = t_pg / t_min
+    return (a_pg / a_min) / target_speed if target_speed else 0.0
+
+
+def feedback(ratio: float) -> str:
+    return "잘하고 있어요!" if 0.8 <= ratio <= 1.2 else "조정이 필요해요."
+
+
+def _week_start(dialect: str):
+    # stat_date가 속한 주의 월요일 (GROUP BY와 SELECT가 같은 식이 되도록 인자는 바인드 없이 리터럴로)
+    if dialect == "postgresql":
+        return cast(func.date_trunc(literal_column("'week'"), DailyStat.stat_date), Date)
+    # SQLite: 6일 전에서 다음 월요일로 = 당일 포함 직전 월요일
+    return func.date(DailyStat.stat_date, literal_column("'-6 days'"), literal_column("'weekday 1'"))
+
+
+def aggregate(db: Session, user_id: int, start: date, end: date, group_by: str = "subject") -> List[dict]:
+    """
+    [start, end] 기간 기록을 group_by 기준으로 합산.
+    반환: [{"period": date|None, "subject_id", "subject_name", "record_count",
+            "target_minutes", "actual_minutes", "target_pages", "actual_pages", "efficiency_ratio"}]
+    """
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by must be one of {GROUP_BY}")
+
+    if group_by == "day":
+        period = DailyStat.stat_date
+    elif group_by == "week":
+        period = _week_start(db.get_bind().dialect.name)
+    else:
+        period = None
+
+    columns = [
+        DailyStat.subject_id,
+        Subject.name,
+        func.sum(DailyStat.o_count + DailyStat.triangle_count + DailyStat.x_count),
+        func.sum(DailyStat.target_minutes),
+        func.sum(DailyStat.actual_minutes),
+        func.sum(DailyStat.target_pages),
+        func.sum(DailyStat.actual_pages),
+    ]
+    keys = [DailyStat.subject_id, Subject.name]
+    if period is not None:
+        period = period.label("period")
+        columns.insert(0, period)
+        keys.insert(0, period)
+
+    stmt = (
+        select(*columns)
+        .join(Subject, Subject.id == DailyStat.subject_id)
+        .where(
+            DailyStat.user_id == user_id,
+            DailyStat.stat_date >= start,
+            DailyStat.stat_date <= end,
+        )
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+
+    results = []
+    for row in db.execute(stmt):
+        if period is not None:
+            row_period, *rest = row
+            if isinstance(row_period, str):  # SQLite date() 결과는 문자열
+                row_period = date.fromisoformat(row_period)
+        else:
+            row_period, rest = None, row
+        subject_id, name, count, t_min, a_min, t_pg, a_pg = rest
+        results.append({
+            "period": row_period,
+            "subject_id": subject_id,
+            "subject_name": name,
+            "record_count": count,
+            "target_minutes": t_min,
+            "actual_minutes": a_min,
+            "target_pages": t_pg,
+            "actual_pages": a_pg,
+            "efficiency_ratio": round(efficiency(t_min, a_min, t_pg, a_pg), 2),
+        })
+    return results
+
+
+def subject_names(db: Session, subject_ids: List[int]) -> dict:
+    if not subject_ids:
+        return {}
+    return dict(db.execute(select(Subject.id, Subject.name).where(Subject.id.in_(subject_ids))).all())
@@ -0,0 +1,143 @@
+"""
+PENDING 목표 기록 완료 처리 (/study-goal/complete-records).
+
+- 과목별 최신 PENDING 기록: GROUP BY max(id) 서브쿼리 1번
+- 과목명: IN 조회 1번
+- 기록 갱신: 아직 PENDING인 행만 UPDATE 1번 (CASE로 행별 값, RETURNING으로 실제로 바뀐 id)
+  → 같은 목표를 동시에 제출해도 한쪽만 완료되고, 롤업 / pace에는 실제로 바꾼 행만 반영 (중복 집계 없음)
+- pace_factor(EMA): 과목별 비율을 모아서 마지막에 PaceStore로 한 번에 반영
+- 스터디 랭킹: (study_id, user_id)별 증분 UPDATE
+- 주간 요약: (user_id, week_start) 행에 과목별 합계 증분 반영
+- 일별 롤업: (user_id, subject_id, 날짜) 행 증분 UPDATE
+"""
+from typing import Dict, List
+
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.record import StudyRecord
+from app.models.subject import Subject
+from app.services import daily_stats, ranking, weekly_summary
+from app.services.pace_store import pace_store
+
+
+def submitted():
+    """
+    유저가 직접 제출한 기록 조건: O / 🔺, 또는 실제 공부량이 있는 X(목표 미달).
+    PENDING과, 일 마감 정산이 X로 바꾼 남은 목표(실제 0)는 제외 → 결석 판정 / 활성 유저 판정에 사용
+    """
+    return or_(
+        StudyRecord.status.in_(("O", "🔺")),
+        StudyRecord.actual_minutes > 0,
+        StudyRecord.actual_pages > 0,
+    )
+
+
+def efficiency_ratio(target_pages: int, target_minutes: int, actual_pages: int, actual_minutes: int) -> float:
+    target_speed = target_pages / target_minutes if target_minutes > 0 else 0
+    actual_speed = actual_minutes and actual_pages / actual_minutes or 0
+    return actual_speed / target_speed if target_speed > 0 else 1.0
+
+
+def latest_pending(db: Session, user_id: int, subject_ids: List[int]) -> Dict[int, StudyRecord]:
+    newest = (
+        select(func.max(StudyRecord.id).label("id"))
+        .where(
+            StudyRecord.user_id == user_id,
+            StudyRecord.status == "PENDING",
+            StudyRecord.subject_id.in_(subject_ids),
+        )
+        .group_by(StudyRecord.subject_id)
+        .subquery()
+    )
+    rows = db.execute(select(StudyRecord).join(newest, StudyRecord.id == newest.c.id)).scalars().all()
+    return {r.subject_id: r for r in rows}
+
+
+def _claim(db: Session, entries: List[dict]) -> set:
+    """entries의 기록 중 아직 PENDING인 것만 완료로 UPDATE. 반환: 실제로 바뀐 기록 id"""
+    ids = [e["record_id"] for e in entries]
+    by_id = {e["record_id"]: e for e in entries}
+
+    def per_row(field):
+        return case({rid: by_id[rid][field] for rid in ids}, value=StudyRecord.id)
+
+    return set(
+        db.execute(
+            update(StudyRecord)
+            .where(StudyRecord.id.in_(ids), StudyRecord.status == "PENDING")
+            .values(
+                status=per_row("status"),
+                actual_minutes=per_row("actual_minutes"),
+                actual_pages=per_row("actual_pages"),
+            )
+            .returning(StudyRecord.id)
+            .execution_options(synchronize_session=False)
+        ).scalars()
+    )
+
+
+def complete_pending(db: Session, user_id: int, items: list) -> List[dict]:
+    """
+    items: subject_id / actual_minutes / actual_pages 속성을 가진 입력 목록.
+    같은 과목이 여러 번 오면 마지막 값을 사용. commit은 호출한 쪽에서.
+    반환: [{"subject": 과목명, "status": "O"|"X", "record_id": ..., ...}] (요청 순서)
+    """
+    by_subject = {item.subject_id: item for item in items}
+    if not by_subject:
+        return []
+
+    records = latest_pending(db, user_id, list(by_subject))
+    if not records:
+        return []
+
+    subject_rows = db.execute(
+        select(Subject.id, Subject.name, Subject.study_id).where(Subject.id.in_(list(records)))
+    ).all()
+    names = {sid: name for sid, name, _ in subject_rows}
+    study_ids = {sid: study_id for sid, _, study_id in subject_rows}
+
+    completed: Dict[int, dict] = {}
+    for subject_id, item in by_subject.items():
+        record = records.get(subject_id)
+        if record is None:
+            continue
+
+        status = "O" if item.actual_pages >= record.target_pages else "X"
+        completed[subject_id] = {
+            "subject": names.get(subject_id),
+            "status": status,
+            "record_id": record.id,
+            "subject_id": subject_id,
+            "study_id": study_ids.get(subject_id),
+            "record_date": record.record_date,
+            "target_minutes": record.target_minutes,
+            "target_pages": record.target_pages,
+            "actual_minutes": item.actual_minutes,
+            "actual_pages": item.actual_pages,
+            "fine": record.fine,
+        }
+    if not completed:
+        return []
+
+    claimed = _claim(db, list(completed.values()))
+    completed = {sid: e for sid, e in completed.items() if e["record_id"] in claimed}
+
+    ratios: Dict[str, float] = {
+        e["subject"]: efficiency_ratio(e["target_pages"], e["target_minutes"], e["actual_pages"], e["actual_minutes"])
+        for e in completed.values()
+        if e["subject"] is not None
+    }
+    if ratios:
+        # write-behind: 과목별 EMA를 모아서 한 번에 upsert (캐시는 commit 후 반영)
+        pace_store.update_ema_many(user_id, ratios, db=db)
+    ranking.apply_completions(db, user_id, list(completed.values()))
+    weekly_summary.apply_completions(db, user_id, list(completed.values()))
+    daily_stats.apply_completions(db, user_id, list(completed.values()))
+
+    results = []
+    for item in items:
+        entry = completed.pop(item.subject_id, None)
+        if entry is not None:
+            results.append(entry)
+    return results
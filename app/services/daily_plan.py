@@ -0,0 +1,135 @@
+"""
+하루 학습 목표(PENDING 기록) 계획.
+
+/study-goal/calculate 에서 쓰는 배분 로직을 한 곳에 모아둔 모듈.
+- 과목 조회 1번(IN), pace 조회 1번(PaceStore.get_many)
+- 배분 계산은 메모리에서 한 번에
+- 같은 (user, 날짜, 과목)의 기존 PENDING은 지우고 bulk INSERT → 여러 번 호출해도 중복 안 쌓임
+- 야간 배치(app.services.preplan)가 미리 만든 목표는 read_pending으로 읽기만 함
+"""
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.record import StudyRecord
+from app.models.subject import Subject
+from app.services.pace_store import pace_store
+
+PAGES_PER_HOUR_BY_DIFFICULTY = {1: 13, 2: 11, 3: 9, 4: 8, 5: 7}
+DEFAULT_PAGES_PER_HOUR = 9
+
+
+def allocate(
+    total_minutes: int,
+    subjects: List[Tuple[Subject, int]],
+    paces: Dict[str, float],
+) -> List[dict]:
+    """
+    (과목, 난이도) 목록을 중요도 × 전체 페이지 비율로 시간 배분하고,
+    난이도별 속도 × pace_factor로 목표 페이지를 계산한다. (전체 페이지 수 초과 금지)
+    """
+    weights = [s.importance * s.total_pages for s, _ in subjects]
+    total_weight = sum(weights)
+    if total_weight == 0:
+        return []
+
+    goals = []
+    for (db_subject, diff), weight in zip(subjects, weights):
+        allocated_minutes = round(total_minutes * (weight / total_weight))
+        pace = paces.get(db_subject.name, 1.0)
+
+        pages_per_min = (PAGES_PER_HOUR_BY_DIFFICULTY.get(diff, DEFAULT_PAGES_PER_HOUR) * pace) / 60
+        recommended_pages = min(round(allocated_minutes * pages_per_min), db_subject.total_pages)
+
+        goals.append({
+            "subject_id": db_subject.id,
+            "subject_name": db_subject.name,
+            "target_minutes": allocated_minutes,
+            "target_pages": recommended_pages,
+        })
+    return goals
+
+
+def load_subjects(db: Session, subject_ids: Iterable[int]) -> Dict[int, Subject]:
+    ids = list(dict.fromkeys(subject_ids))
+    if not ids:
+        return {}
+    rows = db.execute(select(Subject).where(Subject.id.in_(ids))).scalars().all()
+    return {s.id: s for s in rows}
+
+
+def plan_day(
+    db: Session,
+    user_id: int,
+    total_minutes: int,
+    difficulties: List[Tuple[int, int]],
+    plan_date: date,
+) -> List[dict]:
+    """
+    difficulties: [(subject_id, difficulty), ...] (요청 순서 유지)
+    존재하지 않는 과목은 건너뛴다. commit은 호출한 쪽에서.
+    """
+    by_id = load_subjects(db, (sid for sid, _ in difficulties))
+    subjects = [(by_id[sid], diff) for sid, diff in difficulties if sid in by_id]
+    if not subjects:
+        return []
+
+    paces = pace_store.get_many(user_id, (s.name for s, _ in subjects), db=db)
+    goals = allocate(total_minutes, subjects, paces)
+    if goals:
+        write_pending(db, user_id, plan_date, goals)
+    return goals
+
+
+def read_pending(db: Session, user_id: int, plan_date: date) -> List[dict]:
+    """plan_date의 PENDING 목표 (plan_day 반환과 같은 모양 + 목표를 만든 곳 source, 기록 id순)"""
+    rows = db.execute(
+        select(
+            StudyRecord.subject_id, Subject.name, StudyRecord.target_minutes, StudyRecord.target_pages, StudyRecord.source
+        )
+        .join(Subject, Subject.id == StudyRecord.subject_id)
+        .where(
+            StudyRecord.user_id == user_id,
+            StudyRecord.record_date == plan_date,
+            StudyRecord.status == "PENDING",
+        )
+        .order_by(StudyRecord.id)
+    ).all()
+    return [
+        {"subject_id": sid, "subject_name": name, "target_minutes": minutes, "target_pages": pages, "source": source}
+        for sid, name, minutes, pages, source in rows
+    ]
+
+
+def write_pending(db: Session, user_id: int, plan_date: date, goals: List[dict]) -> None:
+    subject_ids = [g["subject_id"] for g in goals]
+
+    # 같은 날 다시 계산하면 이전 PENDING 목표를 교체
+    db.execute(
+        delete(StudyRecord)
+        .where(
+            StudyRecord.user_id == user_id,
+            StudyRecord.record_date == plan_date,
+            StudyRecord.status == "PENDING",
+            StudyRecord.subject_id.in_(subject_ids),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        insert(StudyRecord),
+        [
+            {
+                "user_id": user_id,
+                "subject_id": g["subject_id"],
+                "record_date": plan_date,
+                "target_minutes": g["target_minutes"],
+                "target_pages": g["target_pages"],
+                "actual_minutes": 0,
+                "actual_pages": 0,
+                "status": "PENDING",
+            }
+            for g in goals
+        ],
+    )
@@ -0,0 +1,165 @@
+"""
+(user, 과목, 날짜)별 롤업 (daily_stats 테이블).
+
+- 기록 완료 시: 해당 (user, 과목, 날짜) 행에 INSERT ... ON CONFLICT DO UPDATE(col = col + delta)로 증분 반영
+- 기간 분석(/ai/analytics 등)과 월 정산은 이 테이블만 읽음 → 1년 조회도 O(일수)
+- rebuild(): study_records 이력에서 다시 계산 (마이그레이션 / 점검용), check(): 재계산과 비교
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.database import upsert_insert
+from app.models.daily_stat import DailyStat
+from app.models.record import StudyRecord
+
+_stats = DailyStat.__table__
+
+SUM_FIELDS = (
+    "target_minutes", "actual_minutes", "target_pages", "actual_pages",
+    "o_count", "triangle_count", "x_count", "fine",
+)
+
+Key = Tuple[int, int, date]  # (user_id, subject_id, stat_date)
+
+
+def _status_counts(status: str) -> Tuple[int, int, int]:
+    return (1 if status == "O" else 0, 1 if status == "🔺" else 0, 1 if status == "X" else 0)
+
+
+def _new_delta() -> Dict[str, int]:
+    return dict.fromkeys(SUM_FIELDS, 0)
+
+
+def apply_completions(db: Session, user_id: int, entries: List[dict]) -> None:
+    """
+    complete_pending 결과(entries: subject_id / record_date / status / target_·actual_ / fine)를 롤업에 증분 반영.
+    commit은 호출한 쪽에서.
+    """
+    deltas: Dict[Tuple[int, date], Dict[str, int]] = defaultdict(_new_delta)
+    for e in entries:
+        delta = deltas[(e["subject_id"], e["record_date"])]
+        o, tri, x = _status_counts(e["status"])
+        delta["target_minutes"] += e["target_minutes"] or 0
+        delta["actual_minutes"] += e["actual_minutes"] or 0
+        delta["target_pages"] += e["target_pages"] or 0
+        delta["actual_pages"] += e["actual_pages"] or 0
+        delta["o_count"] += o
+        delta["triangle_count"] += tri
+        delta["x_count"] += x
+        delta["fine"] += e.get("fine") or 0
+    _apply(db, user_id, deltas)
+
+
+def _apply(db: Session, user_id: int, deltas: Dict[Tuple[int, date], Dict[str, int]]) -> None:
+    if not deltas:
+        return
+
+    now = datetime.utcnow()
+    stmt = upsert_insert(db, _stats)
+    # 읽고-쓰기 대신 col = col + delta 로 동시 요청에도 값이 안 사라지게,
+    # 처음 넣는 (user, 과목, 날짜)가 동시에 와도 unique 위반 없이 한쪽이 UPDATE로 합쳐지게
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[_stats.c.user_id, _stats.c.subject_id, _stats.c.stat_date],
+        set_={"updated_at": stmt.excluded.updated_at, **{f: _stats.c[f] + stmt.excluded[f] for f in SUM_FIELDS}},
+    )
+    db.execute(
+        stmt,
+        [
+            {"user_id": user_id, "subject_id": subject_id, "stat_date": stat_date, "updated_at": now, **delta}
+            for (subject_id, stat_date), delta in deltas.items()
+        ],
+    )
+
+
+# =====================
+# 조회
+# =====================
+def monthly_settlement(db: Session, user_id: int, start: date, end: date) -> dict:
+    """[start, end] 기간 벌금 합계 + O/🔺/X 개수"""
+    fine, o, tri, x = db.execute(
+        select(
+            func.coalesce(func.sum(DailyStat.fine), 0),
+            func.coalesce(func.sum(DailyStat.o_count), 0),
+            func.coalesce(func.sum(DailyStat.triangle_count), 0),
+            func.coalesce(func.sum(DailyStat.x_count), 0),
+        ).where(
+            DailyStat.user_id == user_id,
+            DailyStat.stat_date >= start,
+            DailyStat.stat_date <= end,
+        )
+    ).one()
+    return {"total_fine": fine, "O_count": o, "triangle_count": tri, "X_count": x}
+
+
+# =====================
+# 재계산
+# =====================
+def _source(user_id: Optional[int] = None):
+    stmt = (
+        select(
+            StudyRecord.user_id,
+            StudyRecord.subject_id,
+            StudyRecord.record_date,
+            func.sum(func.coalesce(StudyRecord.target_minutes, 0)),
+            func.sum(func.coalesce(StudyRecord.actual_minutes, 0)),
+            func.sum(func.coalesce(StudyRecord.target_pages, 0)),
+            func.sum(func.coalesce(StudyRecord.actual_pages, 0)),
+            func.sum(case((StudyRecord.status == "O", 1), else_=0)),
+            func.sum(case((StudyRecord.status == "🔺", 1), else_=0)),
+            func.sum(case((StudyRecord.status == "X", 1), else_=0)),
+            func.sum(func.coalesce(StudyRecord.fine, 0)),
+        )
+        .where(
+            StudyRecord.status != "PENDING",
+            StudyRecord.user_id.is_not(None),
+            StudyRecord.subject_id.is_not(None),
+        )
+        .group_by(StudyRecord.user_id, StudyRecord.subject_id, StudyRecord.record_date)
+    )
+    if user_id is not None:
+        stmt = stmt.where(StudyRecord.user_id == user_id)
+    return stmt
+
+
+def rebuild(db, user_id: Optional[int] = None) -> None:
+    """study_records 이력에서 롤업을 다시 만든다. db는 Session 또는 Connection."""
+    clear = delete(DailyStat)
+    if user_id is not None:
+        clear = clear.where(DailyStat.user_id == user_id)
+    db.execute(clear)
+
+    source = _source(user_id).add_columns(literal(datetime.utcnow()))
+    db.execute(
+        insert(DailyStat).from_select(
+            ["user_id", "subject_id", "stat_date", *SUM_FIELDS, "updated_at"],
+            source,
+        )
+    )
+
+
+def check(db: Session, user_id: Optional[int] = None) -> List[dict]:
+    """롤업과 study_records 재집계가 다른 (user, 과목, 날짜) 목록"""
+    expected = {
+        (uid, sid, d): dict(zip(SUM_FIELDS, values))
+        for uid, sid, d, *values in db.execute(_source(user_id))
+    }
+    stmt = select(DailyStat.user_id, DailyStat.subject_id, DailyStat.stat_date, *(_stats.c[f] for f in SUM_FIELDS))
+    if user_id is not None:
+        stmt = stmt.where(DailyStat.user_id == user_id)
+    stored = {(uid, sid, d): dict(zip(SUM_FIELDS, values)) for uid, sid, d, *values in db.execute(stmt)}
+
+    mismatches = []
+    for key in sorted(set(expected) | set(stored)):
+        if expected.get(key) != stored.get(key):
+            mismatches.append({
+                "user_id": key[0],
+                "subject_id": key[1],
+                "stat_date": key[2].isoformat(),
+                "expected": expected.get(key),
+                "stored": stored.get(key),
+            })
+    return mismatches
@@ -0,0 +1,284 @@
+"""
+시험 일정 기반 다일(多日) 학습 계획.
+
+과목마다 남은 페이지 / 속도(난이도별 시간당 페이지 × pace) / 시험 날짜가 있고, 날마다 쓸 수 있는 시간이 다를 때
+오늘부터 각 시험 전날까지 날짜별 과목 배분을 만든다.
+
+1) 역방향 패스 (우선순위 큐): 마지막 날부터 거꾸로, 그날 공부할 수 있는 과목 중 시험이 가장 늦은 과목부터
+   시간을 채운다 → 과목별로 "최대한 미뤘을 때"의 배치(ALAP).
+   시간이 모자라면 먼저 모든 과목의 양을 같은 비율로 줄여서(EDF 조건으로 최대 비율 계산) 배치한다.
+2) 정방향 패스: 날마다
+   - 필수량: 지금까지 한 양이 ALAP 누적량보다 뒤처지지 않을 만큼 (이것만 지키면 남은 계획은 항상 가능)
+   - 꾸준한 양: 남은 양 / 시험 전까지 남은 공부일 을 시험이 빠른 과목(동률이면 중요도 높은 과목)부터 채움
+   - 남는 시간은 비워둠 (free_minutes)
+
+계산량은 O(일수 × 과목 수 + 일수 × log 과목 수) → 90일 × 15과목도 수 ms.
+실제 기록이 들어오면 남은 페이지/pace만 바꿔 다음 날부터 다시 계산(replan)한다.
+"""
+import heapq
+import math
+from datetime import date, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.daily_stat import DailyStat
+from app.models.subject import Subject
+from app.services.daily_plan import DEFAULT_PAGES_PER_HOUR, PAGES_PER_HOUR_BY_DIFFICULTY
+from app.services.pace_store import pace_store
+
+MAX_DAYS = 366
+
+
+class ExamSubject(NamedTuple):
+    subject_id: int
+    name: str
+    remaining_pages: int
+    difficulty: Optional[int]
+    pace: float
+    exam_date: date
+    importance: int = 3
+
+
+def pages_per_minute(subject: ExamSubject) -> float:
+    pph = PAGES_PER_HOUR_BY_DIFFICULTY.get(subject.difficulty, DEFAULT_PAGES_PER_HOUR)
+    return pph * max(subject.pace, 0.01) / 60
+
+
+def _last_study_day(subject: ExamSubject, start: date, n_days: int, study_on_exam_day: bool) -> int:
+    """공부할 수 있는 마지막 날의 인덱스 (start=0). 없으면 -1"""
+    last = (subject.exam_date - start).days - (0 if study_on_exam_day else 1)
+    return min(last, n_days - 1)
+
+
+def _feasible_ratio(work: List[int], deadlines: List[int], capacity: List[int]) -> float:
+    """
+    모든 과목의 양에 곱해도 시험 전에 다 들어가는 최대 비율(≤ 1).
+    마감일 t까지 끝내야 하는 양의 합 ≤ t까지의 시간 합 (EDF 조건)을 모든 t에서 만족하는 값.
+    """
+    need: Dict[int, int] = {}
+    for w, dl in zip(work, deadlines):
+        if w > 0 and dl >= 0:
+            need[dl] = need.get(dl, 0) + w
+    ratio, cum_need, cum_cap, d = 1.0, 0, 0, 0
+    for t in sorted(need):
+        cum_need += need[t]
+        while d <= t:
+            cum_cap += capacity[d]
+            d += 1
+        ratio = min(ratio, cum_cap / cum_need)
+    return ratio
+
+
+def _alap(work: List[int], deadlines: List[int], capacity: List[int]):
+    """
+    역방향 패스. 반환: (later, placed)
+      later[d][i]: 과목 i를 최대한 미뤘을 때 d일 "이후"(d+1..)에 배치되는 분
+      placed[i]: 배치된 총 분 (work[i] - placed[i] = 시간이 모자라 못 넣은 분)
+    """
+    n_days, n = len(capacity), len(work)
+    order = sorted(range(n), key=lambda i: -deadlines[i])
+    remaining = list(work)
+    placed = [0] * n
+    later = [None] * n_days
+    heap: List[tuple] = []  # (-마감일, i): 시험이 늦은 과목부터
+    pos = 0
+    for d in range(n_days - 1, -1, -1):
+        later[d] = list(placed)
+        while pos < n and deadlines[order[pos]] >= d:
+            i = order[pos]
+            if remaining[i] > 0:
+                heapq.heappush(heap, (-deadlines[i], i))
+            pos += 1
+        cap = capacity[d]
+        while cap > 0 and heap:
+            _, i = heap[0]
+            take = min(remaining[i], cap)
+            remaining[i] -= take
+            placed[i] += take
+            cap -= take
+            if remaining[i] == 0:
+                heapq.heappop(heap)
+    return later, placed
+
+
+def plan_schedule(
+    start: date,
+    capacity: List[int],
+    subjects: List[ExamSubject],
+    study_on_exam_day: bool = False,
+) -> dict:
+    """
+    capacity: start부터 날짜별 공부 가능 시간(분). 계획 기간 = len(capacity)
+    반환: {"days": [{date, capacity, free_minutes, goals: [{subject_id, subject_name, minutes, pages}]}],
+           "subjects": [{subject_id, subject_name, exam_date, remaining_pages, planned_pages, shortfall_pages, pace_factor}],
+           "feasible": 부족분이 없으면 True}
+    """
+    n_days, n = len(capacity), len(subjects)
+    capacity = [max(0, int(c)) for c in capacity]
+    ppm = [pages_per_minute(s) for s in subjects]
+    deadlines = [_last_study_day(s, start, n_days, study_on_exam_day) for s in subjects]
+    work = [
+        math.ceil(s.remaining_pages / ppm[i] - 1e-9) if s.remaining_pages > 0 and deadlines[i] >= 0 else 0
+        for i, s in enumerate(subjects)
+    ]
+
+    # 시간이 모자라면 모든 과목의 필수량을 같은 비율로 줄임 (특정 과목만 통째로 빠지지 않게)
+    ratio = _feasible_ratio(work, deadlines, capacity)
+    later, placed = _alap([int(w * ratio) if ratio < 1 else w for w in work], deadlines, capacity)
+
+    # 과목별로 d일부터 마감일까지 시간이 있는 날 수 (꾸준한 양 계산용)
+    open_days_from = [0] * (n_days + 1)
+    for d in range(n_days - 1, -1, -1):
+        open_days_from[d] = open_days_from[d + 1] + (1 if capacity[d] > 0 else 0)
+
+    priority = sorted(range(n), key=lambda i: (deadlines[i], -subjects[i].importance, i))
+    remaining = list(work)
+    done = [0] * n
+    done_pages = [0] * n
+    days = []
+    for d in range(n_days):
+        cap = capacity[d]
+        alloc = [0] * n
+        active = [i for i in priority if deadlines[i] >= d and remaining[i] > 0]
+
+        # 1) 필수량: ALAP 누적량보다 뒤처지지 않게
+        for i in active:
+            must = min(placed[i] - later[d][i] - done[i], remaining[i])
+            if must > 0:
+                alloc[i] = must
+                cap -= must
+
+        # 2) 꾸준한 양: 남은 양을 남은 공부일로 나눈 만큼, 시험이 빠른 과목부터
+        for i in active:
+            if cap <= 0:
+                break
+            days_left = open_days_from[d] - open_days_from[deadlines[i] + 1]
+            if days_left <= 0:
+                continue
+            extra = min(math.ceil(remaining[i] / days_left) - alloc[i], remaining[i] - alloc[i], cap)
+            if extra > 0:
+                alloc[i] += extra
+                cap -= extra
+
+        goals = []
+        for i in active:
+            if alloc[i] <= 0:
+                continue
+            remaining[i] -= alloc[i]
+            done[i] += alloc[i]
+            # 누적 분 → 누적 페이지로 바꿔서 날짜별 페이지 합이 전체와 정확히 맞게
+            cum_pages = min(subjects[i].remaining_pages, round(done[i] * ppm[i]))
+            goals.append({
+                "subject_id": subjects[i].subject_id,
+                "subject_name": subjects[i].name,
+                "minutes": alloc[i],
+                "pages": cum_pages - done_pages[i],
+            })
+            done_pages[i] = cum_pages
+        days.append({
+            "date": start + timedelta(days=d),
+            "capacity": capacity[d],
+            "free_minutes": cap,
+            "goals": goals,
+        })
+
+    summary = [
+        {
+            "subject_id": s.subject_id,
+            "subject_name": s.name,
+            "exam_date": s.exam_date,
+            "remaining_pages": s.remaining_pages,
+            "planned_pages": done_pages[i],
+            "shortfall_pages": s.remaining_pages - done_pages[i],
+            "pace_factor": round(s.pace, 2),
+        }
+        for i, s in enumerate(subjects)
+    ]
+    return {
+        "days": days,
+        "subjects": summary,
+        "feasible": all(row["shortfall_pages"] == 0 for row in summary),
+    }
+
+
+def replan(
+    start: date,
+    capacity: List[int],
+    subjects: List[ExamSubject],
+    actual_pages: Dict[int, int],
+    paces: Optional[Dict[int, float]] = None,
+    study_on_exam_day: bool = False,
+) -> dict:
+    """
+    start 날의 실제 기록(과목별 actual_pages)과 갱신된 pace를 반영해 다음 날부터 다시 계산.
+    capacity/subjects는 start 기준 기존 입력 그대로.
+    """
+    paces = paces or {}
+    updated = [
+        s._replace(
+            remaining_pages=max(0, s.remaining_pages - actual_pages.get(s.subject_id, 0)),
+            pace=paces.get(s.subject_id, s.pace),
+        )
+        for s in subjects
+    ]
+    return plan_schedule(start + timedelta(days=1), capacity[1:], updated, study_on_exam_day)
+
+
+# =====================
+# DB에서 입력 만들기
+# =====================
+def capacity_for(
+    start: date,
+    n_days: int,
+    daily_minutes: int,
+    weekday_minutes: Optional[List[int]] = None,
+    overrides: Optional[Dict[date, int]] = None,
+) -> List[int]:
+    overrides = overrides or {}
+    capacity = []
+    for d in range(n_days):
+        day = start + timedelta(days=d)
+        default = weekday_minutes[day.weekday()] if weekday_minutes else daily_minutes
+        capacity.append(overrides.get(day, default))
+    return capacity
+
+
+def load_subjects(db: Session, user_id: int, exams: List[tuple]) -> List[ExamSubject]:
+    """
+    exams: [(subject_id, exam_date, difficulty 또는 None)] (요청 순서 유지, 내 과목이 아니면 제외)
+    진행도는 daily_stats의 실제 페이지 합, 속도는 PaceStore의 개인 pace.
+    """
+    ids = [sid for sid, _, _ in exams]
+    subjects = {
+        s.id: s
+        for s in db.execute(select(Subject).where(Subject.id.in_(ids), Subject.user_id == user_id)).scalars()
+    }
+    if not subjects:
+        return []
+
+    done = dict(
+        db.execute(
+            select(DailyStat.subject_id, func.sum(DailyStat.actual_pages))
+            .where(DailyStat.user_id == user_id, DailyStat.subject_id.in_(list(subjects)))
+            .group_by(DailyStat.subject_id)
+        ).all()
+    )
+    paces = pace_store.get_many(user_id, (s.name for s in subjects.values()), db=db)
+
+    result = []
+    for sid, exam_date, difficulty in exams:
+        s = subjects.get(sid)
+        if s is None:
+            continue
+        result.append(ExamSubject(
+            subject_id=s.id,
+            name=s.name,
+            remaining_pages=max(0, (s.total_pages or 0) - int(done.get(sid) or 0)),
+            difficulty=difficulty if difficulty is not None else s.difficulty,
+            pace=paces[s.name],
+            exam_date=exam_date,
+            importance=s.importance or 3,
+        ))
+    return result
@@ -0,0 +1,54 @@
+"""
+여러 유저의 하루 목표를 한 번에 계산 (NumPy).
+
+ai/study_goal.calculate_daily_goal, daily_plan.allocate와 같은 식을 과목 단위 배열로 계산한다.
+- 유저 i의 과목들은 owner == i 인 원소들 (순서 무관, 유저별 합계는 bincount)
+- 시간 배분: total_minutes × (중요도 × 전체 페이지) / 유저별 가중치 합
+- 목표 페이지: 배분 시간 × 난이도별 시간당 페이지 × pace / 60, 전체 페이지 수로 캡
+- 반올림은 파이썬 round()와 같은 half-to-even (np.rint) → 과목별 결과가 기존 루프와 동일
+"""
+from typing import Tuple
+
+import numpy as np
+
+from app.services.daily_plan import DEFAULT_PAGES_PER_HOUR, PAGES_PER_HOUR_BY_DIFFICULTY
+
+# 인덱스 = 난이도, 범위 밖은 기본 속도
+_PPH = np.full(max(PAGES_PER_HOUR_BY_DIFFICULTY) + 1, float(DEFAULT_PAGES_PER_HOUR))
+for _diff, _pph in PAGES_PER_HOUR_BY_DIFFICULTY.items():
+    _PPH[_diff] = _pph
+
+
+def pages_per_hour(difficulty: np.ndarray) -> np.ndarray:
+    valid = (difficulty >= 0) & (difficulty < len(_PPH))
+    return np.where(valid, _PPH[np.where(valid, difficulty, 0)], float(DEFAULT_PAGES_PER_HOUR))
+
+
+def allocate_batch(
+    owner: np.ndarray,
+    total_minutes: np.ndarray,
+    importance: np.ndarray,
+    total_pages: np.ndarray,
+    difficulty: np.ndarray,
+    pace: np.ndarray,
+    round_minutes_first: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    owner: 과목별 유저 번호(0..n_users-1), total_minutes: 유저별 하루 공부 시간
+    importance / total_pages / difficulty / pace: 과목별 값
+    round_minutes_first: True면 배분 시간을 먼저 반올림한 뒤 페이지 계산 (daily_plan.allocate 방식)
+
+    반환: (과목별 배분 시간(반올림 전), 과목별 목표 페이지, 유저별 가중치 합)
+    """
+    owner = np.asarray(owner, dtype=np.int64)
+    total_minutes = np.asarray(total_minutes, dtype=np.float64)
+    weights = np.asarray(importance, dtype=np.float64) * np.asarray(total_pages, dtype=np.float64)
+
+    total_weight = np.bincount(owner, weights=weights, minlength=len(total_minutes))
+    per_subject_total = total_weight[owner]
+    minutes = total_minutes[owner] * (weights / np.where(per_subject_total > 0, per_subject_total, 1))
+
+    pages_per_min = (pages_per_hour(np.asarray(difficulty, dtype=np.int64)) * np.asarray(pace, dtype=np.float64)) / 60
+    base = np.rint(minutes) if round_minutes_first else minutes
+    pages = np.minimum(np.rint(base * pages_per_min), total_pages).astype(np.int64)
+    return minutes, pages, total_weight
@@ -0,0 +1,186 @@
+"""
+pace_factor 재계산 (replay).
+
+study_records의 완료 기록을 (user, 과목명)별 시간순(record_date, id)으로 다시 흘려서
+complete-records와 같은 규칙으로 EMA를 처음부터 계산한다.
+완료 기록 = 유저가 제출한 기록(completion.submitted). 일 마감 정산이 PENDING을 X(실제 0)로 바꾼 행은
+유저가 공부한 속도가 아니므로 제외 (비율 0으로 흘리면 pace가 계속 내려감).
+
+- 기록별 효율 비율: completion.efficiency_ratio와 같은 식
+- EMA: pace_store.ema와 같은 식 (DEFAULT_PACE에서 시작, 매 단계 round2로 소수 둘째 자리 반올림)
+- 벡터화: 시리즈를 길이 내림차순으로 세워 k번째 기록을 모든 시리즈에 대해 한 번에 반영
+  → 파이썬 루프는 레코드 수가 아니라 '가장 긴 시리즈 길이'만큼만 돈다
+- 결과는 subject_pace에 bulk UPDATE / INSERT (user_id=None 공용 pace는 건드리지 않음)
+- pace 캐시는 호출한 쪽이 commit한 뒤 invalidate_cache()로 비움 (commit 전에 비우면 다른 요청이 옛 값을 다시 캐시함)
+  replay_committed()는 자체 세션으로 replay → commit → 캐시 비우기까지 (CLI / 관리자 API가 스레드에서 호출)
+
+실행: python -m app.cli pace replay [--alpha 0.2] [--user-id N] [--dry-run]
+"""
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.pace import SubjectPace
+from app.models.record import StudyRecord
+from app.models.subject import Subject
+from app.services.completion import submitted
+from app.services.pace_store import DEFAULT_PACE, EMA_ALPHA, pace_store
+
+
+def efficiency_ratios(t_min: np.ndarray, t_pg: np.ndarray, a_min: np.ndarray, a_pg: np.ndarray) -> np.ndarray:
+    """completion.efficiency_ratio의 벡터 버전"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        target_speed = np.where(t_min > 0, t_pg / np.where(t_min > 0, t_min, 1), 0.0)
+        actual_speed = np.where(a_min != 0, a_pg / np.where(a_min != 0, a_min, 1), 0.0)
+        return np.where(target_speed > 0, actual_speed / np.where(target_speed > 0, target_speed, 1), 1.0)
+
+
+def replay_series(series_ids: np.ndarray, ratios: np.ndarray, n_series: int, alpha: float) -> np.ndarray:
+    """
+    series_ids: 시리즈 번호(0..n_series-1). 같은 시리즈 기록은 붙어 있고 시간순이어야 함
+    반환: 시리즈별 최종 pace
+    """
+    paces = np.full(n_series, DEFAULT_PACE)
+    if len(ratios) == 0:
+        return paces
+
+    counts = np.bincount(series_ids, minlength=n_series)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    # 길이 내림차순으로 세우면 k번째 단계에 살아있는 시리즈가 항상 앞쪽 [0:active]에 모인다
+    order = np.argsort(-counts, kind="stable")
+    sorted_counts = counts[order]
+    sorted_starts = starts[order]
+    max_len = int(sorted_counts[0])
+    active_by_step = np.searchsorted(-sorted_counts, -np.arange(1, max_len + 1), side="right")
+
+    state = np.full(n_series, DEFAULT_PACE)
+    keep = 1 - alpha
+    for k in range(max_len):
+        active = active_by_step[k]
+        step = ratios[sorted_starts[:active] + k]  # 각 시리즈의 k번째 기록
+        # pace_store.ema / round2와 같은 연산 순서 → 실시간 갱신과 비트 단위로 같은 값
+        state[:active] = np.floor((state[:active] * keep + step * alpha) * 100 + 0.5) / 100
+
+    paces[order] = state
+    return paces
+
+
+def _load(db: Session, user_id: Optional[int]):
+    stmt = (
+        select(
+            StudyRecord.user_id,
+            Subject.name,
+            func.coalesce(StudyRecord.target_minutes, 0),
+            func.coalesce(StudyRecord.target_pages, 0),
+            func.coalesce(StudyRecord.actual_minutes, 0),
+            func.coalesce(StudyRecord.actual_pages, 0),
+        )
+        .join(Subject, Subject.id == StudyRecord.subject_id)
+        .where(submitted(), StudyRecord.user_id.is_not(None))
+        .order_by(StudyRecord.user_id, Subject.name, StudyRecord.record_date, StudyRecord.id)
+    )
+    if user_id is not None:
+        stmt = stmt.where(StudyRecord.user_id == user_id)
+    return db.execute(stmt).all()
+
+
+def replay(
+    db: Session, alpha: float = EMA_ALPHA, user_id: Optional[int] = None, dry_run: bool = False
+) -> dict:
+    """
+    이력 전체(또는 유저 한 명)의 pace를 다시 계산해 subject_pace에 반영.
+    commit과 그 뒤 invalidate_cache(user_id)는 호출한 쪽에서.
+    반환: 처리 통계 (records / series / changed / inserted / 단계별 시간)
+    """
+    t0 = time.perf_counter()
+    rows = _load(db, user_id)
+    t_load = time.perf_counter()
+
+    if rows:
+        uids, names, t_min, t_pg, a_min, a_pg = (np.asarray(col) for col in zip(*rows))
+        # (user_id, 과목명)이 바뀌는 지점이 새 시리즈의 시작 (쿼리가 그 순서로 정렬됨)
+        starts = np.ones(len(rows), dtype=bool)
+        starts[1:] = (uids[1:] != uids[:-1]) | (names[1:] != names[:-1])
+        series_ids = np.cumsum(starts) - 1
+        keys = list(zip(uids[starts].tolist(), names[starts].tolist()))
+        numbers = [np.asarray(col, dtype=np.float64) for col in (t_min, t_pg, a_min, a_pg)]
+    else:
+        series_ids, keys = np.empty(0, dtype=np.int64), []
+        numbers = [np.empty(0)] * 4
+
+    ratios = efficiency_ratios(*numbers)
+    paces = replay_series(series_ids, ratios, len(keys), alpha)
+    t_compute = time.perf_counter()
+
+    new_values = {key: float(p) for key, p in zip(keys, paces)}
+    changed, inserted = _write(db, new_values, dry_run)
+    t_write = time.perf_counter()
+
+    return {
+        "records": len(rows),
+        "series": len(keys),
+        "changed": changed,
+        "inserted": inserted,
+        "alpha": alpha,
+        "dry_run": dry_run,
+        "load_ms": round((t_load - t0) * 1000, 1),
+        "compute_ms": round((t_compute - t_load) * 1000, 1),
+        "write_ms": round((t_write - t_compute) * 1000, 1),
+    }
+
+
+def replay_committed(alpha: float = EMA_ALPHA, user_id: Optional[int] = None, dry_run: bool = False) -> dict:
+    """
+    새 sync 세션에서 replay → commit → invalidate_cache. 이벤트 루프에서는 asyncio.to_thread로 호출
+    (이력 전체를 읽고 numpy로 계산하는 동안 루프를 막지 않도록)
+    """
+    with SessionLocal() as db:
+        result = replay(db, alpha=alpha, user_id=user_id, dry_run=dry_run)
+        if not dry_run:
+            db.commit()
+            invalidate_cache(user_id)
+    return result
+
+
+def invalidate_cache(user_id: Optional[int] = None) -> None:
+    """replay 결과를 commit한 뒤 호출: pace 캐시에 옛 값이 남지 않게 (전체 또는 유저 한 명)"""
+    if user_id is None:
+        pace_store.clear()
+    else:
+        pace_store.invalidate(user_id)
+
+
+def _write(db: Session, values: Dict[Tuple[int, str], float], dry_run: bool) -> Tuple[int, int]:
+    if not values:
+        return 0, 0
+    user_ids = {uid for uid, _ in values}
+    existing = {
+        (uid, name): (row_id, pace)
+        for row_id, uid, name, pace in db.execute(
+            select(SubjectPace.id, SubjectPace.user_id, SubjectPace.subject_name, SubjectPace.pace_factor).where(
+                SubjectPace.user_id.in_(user_ids)
+            )
+        )
+    }
+
+    now = datetime.utcnow()
+    updates, inserts = [], []
+    for (uid, name), pace in values.items():
+        hit = existing.get((uid, name))
+        if hit is None:
+            inserts.append({"user_id": uid, "subject_name": name, "pace_factor": pace, "updated_at": now})
+        elif hit[1] is None or abs(hit[1] - pace) > 1e-9:
+            updates.append({"id": hit[0], "pace_factor": pace, "updated_at": now})
+
+    if not dry_run:
+        if updates:
+            db.execute(update(SubjectPace), updates)  # PK 기준 bulk UPDATE
+        if inserts:
+            db.execute(insert(SubjectPace), inserts)
+    return len(updates), len(inserts)
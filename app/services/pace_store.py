@@ -0,0 +1,251 @@
+"""
+과목별 pace_factor(개인 학습 속도 보정값) 저장소.
+
+- 저장: subject_pace 테이블(SubjectPace 모델), (user_id, subject_name) 단위
+- 조회: 메모리 캐시 → 없는 키만 IN 쿼리 한 번으로 가져옴 (read-through)
+- 쓰기: INSERT ... ON CONFLICT DO UPDATE 한 번 (동시 요청이 같은 과목을 처음 넣어도 중복 행 / unique 위반 없음)
+- user_id=None 은 로그인 없이 호출하는 ai/ API용 공용 pace (과목명 부분 unique 인덱스로 중복 방지)
+"""
+import math
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.database import SessionLocal, upsert_insert
+from app.models.pace import SubjectPace
+
+DEFAULT_PACE = 1.0
+EMA_ALPHA = 0.2  # 최근 기록 20% 반영
+
+Key = Tuple[Optional[int], str]
+
+# commit 이후에 캐시에 반영할 값들 (session.info에 쌓아둠)
+_PENDING_KEY = "pace_store_pending"
+
+
+def round2(x: float) -> float:
+    """소수 둘째 자리 반올림(0.5 올림). pace_replay의 numpy 버전과 비트 단위로 같은 결과가 나오도록 floor로 계산"""
+    return math.floor(x * 100 + 0.5) / 100
+
+
+def ema(old: float, ratio: float, alpha: float = EMA_ALPHA) -> float:
+    """new = old*(1-alpha) + ratio*alpha (소수 둘째 자리 반올림)"""
+    return round2(old * (1 - alpha) + ratio * alpha)
+
+
+def _user_clause(user_id: Optional[int]):
+    if user_id is None:
+        return SubjectPace.user_id.is_(None)
+    return SubjectPace.user_id == user_id
+
+
+class PaceStore:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        maxsize: int = 10_000,
+        ttl_seconds: float = 300.0,
+    ):
+        self._session_factory = session_factory
+        self._cache = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+
+    # =====================
+    # 캐시
+    # =====================
+    def _cache_get(self, key: Key) -> Optional[float]:
+        return self._cache.get(key)
+
+    def _cache_put_many(self, values: Dict[Key, float]) -> None:
+        self._cache.set_many(values)
+
+    def invalidate(self, user_id: Optional[int] = None, subject_names: Optional[Iterable[str]] = None) -> None:
+        if subject_names is None:
+            self._cache.discard_where(lambda key, _: key[0] == user_id)
+        else:
+            for name in subject_names:
+                self._cache.pop((user_id, name))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    # =====================
+    # 조회
+    # =====================
+    def get(self, user_id: Optional[int], subject_name: str, db: Optional[Session] = None) -> float:
+        return self.get_many(user_id, [subject_name], db=db)[subject_name]
+
+    def get_many(
+        self, user_id: Optional[int], subject_names: Iterable[str], db: Optional[Session] = None
+    ) -> Dict[str, float]:
+        """
+        여러 과목의 pace를 한 번에 조회. 캐시에 없는 과목만 IN 쿼리 1번.
+        저장된 값이 없는 과목은 DEFAULT_PACE(1.0).
+        """
+        result: Dict[str, float] = {}
+        missing = []
+        for name in dict.fromkeys(subject_names):
+            cached = self._cache_get((user_id, name))
+            if cached is None:
+                missing.append(name)
+            else:
+                result[name] = cached
+
+        if missing:
+            rows = self._with_session(db, lambda s: self._select_rows(s, user_id, missing))
+            loaded = {name: rows[name][1] if name in rows else DEFAULT_PACE for name in missing}
+            self._cache_put_many({(user_id, name): pace for name, pace in loaded.items()})
+            result.update(loaded)
+
+        return result
+
+    def get_many_users(
+        self, user_ids: Iterable[int], subject_names: Iterable[str], db: Optional[Session] = None
+    ) -> Dict[int, Dict[str, float]]:
+        """여러 유저 × 여러 과목을 한 번에 조회 (스터디 단위 리포트용). 캐시에 없는 조합만 IN 쿼리 1번."""
+        user_ids = list(dict.fromkeys(user_ids))
+        names = list(dict.fromkeys(subject_names))
+        result: Dict[int, Dict[str, float]] = {uid: {} for uid in user_ids}
+        missing_users, missing_names = set(), set()
+        for uid in user_ids:
+            for name in names:
+                cached = self._cache_get((uid, name))
+                if cached is None:
+                    missing_users.add(uid)
+                    missing_names.add(name)
+                else:
+                    result[uid][name] = cached
+
+        if missing_users:
+            def load(session: Session):
+                return session.execute(
+                    select(SubjectPace.user_id, SubjectPace.subject_name, SubjectPace.pace_factor).where(
+                        SubjectPace.user_id.in_(missing_users),
+                        SubjectPace.subject_name.in_(missing_names),
+                    )
+                ).all()
+
+            stored = {
+                (uid, name): float(pace) if pace is not None else DEFAULT_PACE
+                for uid, name, pace in self._with_session(db, load)
+            }
+            loaded = {}
+            for uid in missing_users:
+                for name in names:
+                    if name not in result[uid]:
+                        loaded[(uid, name)] = result[uid][name] = stored.get((uid, name), DEFAULT_PACE)
+            self._cache_put_many(loaded)
+
+        return result
+
+    # =====================
+    # 쓰기
+    # =====================
+    def set_many(self, user_id: Optional[int], values: Dict[str, float], db: Optional[Session] = None) -> None:
+        def apply(session: Session) -> Dict[str, float]:
+            self._upsert(session, user_id, values)
+            return values
+
+        self._write(db, user_id, apply)
+
+    def update_ema_many(
+        self,
+        user_id: Optional[int],
+        ratios: Dict[str, float],
+        alpha: float = EMA_ALPHA,
+        db: Optional[Session] = None,
+    ) -> Dict[str, Tuple[float, float]]:
+        """
+        과목별 효율 비율(ratio)로 EMA 업데이트. 반환: {과목명: (old, new)}
+        old 값은 캐시가 아니라 같은 트랜잭션 안에서 DB에서 읽는다.
+        """
+        changes: Dict[str, Tuple[float, float]] = {}
+
+        def apply(session: Session) -> Dict[str, float]:
+            existing = self._select_rows(session, user_id, list(ratios))
+            for name, ratio in ratios.items():
+                old = existing[name][1] if name in existing else DEFAULT_PACE
+                changes[name] = (old, ema(old, ratio, alpha))
+            new_values = {name: new for name, (_, new) in changes.items()}
+            self._upsert(session, user_id, new_values)
+            return new_values
+
+        self._write(db, user_id, apply)
+        return changes
+
+    # =====================
+    # 내부
+    # =====================
+    def _with_session(self, db: Optional[Session], fn):
+        if db is not None:
+            return fn(db)
+        with self._session_factory() as session:
+            return fn(session)
+
+    def _write(self, db: Optional[Session], user_id: Optional[int], apply) -> None:
+        if db is None:
+            with self._session_factory() as session:
+                written = apply(session)
+                session.commit()
+            self._cache_put_many({(user_id, name): pace for name, pace in written.items()})
+            return
+
+        # 호출한 쪽 트랜잭션에 합류: commit이 끝난 뒤에 캐시 반영 (rollback이면 버림)
+        written = apply(db)
+        db.info.setdefault(_PENDING_KEY, []).append(
+            (self, {(user_id, name): pace for name, pace in written.items()})
+        )
+
+    @staticmethod
+    def _select_rows(session: Session, user_id: Optional[int], names) -> Dict[str, Tuple[int, float]]:
+        if not names:
+            return {}
+        rows = session.execute(
+            select(SubjectPace.id, SubjectPace.subject_name, SubjectPace.pace_factor).where(
+                _user_clause(user_id), SubjectPace.subject_name.in_(names)
+            )
+        ).all()
+        return {
+            name: (row_id, float(pace) if pace is not None else DEFAULT_PACE)
+            for row_id, name, pace in rows
+        }
+
+    @staticmethod
+    def _upsert(session: Session, user_id: Optional[int], values: Dict[str, float]) -> None:
+        if not values:
+            return
+        now = datetime.utcnow()
+        table = SubjectPace.__table__
+        stmt = upsert_insert(session, table)
+        if user_id is None:
+            # 공용 pace: ux_subject_pace_shared_subject (user_id IS NULL 부분 unique 인덱스)
+            target = {"index_elements": [table.c.subject_name], "index_where": table.c.user_id.is_(None)}
+        else:
+            target = {"index_elements": [table.c.user_id, table.c.subject_name]}
+        stmt = stmt.on_conflict_do_update(
+            **target,
+            set_={"pace_factor": stmt.excluded.pace_factor, "updated_at": stmt.excluded.updated_at},
+        )
+        session.execute(
+            stmt,
+            [
+                {"user_id": user_id, "subject_name": name, "pace_factor": pace, "updated_at": now}
+                for name, pace in values.items()
+            ],
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_cache(session: Session):
+    for store, values in session.info.pop(_PENDING_KEY, []):
+        store._cache_put_many(values)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_cache(session: Session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+pace_store = PaceStore()
@@ -0,0 +1,294 @@
+"""
+다음 날 목표(PENDING 기록) 미리 계산 — 야간 배치.
+
+아침에 모두가 /study-goal/calculate를 부르는 대신, 전날 밤에 활성 유저의 다음 날 목표를
+미리 만들어두고 아침에는 GET /study-goal/today로 읽기만 한다.
+
+- 활성 유저: 계획 날짜 직전 PREPLAN_ACTIVE_DAYS일 안에 제출한 기록(completion.submitted)이 있는 유저.
+  배치가 만든 PENDING이나 정산이 X로 바꾼 목표는 활동으로 치지 않음 (안 쓰는 유저를 계속 계획하지 않도록)
+- 입력: 유저가 마지막으로 기록을 제출한 날짜의 과목 구성(과목별 마지막 기록)과 목표 시간 합계
+        난이도는 요청값이 저장되지 않으므로 과목의 difficulty 컬럼을 사용
+- 배분: daily_plan.allocate와 같은 식을 goal_batch로 청크 전체에 한 번에 (결과 동일)
+- 계획 날짜에 기록이 이미 있는 유저는 건너뜀 (직접 계산한 목표를 덮어쓰지 않음)
+- 만든 목표는 source="preplan". /study-goal/today로 받아보면 "preplan_opened"가 되고,
+  받아보지 않은 목표는 일 마감 정산이 목표 미달(X)로 바꾸지 않고 지운다
+- user_id 순으로 청크를 나눠 청크마다 commit + 진행 위치(job_checkpoints) 저장 → 중단돼도 이어서 실행
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import and_, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.job import JobCheckpoint
+from app.models.pace import SubjectPace
+from app.models.record import StudyRecord
+from app.models.subject import Subject
+from app.services.completion import submitted
+from app.services.goal_batch import allocate_batch
+from app.services.pace_store import DEFAULT_PACE
+
+JOB_NAME = "preplan"
+SOURCE = "preplan"                 # 배치가 만든 목표
+OPENED_SOURCE = "preplan_opened"   # 유저가 /study-goal/today로 받아본 목표
+
+logger = logging.getLogger(__name__)
+
+
+# =====================
+# 청크 읽기
+# =====================
+def _load_chunk(db: Session, plan_date: date, after_user_id: int, limit: int):
+    """
+    after_user_id 다음 활성 유저 최대 limit명의 최근 과목 구성.
+    반환: (청크의 마지막 user_id 또는 None, {user_id: {subject_id: row}})  row는 과목 순서(기록 id순) 유지
+    """
+    latest = (
+        select(StudyRecord.user_id, func.max(StudyRecord.record_date).label("last_date"))
+        .where(
+            StudyRecord.user_id > after_user_id,
+            StudyRecord.record_date >= plan_date - timedelta(days=settings.PREPLAN_ACTIVE_DAYS),
+            StudyRecord.record_date < plan_date,
+            submitted(),
+        )
+        .group_by(StudyRecord.user_id)
+        .order_by(StudyRecord.user_id)
+        .limit(limit)
+        .subquery()
+    )
+    last_user_id = db.execute(select(func.max(latest.c.user_id))).scalar()
+    if last_user_id is None:
+        return None, {}
+
+    rows = db.execute(
+        select(
+            StudyRecord.user_id,
+            StudyRecord.subject_id,
+            StudyRecord.target_minutes,
+            Subject.name,
+            Subject.importance,
+            Subject.total_pages,
+            Subject.difficulty,
+        )
+        .join(latest, and_(StudyRecord.user_id == latest.c.user_id, StudyRecord.record_date == latest.c.last_date))
+        .join(Subject, Subject.id == StudyRecord.subject_id)
+        .order_by(StudyRecord.user_id, StudyRecord.id)
+    ).all()
+
+    users: Dict[int, dict] = defaultdict(dict)
+    for row in rows:
+        users[row.user_id][row.subject_id] = row  # 같은 과목이 여러 번이면 마지막 기록, 순서는 처음 위치
+
+    # 계획 날짜에 이미 기록이 있는 유저(직접 계산했거나 이전 실행에서 처리됨)는 제외
+    planned = set(
+        db.execute(
+            select(StudyRecord.user_id)
+            .where(StudyRecord.user_id.in_(list(users)), StudyRecord.record_date == plan_date)
+            .distinct()
+        ).scalars()
+    )
+    return last_user_id, {uid: subjects for uid, subjects in users.items() if uid not in planned}
+
+
+def _load_paces(db: Session, users: Dict[int, dict]) -> Dict[tuple, float]:
+    """청크 유저들의 pace를 IN 쿼리 1번으로. 야간 배치라 PaceStore 캐시는 거치지 않음(요청용 캐시를 밀어내지 않도록)."""
+    names = {row.name for subjects in users.values() for row in subjects.values()}
+    return {
+        (uid, name): float(pace) if pace is not None else DEFAULT_PACE
+        for uid, name, pace in db.execute(
+            select(SubjectPace.user_id, SubjectPace.subject_name, SubjectPace.pace_factor).where(
+                SubjectPace.user_id.in_(list(users)),
+                SubjectPace.subject_name.in_(names),
+            )
+        )
+    }
+
+
+# =====================
+# 계산
+# =====================
+def plan_chunk(users: Dict[int, dict], paces: Dict[tuple, float]) -> List[dict]:
+    """
+    users: {user_id: {subject_id: row}} (row: target_minutes / name / importance / total_pages / difficulty)
+    반환: INSERT할 PENDING 목표 [{user_id, subject_id, target_minutes, target_pages}]
+    """
+    user_ids = list(users)
+    rows = [(uid, row) for uid in user_ids for row in users[uid].values()]
+    if not rows:
+        return []
+
+    counts = [len(users[uid]) for uid in user_ids]
+    owner = np.repeat(np.arange(len(user_ids)), counts)
+    total_minutes = np.fromiter(
+        (sum(row.target_minutes or 0 for row in users[uid].values()) for uid in user_ids), float, len(user_ids)
+    )
+    minutes, pages, total_weight = allocate_batch(
+        owner,
+        total_minutes,
+        np.fromiter((row.importance or 0 for _, row in rows), float, len(rows)),
+        np.fromiter((row.total_pages or 0 for _, row in rows), float, len(rows)),
+        np.fromiter((row.difficulty if row.difficulty is not None else -1 for _, row in rows), np.int64, len(rows)),
+        np.fromiter((paces.get((uid, row.name), DEFAULT_PACE) for uid, row in rows), float, len(rows)),
+        round_minutes_first=True,
+    )
+
+    # daily_plan.allocate처럼 가중치 합이 0인 유저는 목표를 만들지 않음
+    keep = (total_weight[owner] > 0).tolist()
+    target_minutes = np.rint(minutes).astype(np.int64).tolist()
+    pages = pages.tolist()
+    return [
+        {"user_id": uid, "subject_id": row.subject_id, "target_minutes": target_minutes[i], "target_pages": pages[i]}
+        for i, (uid, row) in enumerate(rows)
+        if keep[i]
+    ]
+
+
+def _write(db: Session, plan_date: date, goals: List[dict]) -> None:
+    if not goals:
+        return
+    now = datetime.utcnow()
+    db.execute(
+        insert(StudyRecord),
+        [
+            {
+                **g,
+                "record_date": plan_date,
+                "actual_minutes": 0,
+                "actual_pages": 0,
+                "status": "PENDING",
+                "fine": 0,
+                "source": SOURCE,
+                "created_at": now,
+            }
+            for g in goals
+        ],
+    )
+
+
+def mark_opened(db: Session, user_id: int, plan_date: date) -> None:
+    """유저가 받아본 preplan 목표 표시 → 일 마감 정산에서 목표 미달(X)로 처리됨. commit은 호출한 쪽에서."""
+    db.execute(
+        update(StudyRecord)
+        .where(
+            StudyRecord.user_id == user_id,
+            StudyRecord.record_date == plan_date,
+            StudyRecord.status == "PENDING",
+            StudyRecord.source == SOURCE,
+        )
+        .values(source=OPENED_SOURCE)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# =====================
+# 실행 (이어하기 지원)
+# =====================
+def _checkpoint(db: Session, plan_date: date, restart: bool) -> JobCheckpoint:
+    cp = db.execute(
+        select(JobCheckpoint).where(JobCheckpoint.job == JOB_NAME, JobCheckpoint.run_key == plan_date.isoformat())
+    ).scalar_one_or_none()
+    now = datetime.utcnow()
+    if cp is None:
+        cp = JobCheckpoint(job=JOB_NAME, run_key=plan_date.isoformat(), last_id=0, processed=0, done=False,
+                           started_at=now, updated_at=now)
+        db.add(cp)
+    elif restart:
+        cp.last_id, cp.processed, cp.done, cp.started_at, cp.updated_at = 0, 0, False, now, now
+    db.commit()
+    return cp
+
+
+def run(
+    db: Session,
+    plan_date: Optional[date] = None,
+    chunk_size: Optional[int] = None,
+    restart: bool = False,
+    on_chunk: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    plan_date(기본: 내일)의 목표를 활성 유저 전체에 대해 미리 만든다. 청크마다 commit.
+    이미 끝난 날짜는 restart=True가 아니면 다시 돌지 않는다.
+    반환: 처리 통계 (users / records / chunks / 처리량)
+    """
+    plan_date = plan_date or date.today() + timedelta(days=1)
+    chunk_size = chunk_size or settings.PREPLAN_CHUNK_SIZE
+    cp = _checkpoint(db, plan_date, restart)
+
+    stats = {
+        "plan_date": plan_date.isoformat(),
+        "resumed_from_user_id": cp.last_id,
+        "already_done": cp.done,
+        "users": 0,
+        "records": 0,
+        "chunks": 0,
+    }
+    started = time.perf_counter()
+    while not cp.done:
+        last_user_id, users = _load_chunk(db, plan_date, cp.last_id, chunk_size)
+        if last_user_id is None:
+            cp.done = True
+            cp.updated_at = datetime.utcnow()
+            db.commit()
+            break
+
+        goals = plan_chunk(users, _load_paces(db, users)) if users else []
+        _write(db, plan_date, goals)
+        planned_users = len({g["user_id"] for g in goals})
+        cp.last_id = last_user_id
+        cp.processed += planned_users
+        cp.updated_at = datetime.utcnow()
+        db.commit()
+
+        stats["users"] += planned_users
+        stats["records"] += len(goals)
+        stats["chunks"] += 1
+        if on_chunk is not None:
+            on_chunk({"last_user_id": last_user_id, "users": stats["users"], "records": stats["records"]})
+
+    elapsed = time.perf_counter() - started
+    stats["elapsed_s"] = round(elapsed, 3)
+    stats["users_per_s"] = round(stats["users"] / elapsed, 1) if elapsed > 0 else 0.0
+    stats["records_per_s"] = round(stats["records"] / elapsed, 1) if elapsed > 0 else 0.0
+    return stats
+
+
+# =====================
+# 앱 내 스케줄러
+# =====================
+def _seconds_until(hhmm: str, now: datetime) -> float:
+    hour, minute = (int(x) for x in hhmm.split(":"))
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+def _run_once(plan_date: date) -> dict:
+    with SessionLocal() as db:
+        return run(db, plan_date=plan_date)
+
+
+async def nightly_loop() -> None:
+    """
+    매일 PREPLAN_AT(서버 로컬 시각)에 내일 목표를 미리 계산. app.main이 시작 시 태스크로 띄운다.
+    DB 작업은 스레드에서 돌려 이벤트 루프를 막지 않음. 실패하면 그날이 오기 전까지 마지막 청크부터 다시 시도.
+    여러 인스턴스에서 켜면 같은 청크를 중복 처리할 수 있으니 한 곳에서만 켤 것.
+    """
+    while True:
+        await asyncio.sleep(_seconds_until(settings.PREPLAN_AT, datetime.now()))
+        plan_date = date.today() + timedelta(days=1)
+        while date.today() < plan_date:
+            try:
+                stats = await asyncio.to_thread(_run_once, plan_date)
+                logger.info("preplan done: %s", stats)
+                break
+            except Exception:
+                logger.exception("preplan failed: %s", plan_date)
+                await asyncio.sleep(settings.PREPLAN_RETRY_SECONDS)
@@ -0,0 +1,203 @@
+"""
+스터디 랭킹 (study_rankings 테이블).
+
+- 기록 완료 시: (study_id, user_id)별 출석/시간을 INSERT ... ON CONFLICT DO UPDATE(col = col + delta)로 증분 반영
+- 조회: 현재 멤버 전원이 대상. 랭킹 행이 없는 멤버(아직 완료 기록 없음)는 출석 0 / 0분으로
+  top()(StudyMember 기준 outer join)과 my_rank() 모두 같은 집합 · 같은 점수로 센다. LIMIT/OFFSET
+- 동점: 출석/시간이 같으면 같은 순위, 다음 순위는 건너뜀 (1, 2, 2, 4)
+- rebuild(): study_records 이력에서 다시 계산 (마이그레이션 / 점검용) / check(): 재계산과 비교
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, case, delete, func, insert, literal, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.database import upsert_insert
+from app.models.ranking import StudyRanking
+from app.models.record import StudyRecord
+from app.models.study import StudyMember
+from app.models.subject import Subject
+from app.models.user import User
+
+_rankings = StudyRanking.__table__
+
+
+def apply_completions(db: Session, user_id: int, entries: List[dict]) -> None:
+    """
+    complete_pending 결과(entries: study_id / status / actual_minutes)를 랭킹에 증분 반영.
+    commit은 호출한 쪽에서.
+    """
+    deltas: Dict[int, List[int]] = defaultdict(lambda: [0, 0])  # study_id -> [출석, 분]
+    for e in entries:
+        if e.get("study_id") is None:
+            continue
+        delta = deltas[e["study_id"]]
+        delta[0] += 1 if e["status"] == "O" else 0
+        delta[1] += e["actual_minutes"] or 0
+    if not deltas:
+        return
+
+    now = datetime.utcnow()
+    stmt = upsert_insert(db, _rankings)
+    # 읽고-쓰기 대신 col = col + delta 로 동시 요청에도 값이 안 사라지게,
+    # 처음 넣는 (study, user)가 동시에 와도 unique 위반 없이 한쪽이 UPDATE로 합쳐지게
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[_rankings.c.study_id, _rankings.c.user_id],
+        set_={
+            "attendance_count": _rankings.c.attendance_count + stmt.excluded.attendance_count,
+            "total_minutes": _rankings.c.total_minutes + stmt.excluded.total_minutes,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(
+        stmt,
+        [
+            {"study_id": study_id, "user_id": user_id, "attendance_count": att, "total_minutes": minutes, "updated_at": now}
+            for study_id, (att, minutes) in deltas.items()
+        ],
+    )
+
+
+# =====================
+# 조회
+# =====================
+def _member_join():
+    return and_(
+        StudyMember.study_id == StudyRanking.study_id,
+        StudyMember.user_id == StudyRanking.user_id,
+    )
+
+
+def _count_better(db: Session, study_id: int, attendance: int, minutes: int) -> int:
+    """나보다 점수가 높은 (현재 멤버) 수"""
+    return db.execute(
+        select(func.count())
+        .select_from(StudyRanking)
+        .join(StudyMember, _member_join())
+        .where(
+            StudyRanking.study_id == study_id,
+            or_(
+                StudyRanking.attendance_count > attendance,
+                and_(
+                    StudyRanking.attendance_count == attendance,
+                    StudyRanking.total_minutes > minutes,
+                ),
+            ),
+        )
+    ).scalar() or 0
+
+
+def _item(rank: int, user_id: int, name: str, email: str, attendance: int, minutes: int) -> dict:
+    return {
+        "rank": rank,
+        "user_id": user_id,
+        "name": name,
+        "email": email,
+        "attendance_count": attendance,
+        "total_minutes": minutes,
+    }
+
+
+def top(db: Session, study_id: int, limit: int = 20, offset: int = 0) -> dict:
+    total = db.execute(
+        select(func.count()).select_from(StudyMember).where(StudyMember.study_id == study_id)
+    ).scalar() or 0
+
+    attendance = func.coalesce(StudyRanking.attendance_count, 0)
+    minutes = func.coalesce(StudyRanking.total_minutes, 0)
+    rows = db.execute(
+        select(StudyMember.user_id, User.name, User.email, attendance, minutes)
+        .select_from(StudyMember)
+        .outerjoin(StudyRanking, _member_join())
+        .join(User, User.id == StudyMember.user_id)
+        .where(StudyMember.study_id == study_id)
+        .order_by(attendance.desc(), minutes.desc(), StudyMember.user_id)
+        .limit(limit)
+        .offset(offset)
+    ).all()
+
+    items = []
+    prev_score = None
+    rank = 0
+    for i, (user_id, name, email, attendance, minutes) in enumerate(rows):
+        score = (attendance, minutes)
+        if score != prev_score:
+            if i == 0 and offset > 0:
+                # 앞 페이지와 동점일 수 있으므로 첫 행만 실제 순위를 계산
+                rank = _count_better(db, study_id, attendance, minutes) + 1
+            else:
+                rank = offset + i + 1
+            prev_score = score
+        items.append(_item(rank, user_id, name, email, attendance, minutes))
+
+    return {"total": total, "limit": limit, "offset": offset, "items": items}
+
+
+def my_rank(db: Session, study_id: int, user: User) -> dict:
+    row = db.execute(
+        select(StudyRanking.attendance_count, StudyRanking.total_minutes).where(
+            StudyRanking.study_id == study_id,
+            StudyRanking.user_id == user.id,
+        )
+    ).first()
+    attendance, minutes = (row[0], row[1]) if row else (0, 0)
+    rank = _count_better(db, study_id, attendance, minutes) + 1
+    return _item(rank, user.id, user.name, user.email, attendance, minutes)
+
+
+# =====================
+# 재계산
+# =====================
+def _source(study_id: Optional[int] = None):
+    stmt = (
+        select(
+            Subject.study_id,
+            StudyRecord.user_id,
+            func.sum(case((StudyRecord.status == "O", 1), else_=0)),
+            func.sum(func.coalesce(StudyRecord.actual_minutes, 0)),
+        )
+        .join(Subject, Subject.id == StudyRecord.subject_id)
+        .where(Subject.study_id.is_not(None), StudyRecord.status != "PENDING")
+        .group_by(Subject.study_id, StudyRecord.user_id)
+    )
+    if study_id is not None:
+        stmt = stmt.where(Subject.study_id == study_id)
+    return stmt
+
+
+def rebuild(db, study_id: Optional[int] = None) -> None:
+    """study_records 이력에서 랭킹을 다시 만든다. db는 Session 또는 Connection."""
+    clear = delete(StudyRanking)
+    if study_id is not None:
+        clear = clear.where(StudyRanking.study_id == study_id)
+    db.execute(clear)
+
+    source = _source(study_id).add_columns(literal(datetime.utcnow()))
+    db.execute(
+        insert(StudyRanking).from_select(
+            ["study_id", "user_id", "attendance_count", "total_minutes", "updated_at"],
+            source,
+        )
+    )
+
+
+def check(db: Session, study_id: Optional[int] = None) -> List[dict]:
+    """랭킹과 study_records 재집계가 다른 (study, user) 목록"""
+    expected = {(sid, uid): (att, minutes) for sid, uid, att, minutes in db.execute(_source(study_id))}
+    stmt = select(StudyRanking.study_id, StudyRanking.user_id, StudyRanking.attendance_count, StudyRanking.total_minutes)
+    if study_id is not None:
+        stmt = stmt.where(StudyRanking.study_id == study_id)
+    stored = {(sid, uid): (att, minutes) for sid, uid, att, minutes in db.execute(stmt)}
+
+    mismatches = []
+    for key in sorted(set(expected) | set(stored)):
+        if expected.get(key) != stored.get(key):
+            mismatches.append({
+                "study_id": key[0],
+                "user_id": key[1],
+                "expected": expected.get(key),
+                "stored": stored.get(key),
+            })
+    return mismatches
@@ -0,0 +1,336 @@
+"""
+일 마감 정산 + 스터디별 월 정산 장부 (settlement_ledgers).
+
+하루(day)를 마감할 때 스터디마다:
+- 결석: 그날까지 가입한 멤버 중 그날 이 스터디 과목에 제출한 기록(O / 🔺 / 실제 공부량이 있는 X)이 없는 멤버
+  → study_absences에 (study, user, 날짜)당 1행 + 벌금(Study.fine_per_absence): INSERT ... SELECT 1번.
+  목표를 안 세운 멤버도 결석. 목표는 세웠지만 못 채운 날(X)은 결석이 아니고 벌금도 없음
+- 그날 PENDING으로 남은 목표 → X(목표 미달, 실제 0): UPDATE ... RETURNING 1번, 바뀐 행만 랭킹 / 주간 요약 / daily_stats에 반영.
+  단 야간 배치가 만들고 유저가 받아보지도 않은 목표(source="preplan")는 유저가 세운 목표가 아니므로 지움
+- 해당 월 장부를 daily_stats + study_absences에서 다시 채움: DELETE + INSERT ... SELECT (현재 멤버 전원)
+
+run()은 스터디마다 장부의 마지막 마감일 다음 날부터 지정한 날(기본: 어제)까지 밀린 날을 순서대로 마감한다.
+같은 날을 다시 돌려도 결과는 같다 (PENDING은 이미 없고, 결석은 (study, user, 날짜) unique).
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, delete, func, insert, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.database import upsert_insert
+from app.models.daily_stat import DailyStat
+from app.models.record import StudyRecord
+from app.models.settlement import SettlementLedger, StudyAbsence
+from app.models.study import Study, StudyMember
+from app.models.subject import Subject
+from app.models.user import User
+from app.services import daily_stats, preplan, ranking, weekly_summary
+from app.services.completion import submitted
+
+
+def month_key(d: date) -> str:
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def month_bounds(month: str) -> tuple:
+    year, mon = (int(x) for x in month.split("-"))
+    start = date(year, mon, 1)
+    end = (start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return start, end
+
+
+# =====================
+# 일 마감
+# =====================
+_absences = StudyAbsence.__table__
+
+
+def _insert_absences(db: Session, study_id: int, day: date, fine: int) -> int:
+    """그날 제출한 기록이 없는 멤버를 결석으로 기록 (이미 있으면 그대로). 반환: 새로 기록된 결석 수"""
+    attended = (
+        select(StudyRecord.id)
+        .join(Subject, Subject.id == StudyRecord.subject_id)
+        .where(
+            Subject.study_id == study_id,
+            StudyRecord.user_id == StudyMember.user_id,
+            StudyRecord.record_date == day,
+            submitted(),
+        )
+        .exists()
+    )
+    next_day = datetime.combine(day + timedelta(days=1), datetime.min.time())
+    source = (
+        select(
+            literal(study_id),
+            StudyMember.user_id,
+            literal(day),
+            literal(fine),
+            literal(datetime.utcnow()),
+        )
+        .where(
+            StudyMember.study_id == study_id,
+            or_(StudyMember.joined_at.is_(None), StudyMember.joined_at < next_day),
+            ~attended,
+        )
+        .distinct()
+    )
+    result = db.execute(
+        upsert_insert(db, _absences)
+        .from_select(["study_id", "user_id", "absence_date", "fine", "created_at"], source)
+        .on_conflict_do_nothing(index_elements=[_absences.c.study_id, _absences.c.user_id, _absences.c.absence_date])
+    )
+    return max(result.rowcount or 0, 0)
+
+
+def settle_study_day(db: Session, study_id: int, fine_per_absence: int, day: date) -> dict:
+    """스터디 하나의 하루 마감. commit은 호출한 쪽에서. 반환: 처리 건수"""
+    fine = fine_per_absence or 0
+
+    # 읽고 나서 바꾸면 그 사이 complete-records로 완료된 기록까지 X로 덮고 롤업에 두 번 들어가므로
+    # 아직 PENDING인 행만 바로 DELETE / UPDATE하고, 실제로 바뀐 행(RETURNING)만 롤업에 반영
+    day_pending = and_(
+        StudyRecord.subject_id.in_(select(Subject.id).where(Subject.study_id == study_id)),
+        StudyRecord.record_date == day,
+        StudyRecord.status == "PENDING",
+    )
+    dropped = db.execute(
+        delete(StudyRecord)
+        .where(day_pending, StudyRecord.source == preplan.SOURCE)
+        .returning(StudyRecord.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    pending = db.execute(
+        update(StudyRecord)
+        .where(day_pending)
+        .values(status="X", actual_minutes=0, actual_pages=0)
+        .returning(StudyRecord.user_id, StudyRecord.subject_id, StudyRecord.target_minutes, StudyRecord.target_pages)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    # 롤업 반영 (유저별). 목표 미달에는 벌금 없음
+    missed: Dict[int, List[dict]] = defaultdict(list)
+    for r in pending:
+        missed[r.user_id].append({
+            "subject_id": r.subject_id,
+            "study_id": study_id,
+            "record_date": day,
+            "status": "X",
+            "target_minutes": r.target_minutes,
+            "target_pages": r.target_pages,
+            "actual_minutes": 0,
+            "actual_pages": 0,
+        })
+    for user_id, entries in missed.items():
+        ranking.apply_completions(db, user_id, entries)
+        weekly_summary.apply_completions(db, user_id, entries)
+        daily_stats.apply_completions(db, user_id, entries)
+
+    absent = _insert_absences(db, study_id, day, fine)
+
+    refresh_ledger(db, study_id, month_key(day), settled_through=day)
+    return {
+        "study_id": study_id,
+        "date": day.isoformat(),
+        "missed": len(pending),
+        "dropped": len(dropped),
+        "absent": absent,
+        "fine": absent * fine,
+    }
+
+
+def run(db: Session, through: Optional[date] = None, study_id: Optional[int] = None) -> List[dict]:
+    """
+    밀린 날 전부 마감: 스터디마다 장부의 마지막 마감일 다음 날부터 through(기본: 어제)까지 하루씩.
+    아직 마감한 적 없는 스터디는 through 하루만. (스터디, 날짜) 단위로 commit (중간에 실패해도 끝난 날은 유지).
+    """
+    through = through or date.today() - timedelta(days=1)
+    stmt = select(Study.id, Study.fine_per_absence).order_by(Study.id)
+    last_stmt = select(SettlementLedger.study_id, func.max(SettlementLedger.settled_through)).group_by(
+        SettlementLedger.study_id
+    )
+    if study_id is not None:
+        stmt = stmt.where(Study.id == study_id)
+        last_stmt = last_stmt.where(SettlementLedger.study_id == study_id)
+    last_settled = dict(db.execute(last_stmt).all())
+
+    results = []
+    for sid, fine_per_absence in db.execute(stmt).all():
+        last = last_settled.get(sid)
+        day = last + timedelta(days=1) if last else through
+        while day <= through:
+            try:
+                results.append(settle_study_day(db, sid, fine_per_absence, day))
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            day += timedelta(days=1)
+    return results
+
+
+def run_day(db: Session, day: date, study_id: Optional[int] = None) -> List[dict]:
+    """모든 스터디(또는 하나)의 특정 하루만 다시 마감. 스터디 단위로 commit (중간에 실패해도 끝난 스터디는 유지)."""
+    stmt = select(Study.id, Study.fine_per_absence).order_by(Study.id)
+    if study_id is not None:
+        stmt = stmt.where(Study.id == study_id)
+
+    results = []
+    for sid, fine_per_absence in db.execute(stmt).all():
+        try:
+            results.append(settle_study_day(db, sid, fine_per_absence, day))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    return results
+
+
+# =====================
+# 장부
+# =====================
+def refresh_ledger(db: Session, study_id: int, month: str, settled_through: Optional[date] = None) -> None:
+    """
+    (study, month) 장부를 daily_stats(O / 🔺 / X, 예전 기록 벌금) + study_absences(결석 / 벌금)에서 다시 채운다.
+    현재 멤버 전원 (기록이 없어도 행이 생김). commit은 호출한 쪽에서.
+    """
+    start, end = month_bounds(month)
+    previous = db.execute(
+        select(func.max(SettlementLedger.settled_through)).where(
+            SettlementLedger.study_id == study_id,
+            SettlementLedger.month == month,
+        )
+    ).scalar()
+    # 지난 날짜를 다시 마감해도 이미 마감된 범위는 줄이지 않음
+    through = min(max(d for d in (settled_through or end, previous) if d is not None), end)
+
+    db.execute(
+        delete(SettlementLedger).where(
+            SettlementLedger.study_id == study_id,
+            SettlementLedger.month == month,
+        )
+    )
+    stats = (
+        select(
+            DailyStat.user_id,
+            func.sum(DailyStat.o_count).label("o_count"),
+            func.sum(DailyStat.triangle_count).label("triangle_count"),
+            func.sum(DailyStat.x_count).label("x_count"),
+            func.sum(DailyStat.fine).label("fine"),
+        )
+        .join(Subject, Subject.id == DailyStat.subject_id)
+        .where(
+            Subject.study_id == study_id,
+            DailyStat.stat_date >= start,
+            DailyStat.stat_date <= through,
+        )
+        .group_by(DailyStat.user_id)
+        .subquery()
+    )
+    absences = (
+        select(
+            StudyAbsence.user_id,
+            func.count().label("days"),
+            func.sum(StudyAbsence.fine).label("fine"),
+        )
+        .where(
+            StudyAbsence.study_id == study_id,
+            StudyAbsence.absence_date >= start,
+            StudyAbsence.absence_date <= through,
+        )
+        .group_by(StudyAbsence.user_id)
+        .subquery()
+    )
+    source = (
+        select(
+            literal(study_id),
+            literal(month),
+            StudyMember.user_id,
+            func.coalesce(stats.c.o_count, 0),
+            func.coalesce(stats.c.triangle_count, 0),
+            func.coalesce(stats.c.x_count, 0),
+            func.coalesce(absences.c.days, 0),
+            func.coalesce(stats.c.fine, 0) + func.coalesce(absences.c.fine, 0),
+            literal(through),
+            literal(datetime.utcnow()),
+        )
+        .outerjoin(stats, stats.c.user_id == StudyMember.user_id)
+        .outerjoin(absences, absences.c.user_id == StudyMember.user_id)
+        .where(StudyMember.study_id == study_id)
+        .distinct()
+    )
+    db.execute(
+        insert(SettlementLedger).from_select(
+            ["study_id", "month", "user_id", "o_count", "triangle_count", "x_count",
+             "absence_count", "total_fine", "settled_through", "updated_at"],
+            source,
+        )
+    )
+
+
+def member_month(db: Session, user_id: int, start: date, end: date) -> dict:
+    """개인 월 정산 (모든 스터디 합산): daily_stats의 O / 🔺 / X + study_absences의 결석 수 / 벌금"""
+    result = daily_stats.monthly_settlement(db, user_id, start, end)
+    days, fine = db.execute(
+        select(func.count(), func.coalesce(func.sum(StudyAbsence.fine), 0)).where(
+            StudyAbsence.user_id == user_id,
+            StudyAbsence.absence_date >= start,
+            StudyAbsence.absence_date <= end,
+        )
+    ).one()
+    result["absence_count"] = days
+    result["total_fine"] += fine
+    return result
+
+
+def read_ledger(db: Session, study_id: int, month: str) -> dict:
+    """멤버 전체 정산 (장부에 행이 없는 멤버는 0)"""
+    rows = db.execute(
+        select(
+            User.id,
+            User.name,
+            User.email,
+            SettlementLedger.o_count,
+            SettlementLedger.triangle_count,
+            SettlementLedger.x_count,
+            SettlementLedger.absence_count,
+            SettlementLedger.total_fine,
+            SettlementLedger.settled_through,
+        )
+        .join(StudyMember, StudyMember.user_id == User.id)
+        .outerjoin(
+            SettlementLedger,
+            and_(
+                SettlementLedger.study_id == StudyMember.study_id,
+                SettlementLedger.user_id == User.id,
+                SettlementLedger.month == month,
+            ),
+        )
+        .where(StudyMember.study_id == study_id)
+        .order_by(func.coalesce(SettlementLedger.total_fine, 0).desc(), User.id)
+    ).all()
+
+    members = []
+    settled_through = None
+    for user_id, name, email, o, tri, x, absences, fine, through in rows:
+        members.append({
+            "user_id": user_id,
+            "name": name,
+            "email": email,
+            "O_count": o or 0,
+            "triangle_count": tri or 0,
+            "X_count": x or 0,
+            "absence_count": absences or 0,
+            "total_fine": fine or 0,
+        })
+        if through is not None and (settled_through is None or through > settled_through):
+            settled_through = through
+
+    return {
+        "study_id": study_id,
+        "month": month,
+        "settled_through": settled_through,
+        "total_fine": sum(m["total_fine"] for m in members),
+        "members": members,
+    }
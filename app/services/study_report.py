@@ -0,0 +1,160 @@
+"""
+스터디 단위 주간 리포트 (GET /studies/{study_id}/weekly-report).
+
+- 멤버 목록 1번 + 멤버 전체 기록 1번(user_id, 날짜순 정렬) + pace 1번 조회
+- 멤버별 요약은 ai/weekly_summary_ai.build_weekly_summary와 같은 계산
+- 기록이 많은 스터디는 점수 계산(CPU)을 프로세스 풀로 나눠서 처리 (REPORT_POOL_*)
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import groupby
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.record import StudyRecord
+from app.models.study import StudyMember
+from app.models.subject import Subject
+from app.models.user import User
+from app.services.pace_store import pace_store
+
+
+class ReportRow(NamedTuple):
+    """build_weekly_summary가 읽는 속성만 담은 가벼운 기록 (프로세스 간 전달용)"""
+    record_date: date
+    subject_name: str
+    target_minutes: int
+    target_pages: int
+    actual_minutes: int
+    actual_pages: int
+
+
+# (user_id, 기록 목록, {과목명: pace})
+MemberInput = Tuple[int, List[ReportRow], Dict[str, float]]
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # 서버 프로세스는 스레드/커넥션 풀을 갖고 있으므로 fork 대신 spawn
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.REPORT_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """앱 종료(shutdown 이벤트) 시 호출: 띄워둔 워커 프로세스 정리"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+# =====================
+# 조회
+# =====================
+def load(db: Session, study_id: int, week_start: date, week_end: date) -> Tuple[List[tuple], List[MemberInput]]:
+    """
+    반환: (멤버 [(user_id, name, email)], 기록이 있는 멤버별 입력 [(user_id, rows, paces)])
+    기록은 이 스터디 과목의 완료 기록만 (PENDING 제외).
+    """
+    members = db.execute(
+        select(User.id, User.name, User.email)
+        .join(StudyMember, StudyMember.user_id == User.id)
+        .where(StudyMember.study_id == study_id)
+        .order_by(User.id)
+    ).all()
+
+    rows = db.execute(
+        select(
+            StudyRecord.user_id,
+            StudyRecord.record_date,
+            Subject.name,
+            StudyRecord.target_minutes,
+            StudyRecord.target_pages,
+            StudyRecord.actual_minutes,
+            StudyRecord.actual_pages,
+        )
+        .join(Subject, Subject.id == StudyRecord.subject_id)
+        .join(
+            StudyMember,
+            (StudyMember.study_id == Subject.study_id) & (StudyMember.user_id == StudyRecord.user_id),
+        )
+        .where(
+            Subject.study_id == study_id,
+            StudyRecord.record_date >= week_start,
+            StudyRecord.record_date <= week_end,
+            StudyRecord.status != "PENDING",
+        )
+        .order_by(StudyRecord.user_id, StudyRecord.record_date, StudyRecord.id)
+    ).all()
+
+    by_user: Dict[int, List[ReportRow]] = {}
+    names = set()
+    for user_id, group in groupby(rows, key=lambda r: r[0]):
+        records = [
+            ReportRow(d, name.strip(), t_min or 0, t_pg or 0, a_min or 0, a_pg or 0)
+            for _, d, name, t_min, t_pg, a_min, a_pg in group
+        ]
+        by_user[user_id] = records
+        names.update(r.subject_name for r in records)
+
+    paces = pace_store.get_many_users(by_user, names, db=db) if by_user else {}
+    inputs = [(user_id, records, paces.get(user_id, {})) for user_id, records in by_user.items()]
+    return [tuple(m) for m in members], inputs
+
+
+# =====================
+# 점수 계산 (프로세스 풀에서도 호출되므로 모듈 최상위 함수)
+# =====================
+def score_members(chunk: List[MemberInput], week_start: date, week_end: date) -> List[Tuple[int, dict]]:
+    from ai.weekly_summary_ai import build_weekly_summary
+
+    return [
+        (user_id, build_weekly_summary(records, paces, week_start, week_end).model_dump())
+        for user_id, records, paces in chunk
+    ]
+
+
+def _chunks(items: list, n: int) -> List[list]:
+    size = max(1, -(-len(items) // n))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def score(inputs: List[MemberInput], week_start: date, week_end: date) -> Dict[int, dict]:
+    loop = asyncio.get_running_loop()
+    total = sum(len(records) for _, records, _ in inputs)
+    if settings.REPORT_POOL_WORKERS < 2 or total < settings.REPORT_POOL_MIN_RECORDS:
+        # 풀을 쓰지 않는 크기여도 이벤트 루프에서 돌리면 그동안 다른 요청이 모두 멈추므로 스레드에서
+        return dict(await loop.run_in_executor(None, score_members, inputs, week_start, week_end))
+
+    pool = _get_pool()
+    # 워커당 몇 덩어리씩: 멤버별 기록 수 편차가 있어도 한 워커만 늦게 끝나지 않게
+    parts = await asyncio.gather(*(
+        loop.run_in_executor(pool, score_members, chunk, week_start, week_end)
+        for chunk in _chunks(inputs, settings.REPORT_POOL_WORKERS * 4)
+    ))
+    return {user_id: summary for part in parts for user_id, summary in part}
+
+
+async def build_report(db, study_id: int, week_start: date, week_end: date) -> dict:
+    """db: AsyncSession"""
+    members, inputs = await db.run_sync(load, study_id, week_start, week_end)
+    summaries = await score(inputs, week_start, week_end)
+    return {
+        "study_id": study_id,
+        "week_start": week_start,
+        "week_end": week_end,
+        "members": [
+            {"user_id": uid, "name": name, "email": email, "summary": summaries.get(uid)}
+            for uid, name, email in members
+        ],
+    }
@@ -0,0 +1,204 @@
+"""
+유저별 주간 요약 저장소 (weekly_summaries 테이블, (user_id, week_start)당 1행).
+
+- 주 단위: 월요일 ~ 일요일 (record_date 기준)
+- 집계 대상: 완료된 기록(PENDING 제외)
+- summary_text: 과목별 합계 JSON
+    {"subjects": {"<subject_id>": {"t_min": .., "a_min": .., "t_pg": .., "a_pg": ..}}}
+- 기록 완료 시 증분 반영 (행을 잠그고 합쳐서 동시 완료에도 값이 안 사라짐), /ai/weekly-summary는 저장된 행 하나만 읽는다
+- backfill(): 이력 전체 재계산 / check(): 전체 재집계와 비교
+"""
+import json
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.database import upsert_insert
+from app.models.record import StudyRecord
+from app.models.summary import WeeklySummary
+
+FIELDS = ("t_min", "a_min", "t_pg", "a_pg")
+
+_summaries = WeeklySummary.__table__
+
+Totals = Dict[int, Dict[str, int]]  # subject_id -> {t_min, a_min, t_pg, a_pg}
+
+
+def week_bounds(d: date) -> Tuple[date, date]:
+    start = d - timedelta(days=d.weekday())
+    return start, start + timedelta(days=6)
+
+
+def _empty() -> Dict[str, int]:
+    return {f: 0 for f in FIELDS}
+
+
+def _dumps(totals: Totals) -> str:
+    return json.dumps(
+        {"subjects": {str(sid): totals[sid] for sid in sorted(totals)}},
+        ensure_ascii=False,
+    )
+
+
+def _loads(text: str) -> Totals:
+    data = json.loads(text or "{}").get("subjects", {})
+    return {int(sid): {f: int(v.get(f, 0)) for f in FIELDS} for sid, v in data.items()}
+
+
+def _add(totals: Totals, subject_id: int, t_min, a_min, t_pg, a_pg) -> None:
+    acc = totals.setdefault(subject_id, _empty())
+    acc["t_min"] += t_min or 0
+    acc["a_min"] += a_min or 0
+    acc["t_pg"] += t_pg or 0
+    acc["a_pg"] += a_pg or 0
+
+
+# =====================
+# 쓰기
+# =====================
+def _save(db: Session, user_id: int, weeks: Dict[date, Totals], merge: bool) -> None:
+    """weeks: week_start -> 과목별 합계. merge=True면 기존 값에 더하고, False면 덮어씀."""
+    if not weeks:
+        return
+
+    now = datetime.utcnow()
+    key = [_summaries.c.user_id, _summaries.c.week_start]
+    stmt = upsert_insert(db, _summaries)
+
+    def rows(text_of) -> List[dict]:
+        return [
+            {
+                "user_id": user_id,
+                "week_start": week_start,
+                "week_end": week_bounds(week_start)[1],
+                "summary_text": text_of(totals),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for week_start, totals in weeks.items()
+        ]
+
+    if not merge:
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=key,
+                set_={"summary_text": stmt.excluded.summary_text, "updated_at": stmt.excluded.updated_at},
+            ),
+            rows(_dumps),
+        )
+        return
+
+    # 1) 없는 주는 빈 요약으로 먼저 만듦 (같은 주를 동시에 처음 넣어도 unique 위반 없이 한 행)
+    db.execute(stmt.on_conflict_do_nothing(index_elements=key), rows(lambda _: _dumps({})))
+    # 2) 행을 잠그고 읽어서 합침 → 동시 완료가 서로의 증분을 덮어쓰지 않음
+    #    Postgres: FOR UPDATE로 같은 주를 갱신 중인 트랜잭션이 끝날 때까지 기다렸다가 최신 값을 읽음
+    #    SQLite: 1)의 INSERT로 이미 DB 쓰기 lock을 잡고 있어 다른 쓰기와 겹치지 않음
+    existing = db.execute(
+        select(WeeklySummary.id, WeeklySummary.week_start, WeeklySummary.summary_text)
+        .where(
+            WeeklySummary.user_id == user_id,
+            WeeklySummary.week_start.in_(list(weeks)),
+        )
+        .with_for_update()
+    ).all()
+
+    updates = []
+    for row in existing:
+        merged = _loads(row.summary_text)
+        for sid, acc in weeks[row.week_start].items():
+            _add(merged, sid, acc["t_min"], acc["a_min"], acc["t_pg"], acc["a_pg"])
+        updates.append({"id": row.id, "summary_text": _dumps(merged), "updated_at": now})
+    if updates:
+        db.execute(update(WeeklySummary), updates)
+
+
+def apply_completions(db: Session, user_id: int, entries: List[dict]) -> None:
+    """complete_pending 결과를 해당 주 요약에 더한다. commit은 호출한 쪽에서."""
+    weeks: Dict[date, Totals] = defaultdict(dict)
+    for e in entries:
+        week_start = week_bounds(e["record_date"])[0]
+        _add(
+            weeks[week_start], e["subject_id"],
+            e["target_minutes"], e["actual_minutes"], e["target_pages"], e["actual_pages"],
+        )
+    _save(db, user_id, weeks, merge=True)
+
+
+# =====================
+# 읽기
+# =====================
+def read_week(db: Session, user_id: int, week_start: date) -> Optional[Totals]:
+    text = db.execute(
+        select(WeeklySummary.summary_text).where(
+            WeeklySummary.user_id == user_id,
+            WeeklySummary.week_start == week_start,
+        )
+    ).scalar()
+    return None if text is None else _loads(text)
+
+
+# =====================
+# 전체 재집계 (backfill / check)
+# =====================
+def _recompute(db: Session, user_id: Optional[int] = None, since: Optional[date] = None) -> Dict[Tuple[int, date], Totals]:
+    """study_records에서 (user, 주)별 과목 합계를 다시 계산. 일 단위로 GROUP BY 후 주로 접음."""
+    stmt = (
+        select(
+            StudyRecord.user_id,
+            StudyRecord.record_date,
+            StudyRecord.subject_id,
+            func.sum(StudyRecord.target_minutes),
+            func.sum(StudyRecord.actual_minutes),
+            func.sum(StudyRecord.target_pages),
+            func.sum(StudyRecord.actual_pages),
+        )
+        .where(StudyRecord.status != "PENDING")
+        .group_by(StudyRecord.user_id, StudyRecord.record_date, StudyRecord.subject_id)
+    )
+    if user_id is not None:
+        stmt = stmt.where(StudyRecord.user_id == user_id)
+    if since is not None:
+        stmt = stmt.where(StudyRecord.record_date >= week_bounds(since)[0])
+
+    result: Dict[Tuple[int, date], Totals] = defaultdict(dict)
+    for uid, record_date, subject_id, t_min, a_min, t_pg, a_pg in db.execute(stmt):
+        _add(result[(uid, week_bounds(record_date)[0])], subject_id, t_min, a_min, t_pg, a_pg)
+    return result
+
+
+def _stored(db: Session, user_id: Optional[int] = None, since: Optional[date] = None) -> Dict[Tuple[int, date], Totals]:
+    stmt = select(WeeklySummary.user_id, WeeklySummary.week_start, WeeklySummary.summary_text)
+    if user_id is not None:
+        stmt = stmt.where(WeeklySummary.user_id == user_id)
+    if since is not None:
+        stmt = stmt.where(WeeklySummary.week_start >= week_bounds(since)[0])
+    return {(uid, ws): _loads(text) for uid, ws, text in db.execute(stmt)}
+
+
+def backfill(db: Session, user_id: Optional[int] = None, since: Optional[date] = None) -> int:
+    """재집계 결과로 주간 요약을 덮어쓴다. 저장한 (user, 주) 수 반환. commit은 호출한 쪽에서."""
+    by_user: Dict[int, Dict[date, Totals]] = defaultdict(dict)
+    for (uid, week_start), totals in _recompute(db, user_id, since).items():
+        by_user[uid][week_start] = totals
+    for uid, weeks in by_user.items():
+        _save(db, uid, weeks, merge=False)
+    return sum(len(w) for w in by_user.values())
+
+
+def check(db: Session, user_id: Optional[int] = None, since: Optional[date] = None) -> List[dict]:
+    """저장된 요약과 전체 재집계가 다른 (user, 주) 목록"""
+    expected = _recompute(db, user_id, since)
+    stored = _stored(db, user_id, since)
+    mismatches = []
+    for key in sorted(set(expected) | set(stored), key=lambda k: (k[0], k[1])):
+        if expected.get(key, {}) != stored.get(key, {}):
+            mismatches.append({
+                "user_id": key[0],
+                "week_start": key[1].isoformat(),
+                "expected": expected.get(key),
+                "stored": stored.get(key),
+            })
+    return mismatches
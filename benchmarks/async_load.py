@@ -0,0 +1,145 @@
+"""
+동시 접속 부하 벤치마크: sync def + Session vs async def + AsyncSession
+
+같은 쿼리(/records/my-monthly-settlement 와 동일한 집계)를 두 방식의 엔드포인트로 띄우고,
+httpx ASGI transport로 수천 개 요청을 한꺼번에 보내 처리량과 지연 분포를 비교한다.
+sync 경로는 Starlette 스레드풀(기본 40개)을 기다리며 줄을 서고, async 경로는 그렇지 않다.
+
+실행:
+    python -m benchmarks.async_load --clients 2000 --rounds 3
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+
+def _setup_db(tmp: str) -> str:
+    # app 모듈을 import하기 전에 DB 경로를 임시 파일로 지정
+    url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+    os.environ["DATABASE_URL"] = url
+    return url
+
+
+def _seed(engine, users: int, days: int) -> None:
+    import app.models  # noqa: F401
+    from app.core.database import Base
+    from app.models.record import StudyRecord
+
+    Base.metadata.create_all(engine)
+    today = date.today()
+    rows = []
+    for user_id in range(1, users + 1):
+        for d in range(days):
+            rows.append({
+                "user_id": user_id,
+                "subject_id": 1 + d % 5,
+                "record_date": today - timedelta(days=d),
+                "target_minutes": 60,
+                "target_pages": 10,
+                "actual_minutes": 50,
+                "actual_pages": 9,
+                "status": "O" if d % 3 else "X",
+                "fine": 0 if d % 3 else 1000,
+                "created_at": datetime.utcnow() - timedelta(days=d),
+            })
+    with engine.begin() as conn:
+        conn.execute(StudyRecord.__table__.insert(), rows)
+
+
+def _build_app():
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import func, select
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import Session
+
+    from app.core.database import get_async_db, get_db
+    from app.models.record import StudyRecord
+
+    def _stmt(user_id: int):
+        start_of_month = datetime(datetime.now().year, datetime.now().month, 1)
+        return select(StudyRecord.status, func.count(StudyRecord.id), func.sum(StudyRecord.fine)).where(
+            StudyRecord.user_id == user_id,
+            StudyRecord.created_at >= start_of_month,
+        ).group_by(StudyRecord.status)
+
+    bench = FastAPI()
+
+    @bench.get("/sync/{user_id}")
+    def sync_settlement(user_id: int, db: Session = Depends(get_db)):
+        return {"rows": len(db.execute(_stmt(user_id)).all())}
+
+    @bench.get("/async/{user_id}")
+    async def async_settlement(user_id: int, db: AsyncSession = Depends(get_async_db)):
+        return {"rows": len((await db.execute(_stmt(user_id))).all())}
+
+    return bench
+
+
+async def _drive(bench, mode: str, clients: int, users: int) -> dict:
+    import httpx
+
+    latencies = []
+    errors = 0
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=bench), base_url="http://bench") as client:
+        async def one(i: int):
+            nonlocal errors
+            start = time.perf_counter()
+            try:
+                res = await client.get(f"/{mode}/{1 + i % users}")
+                res.raise_for_status()
+            except Exception:
+                errors += 1
+                return
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(clients)))
+        wall = time.perf_counter() - start
+
+    q = statistics.quantiles(latencies, n=100) if len(latencies) >= 2 else [0.0] * 99
+    return {
+        "mode": mode,
+        "clients": clients,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 1),
+        "p50_ms": round(q[49], 2),
+        "p95_ms": round(q[94], 2),
+        "p99_ms": round(q[98], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=2000, help="동시에 보내는 요청 수")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _setup_db(tmp)
+        from app.core.database import async_engine, engine
+
+        _seed(engine, args.users, args.days)
+        bench = _build_app()
+
+        # async 커넥션 풀은 이벤트 루프에 묶이므로 모든 라운드를 한 루프에서 실행
+        async def run_all():
+            for r in range(1, args.rounds + 1):
+                for mode in ("sync", "async"):
+                    result = await _drive(bench, mode, args.clients, args.users)
+                    print(f"round {r} {result}")
+            await async_engine.dispose()
+
+        asyncio.run(run_all())
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+하루 목표 배치 벤치마크: 유저마다 calculate_daily_goal 호출(루프) vs plan_daily_goals(NumPy 배치)
+
+/ai/daily-goal 핸들러를 직접 호출한다 (HTTP/pydantic 파싱 비용 제외).
+pace는 임시 SQLite DB의 공용 pace(user_id=None)를 쓰고, 두 방식의 결과가 같은지도 확인한다.
+
+실행:
+    python -m benchmarks.daily_goal_batch --users 10000 --subjects 6 --rounds 5
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+# 앱 모듈을 import하기 전에 임시 DB로 바꿔둠 (실제 study.db를 건드리지 않도록)
+_tmpdir = tempfile.mkdtemp(prefix="daily_goal_batch_")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_tmpdir) / 'bench.db'}"
+
+from app.core.database import engine  # noqa: E402
+from app.migrations import upgrade  # noqa: E402
+from app.services.pace_store import pace_store  # noqa: E402
+import ai.study_goal as sg  # noqa: E402
+
+NAMES = ["국어", "수학", "영어", "한국사", "물리", "화학", "생명과학", "지구과학", "경제", "선형대수학"]
+
+
+def _make_items(users: int, subjects: int, seed: int):
+    rnd = random.Random(seed)
+    items = []
+    for _ in range(users):
+        n = rnd.randint(1, subjects)
+        items.append(sg.DailyGoalBatchItem.model_construct(
+            user_id=None,
+            total_minutes=rnd.randint(60, 480),
+            subjects=[
+                sg.SubjectInput.model_construct(
+                    name=name,
+                    importance=rnd.randint(1, 5),
+                    difficulty=rnd.randint(1, 5),
+                    total_pages=rnd.randint(1, 800),
+                )
+                for name in rnd.sample(NAMES, n)
+            ],
+        ))
+    return items
+
+
+def _seed_paces(seed: int) -> None:
+    rnd = random.Random(seed)
+    pace_store.set_many(None, {name: round(rnd.uniform(0.6, 1.5), 2) for name in NAMES})
+
+
+def _loop(items):
+    return [
+        {"user_id": item.user_id, **sg.calculate_daily_goal(item).model_dump()}
+        for item in items
+    ]
+
+
+def _measure(fn, items, rounds: int) -> dict:
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(items)
+        times.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(times), 1), "min_ms": round(min(times), 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--subjects", type=int, default=6, help="유저당 최대 과목 수")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    upgrade(engine)
+    _seed_paces(args.seed)
+    items = _make_items(args.users, min(args.subjects, len(NAMES)), args.seed)
+
+    same = _loop(items) == sg.plan_daily_goals(items)
+    total_subjects = sum(len(item.subjects) for item in items)
+    print(f"users={args.users} subjects={total_subjects} identical_output={same}")
+    print("loop ", _measure(_loop, items, args.rounds))
+    print("batch", _measure(sg.plan_daily_goals, items, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
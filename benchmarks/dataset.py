@@ -0,0 +1,229 @@
+"""
+벤치마크용 가상 데이터 생성기 (SQLite / Postgres)
+
+빈 DB에 유저 N명과 스터디 / 멤버 / 과목 / 몇 달치 study_records를 실제와 비슷한 분포로 채운다.
+- 유저마다 활동량이 다름 (매일 하는 유저 ~ 가끔 하는 유저, 중간에 가입한 유저)
+- 스터디 크기는 한쪽으로 치우침 (대부분 소규모, 일부 대형 스터디). 유저는 1~3개 스터디에 가입
+- 과목 2~7개, 난이도는 보통(3) 근처에 몰림. 유저·과목마다 실제 속도(pace)가 달라 달성률이 갈림
+- 기록은 어제까지 (오늘 목표는 벤치마크에서 /study-goal/calculate로 만든다)
+- 멤버가 그 스터디 과목에 제출한 기록이 없는 날은 결석(study_absences, 스터디 벌금)
+넣은 뒤 롤업(daily_stats / 랭킹 / 주간 요약)과 pace를 이력으로 다시 계산한다.
+
+실수로 운영 DB를 채우지 않도록 users 테이블이 비어 있을 때만 실행된다.
+
+실행:
+    python -m benchmarks.dataset --database-url sqlite:///./bench.db --users 2000 --months 3
+    python -m benchmarks.dataset --database-url postgresql://user:pw@localhost/bench --users 20000 --months 6
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+SUBJECT_NAMES = [
+    "국어", "수학", "영어", "한국사", "물리", "화학", "생명과학", "지구과학", "경제", "선형대수학",
+    "미적분", "확률과 통계", "자료구조", "알고리즘", "운영체제", "데이터베이스", "회계원리", "민법", "행정법", "토익",
+]
+PAGES_PER_MINUTE = {1: 13 / 60, 2: 11 / 60, 3: 9 / 60, 4: 8 / 60, 5: 7 / 60}
+FINES = [0, 500, 1000, 1000, 2000, 3000, 5000]
+CHUNK = 5000
+
+
+def _study_sizes_weights(n_studies: int):
+    # 지프 분포 비슷하게: 앞쪽 스터디일수록 인기가 많음 (가입 확률 ∝ 1 / 순위^0.8)
+    return [1 / (rank + 1) ** 0.8 for rank in range(n_studies)]
+
+
+def _chunks(rows, size: int = CHUNK):
+    for i in range(0, len(rows), size):
+        yield rows[i : i + size]
+
+
+def generate(db, users: int, months: int, seed: int = 42, end: Optional[date] = None, log=print) -> Dict[str, int]:
+    """
+    db(Session)에 데이터를 넣고 commit한다. end(기본: 오늘) 전날까지 months개월치 기록.
+    반환: 테이블별 생성 건수
+    """
+    from sqlalchemy import func, insert, select
+
+    from app.models import Study, StudyAbsence, StudyMember, StudyRecord, Subject, User
+    from app.services import daily_stats, pace_replay, ranking, weekly_summary
+
+    if db.execute(select(func.count(User.id))).scalar():
+        raise RuntimeError("users 테이블이 비어 있지 않습니다. 빈 DB에만 생성합니다.")
+
+    rnd = random.Random(seed)
+    end = end or date.today()
+    days = months * 30
+    first_day = end - timedelta(days=days)
+    counts: Dict[str, int] = {}
+    t0 = time.perf_counter()
+
+    # --- 유저 ---
+    db.execute(insert(User), [
+        {"email": f"bench{i}@example.com", "name": f"유저{i}", "provider": "google",
+         "created_at": datetime.combine(first_day, datetime.min.time())}
+        for i in range(1, users + 1)
+    ])
+    user_ids = [uid for (uid,) in db.execute(select(User.id).order_by(User.id))]
+    counts["users"] = len(user_ids)
+
+    # --- 스터디 / 멤버 ---
+    n_studies = max(1, users // 8)
+    db.execute(insert(Study), [
+        {"name": f"벤치 스터디 {k}", "description": "synthetic", "fine_per_absence": rnd.choice(FINES)}
+        for k in range(1, n_studies + 1)
+    ])
+    studies = {name: (sid, fine) for sid, name, fine in db.execute(select(Study.id, Study.name, Study.fine_per_absence))}
+    study_list = [studies[f"벤치 스터디 {k}"] for k in range(1, n_studies + 1)]
+    weights = _study_sizes_weights(n_studies)
+
+    members, joined = [], {}
+    for uid in user_ids:
+        n_join = min(n_studies, 1 + (rnd.random() < 0.3) + (rnd.random() < 0.1))
+        chosen = set()
+        while len(chosen) < n_join:
+            chosen.add(rnd.choices(range(n_studies), weights)[0])
+        joined[uid] = [study_list[k] for k in sorted(chosen)]
+    owners = set()
+    for uid in user_ids:
+        for sid, _ in joined[uid]:
+            role = "owner" if sid not in owners else "member"
+            owners.add(sid)
+            members.append({"study_id": sid, "user_id": uid, "role": role,
+                            "joined_at": datetime.combine(first_day, datetime.min.time())})
+    for rows in _chunks(members):
+        db.execute(insert(StudyMember), rows)
+    counts["studies"] = n_studies
+    counts["study_members"] = len(members)
+
+    # --- 과목 ---
+    subjects = []
+    for uid in user_ids:
+        n_subj = rnd.choices([2, 3, 4, 5, 6, 7], [10, 25, 30, 20, 10, 5])[0]
+        for name in rnd.sample(SUBJECT_NAMES, n_subj):
+            subjects.append({
+                "user_id": uid,
+                "study_id": rnd.choice(joined[uid])[0],
+                "name": name,
+                "importance": rnd.randint(1, 5),
+                "difficulty": min(5, max(1, round(rnd.triangular(1, 5, 3)))),
+                "total_pages": rnd.randint(15, 80) * 10,
+            })
+    for rows in _chunks(subjects):
+        db.execute(insert(Subject), rows)
+    subject_ids = {(uid, name): sid for sid, uid, name in db.execute(select(Subject.id, Subject.user_id, Subject.name))}
+    counts["subjects"] = len(subjects)
+    log(f"  유저/스터디/과목 완료 ({time.perf_counter() - t0:.1f}s)")
+
+    # --- 기록 ---
+    fines = {sid: fine for sid, fine in study_list}
+    attended = set()  # (study_id, user_id, 날짜): 제출한 기록이 있는 날
+    by_user: Dict[int, list] = {}
+    for s in subjects:
+        by_user.setdefault(s["user_id"], []).append(s)
+
+    n_records = 0
+    batch = []
+    for uid in user_ids:
+        # 활동량: 베타 분포(평균 0.5 정도), 일부는 기간 중간에 시작
+        p_active = rnd.betavariate(2, 2)
+        start_offset = 0 if rnd.random() < 0.7 else rnd.randint(0, days - 1)
+        daily_minutes = rnd.choice([60, 90, 120, 180, 240, 300])
+        subj = by_user[uid]
+        paces = [math.exp(rnd.gauss(0, 0.25)) for _ in subj]
+        for d in range(start_offset, days):
+            if rnd.random() > p_active:
+                continue
+            day = first_day + timedelta(days=d)
+            picked = rnd.sample(range(len(subj)), rnd.randint(1, len(subj)))
+            weight_sum = sum(subj[i]["importance"] for i in picked)
+            for i in picked:
+                s = subj[i]
+                target_minutes = max(10, round(daily_minutes * s["importance"] / weight_sum))
+                target_pages = max(1, round(target_minutes * PAGES_PER_MINUTE[s["difficulty"]]))
+                if rnd.random() < 0.08:  # 목표만 세우고 안 함 → 마감 때 X(목표 미달) 처리된 기록
+                    actual_minutes, actual_pages, status = 0, 0, "X"
+                else:
+                    attended.add((s["study_id"], uid, day))
+                    actual_minutes = max(1, round(target_minutes * rnd.uniform(0.9, 1.3)))
+                    actual_pages = max(0, round(actual_minutes * PAGES_PER_MINUTE[s["difficulty"]] * paces[i]
+                                                * rnd.uniform(0.8, 1.2)))
+                    status = "O" if actual_pages >= target_pages else "X"
+                batch.append({
+                    "user_id": uid,
+                    "subject_id": subject_ids[(uid, s["name"])],
+                    "record_date": day,
+                    "target_minutes": target_minutes,
+                    "target_pages": target_pages,
+                    "actual_minutes": actual_minutes,
+                    "actual_pages": actual_pages,
+                    "status": status,
+                    "created_at": datetime.combine(day, datetime.min.time()) + timedelta(hours=rnd.randint(6, 23)),
+                })
+            if len(batch) >= CHUNK:
+                db.execute(insert(StudyRecord), batch)
+                n_records += len(batch)
+                batch = []
+    if batch:
+        db.execute(insert(StudyRecord), batch)
+        n_records += len(batch)
+    counts["study_records"] = n_records
+
+    # --- 결석 ---
+    absences = [
+        {"study_id": sid, "user_id": uid, "absence_date": day, "fine": fines[sid]}
+        for uid in user_ids
+        for sid, _ in joined[uid]
+        for day in (first_day + timedelta(days=d) for d in range(days))
+        if (sid, uid, day) not in attended
+    ]
+    for rows in _chunks(absences):
+        db.execute(insert(StudyAbsence), rows)
+    counts["study_absences"] = len(absences)
+    db.commit()
+    log(f"  기록 {n_records}건 / 결석 {len(absences)}건 완료 ({time.perf_counter() - t0:.1f}s)")
+
+    # --- 파생 테이블 ---
+    daily_stats.rebuild(db)
+    ranking.rebuild(db)
+    counts["weekly_summaries"] = weekly_summary.backfill(db)
+    counts["subject_paces"] = pace_replay.replay(db)["series"]
+    db.commit()
+    log(f"  롤업/pace 재계산 완료 ({time.perf_counter() - t0:.1f}s)")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="기본: DATABASE_URL 환경 변수 / settings")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--months", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # app 모듈을 import하기 전에 대상 DB를 지정
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from app.core.database import SessionLocal, engine
+    from app.migrations import upgrade
+
+    upgrade(engine)
+    with SessionLocal() as db:
+        try:
+            counts = generate(db, args.users, args.months, seed=args.seed, log=lambda m: print(m, file=sys.stderr))
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 1
+    print(json.dumps(counts, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+DB 엔진 벤치마크: 기본 SQLite 엔진 vs settings 기반 튜닝 엔진(WAL + busy_timeout + pool)
+
+아침 시간대처럼 /study-goal/calculate(INSERT 여러 건)와
+/study-goal/complete-records(UPDATE 여러 건) + 조회가 동시에 몰리는 상황을 흉내낸다.
+
+실행:
+    python -m benchmarks.db_engine --workers 16 --ops 200
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+from app.core.database import build_engine
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bench_records (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    subject_id INTEGER NOT NULL,
+    record_date DATE NOT NULL,
+    target_minutes INTEGER,
+    target_pages INTEGER,
+    actual_minutes INTEGER,
+    actual_pages INTEGER,
+    status TEXT
+)
+"""
+
+
+def _calculate(conn, user_id: int):
+    rows = [
+        {
+            "u": user_id, "s": s, "d": date.today(),
+            "tm": random.randint(10, 90), "tp": random.randint(1, 30),
+        }
+        for s in range(1, 11)
+    ]
+    conn.execute(
+        text(
+            "INSERT INTO bench_records(user_id, subject_id, record_date, target_minutes, target_pages, "
+            "actual_minutes, actual_pages, status) VALUES (:u, :s, :d, :tm, :tp, 0, 0, 'PENDING')"
+        ),
+        rows,
+    )
+
+
+def _complete(conn, user_id: int):
+    conn.execute(
+        text(
+            "UPDATE bench_records SET actual_minutes = 30, actual_pages = 10, status = 'O' "
+            "WHERE user_id = :u AND status = 'PENDING'"
+        ),
+        {"u": user_id},
+    )
+
+
+def _read(conn, user_id: int):
+    conn.execute(
+        text("SELECT subject_id, SUM(actual_minutes) FROM bench_records WHERE user_id = :u GROUP BY subject_id"),
+        {"u": user_id},
+    ).all()
+
+
+def run(engine, workers: int, ops: int) -> dict:
+    with engine.begin() as conn:
+        conn.execute(text(SCHEMA))
+
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i: int):
+        nonlocal errors
+        user_id = i % 500
+        op = random.choice((_calculate, _complete, _read, _read))
+        start = time.perf_counter()
+        try:
+            with engine.begin() as conn:
+                op(conn, user_id)
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(one, range(workers * ops)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    q = statistics.quantiles(latencies, n=100) if len(latencies) >= 2 else [0.0] * 99
+    return {
+        "ops": len(latencies),
+        "errors": errors,
+        "throughput_ops_s": round(len(latencies) / wall, 1),
+        "p50_ms": round(q[49], 2),
+        "p95_ms": round(q[94], 2),
+        "p99_ms": round(q[98], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=200, help="worker당 작업 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline_url = f"sqlite:///{Path(tmp) / 'baseline.db'}"
+        tuned_url = f"sqlite:///{Path(tmp) / 'tuned.db'}"
+
+        # 기존 app/core/database.py 설정 그대로
+        baseline = create_engine(baseline_url, connect_args={"check_same_thread": False})
+        tuned = build_engine(tuned_url)
+
+        for name, eng in (("baseline", baseline), ("tuned", tuned)):
+            result = run(eng, args.workers, args.ops)
+            eng.dispose()
+            print(f"{name:>8}: {result}")
+
+
+if __name__ == "__main__":
+    main()
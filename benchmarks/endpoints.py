@@ -0,0 +1,378 @@
+"""
+엔드포인트 벤치마크: 앱(app.main)과 AI 서비스(ai.study_goal)를 프로세스 안에서 직접 띄워 부하를 건다.
+
+httpx ASGI transport로 요청을 보내고(네트워크 / uvicorn 비용 제외), 동시 요청 수(--concurrency)만큼
+워커가 요청을 계속 꺼내 보낸다. 엔드포인트마다 처리량(req/s)과 p50/p95/p99 지연을 재고 JSON으로 저장한다.
+
+데이터:
+- --database-url을 주면 그 DB(benchmarks.dataset으로 만든 DB)를 그대로 사용
+- 없으면 임시 SQLite에 benchmarks.dataset으로 --users / --months 만큼 만들어서 사용
+요청은 유저를 돌아가며 보낸다. complete-records는 바로 앞의 calculate가 만든 오늘 목표를 완료하므로
+두 시나리오는 같이 돌리고, --requests ≤ 유저 수여야 모든 요청이 실제로 목표를 완료한다.
+
+실행:
+    python -m benchmarks.endpoints --users 2000 --requests 500 --concurrency 32 --out bench.json
+    python -m benchmarks.endpoints --database-url sqlite:///./bench.db --out after.json --compare bench.json
+    python -m benchmarks.endpoints --only calculate,complete-records
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+
+class Scenario(NamedTuple):
+    name: str
+    service: str  # "app" | "ai"
+    method: str
+    # (유저 정보, 요청 번호) → (경로, JSON 본문 또는 None)
+    build: Callable[[dict, int], tuple]
+
+
+def _calculate(u, i):
+    return "/study-goal/calculate", {
+        "total_minutes": u["daily_minutes"],
+        "subjects": [{"subject_id": s["id"], "difficulty": s["difficulty"]} for s in u["subjects"]],
+    }
+
+
+def _complete(u, i):
+    return "/study-goal/complete-records", {
+        "records": [
+            {"subject_id": s["id"], "actual_minutes": 40 + (i + k) % 30, "actual_pages": 5 + (i + k) % 7}
+            for k, s in enumerate(u["subjects"])
+        ],
+    }
+
+
+def _ai_daily_goal(u, i):
+    return "/ai/daily-goal", {
+        "total_minutes": u["daily_minutes"],
+        "subjects": [
+            {"name": s["name"], "importance": s["importance"], "difficulty": s["difficulty"], "total_pages": s["total_pages"]}
+            for s in u["subjects"]
+        ],
+    }
+
+
+def _ai_daily_goal_batch(users):
+    # 100명씩 묶어서 한 요청
+    def build(u, i):
+        items = []
+        for k in range(100):
+            other = users[(i * 100 + k) % len(users)]
+            _, body = _ai_daily_goal(other, i)
+            items.append({"user_id": other["id"], **body})
+        return "/ai/daily-goal/batch", {"items": items}
+    return build
+
+
+def _ai_adjust_batch(u, i):
+    return "/ai/adjust-difficulty/batch", {
+        "subjects": [
+            {"subject_name": s["name"], "current_difficulty": s["difficulty"], "recent_records": s["recent"]}
+            for s in u["subjects"] if s["recent"]
+        ] or [{"subject_name": u["subjects"][0]["name"], "current_difficulty": 3,
+               "recent_records": [{"target_minutes": 60, "target_pages": 9, "actual_minutes": 60, "actual_pages": 9}]}],
+    }
+
+
+def _ai_weekly_summary(u, i):
+    return "/ai/weekly-summary", {"records": u["week_records"] or [{
+        "record_date": str(date.today() - timedelta(days=1)), "subject_name": u["subjects"][0]["name"],
+        "target_minutes": 60, "target_pages": 9, "actual_minutes": 60, "actual_pages": 9,
+    }]}
+
+
+def scenarios(users: List[dict]) -> List[Scenario]:
+    today = date.today()
+    month_ago = today - timedelta(days=30)
+    return [
+        Scenario("calculate", "app", "POST", _calculate),
+        Scenario("complete-records", "app", "POST", _complete),
+        Scenario("weekly-summary", "app", "GET", lambda u, i: ("/ai/weekly-summary", None)),
+        Scenario("weekly-summary-range", "app", "GET",
+                 lambda u, i: (f"/ai/weekly-summary?start={month_ago}&end={today}", None)),
+        Scenario("analytics", "app", "GET",
+                 lambda u, i: (f"/ai/analytics?start={month_ago}&end={today}&group_by=week", None)),
+        Scenario("monthly-settlement", "app", "GET", lambda u, i: ("/records/my-monthly-settlement", None)),
+        Scenario("studies-list", "app", "GET", lambda u, i: ("/studies/list", None)),
+        Scenario("ai-daily-goal", "ai", "POST", _ai_daily_goal),
+        Scenario("ai-daily-goal-batch-100", "ai", "POST", _ai_daily_goal_batch(users)),
+        Scenario("ai-adjust-difficulty-batch", "ai", "POST", _ai_adjust_batch),
+        Scenario("ai-weekly-summary", "ai", "POST", _ai_weekly_summary),
+    ]
+
+
+# =====================
+# 데이터 준비
+# =====================
+def _load_users(limit: int, seed: int) -> List[dict]:
+    """요청에 쓸 유저(과목이 있는 유저) + 토큰 + 최근 기록"""
+    import random
+
+    from sqlalchemy import select
+
+    from app.core.database import SessionLocal
+    from app.core.security import create_access_token
+    from app.models import StudyRecord, Subject
+
+    today = date.today()
+    with SessionLocal() as db:
+        ids = sorted({uid for (uid,) in db.execute(select(Subject.user_id).distinct())})
+        random.Random(seed).shuffle(ids)
+        ids = ids[:limit]
+        subjects: Dict[int, list] = {}
+        for s in db.execute(select(Subject).where(Subject.user_id.in_(ids)).order_by(Subject.id)).scalars():
+            subjects.setdefault(s.user_id, []).append({
+                "id": s.id, "name": s.name, "importance": s.importance or 3,
+                "difficulty": s.difficulty or 3, "total_pages": max(1, s.total_pages or 1), "recent": [],
+            })
+        by_id = {s["id"]: s for rows in subjects.values() for s in rows}
+        week = {uid: [] for uid in ids}
+        records = db.execute(
+            select(StudyRecord)
+            .where(StudyRecord.user_id.in_(ids), StudyRecord.record_date >= today - timedelta(days=14),
+                   StudyRecord.status != "PENDING")
+            .order_by(StudyRecord.record_date)
+        ).scalars()
+        for r in records:
+            s = by_id.get(r.subject_id)
+            if s is None:
+                continue
+            s["recent"] = (s["recent"] + [{
+                "target_minutes": r.target_minutes, "target_pages": r.target_pages,
+                "actual_minutes": r.actual_minutes, "actual_pages": r.actual_pages,
+            }])[-7:]
+            if r.record_date >= today - timedelta(days=7) and r.actual_minutes > 0:
+                week[r.user_id].append({
+                    "record_date": str(r.record_date), "subject_name": s["name"],
+                    "target_minutes": r.target_minutes, "target_pages": r.target_pages,
+                    "actual_minutes": r.actual_minutes, "actual_pages": r.actual_pages,
+                })
+
+    return [
+        {
+            "id": uid,
+            "token": create_access_token({"user_id": uid}),
+            "daily_minutes": 60 + (uid * 37) % 240,
+            "subjects": subjects[uid],
+            "week_records": week[uid],
+        }
+        for uid in ids
+    ]
+
+
+# =====================
+# 부하 실행
+# =====================
+def _percentile(q: List[float], p: int) -> float:
+    return round(q[p - 1], 2) if q else 0.0
+
+
+async def _drive(client, scenario: Scenario, users: List[dict], requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            user = users[i % len(users)]
+            path, body = scenario.build(user, i)
+            headers = {"Authorization": f"Bearer {user['token']}"}
+            start = time.perf_counter()
+            try:
+                res = await client.request(scenario.method, path, json=body, headers=headers)
+                code = str(res.status_code)
+            except Exception as e:
+                code = type(e).__name__
+            elapsed = (time.perf_counter() - start) * 1000
+            statuses[code] = statuses.get(code, 0) + 1
+            if code.startswith("2"):
+                latencies.append(elapsed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    q = statistics.quantiles(latencies, n=100) if len(latencies) >= 2 else []
+    return {
+        "name": scenario.name,
+        "service": scenario.service,
+        "method": scenario.method,
+        "path": scenario.build(users[0], 0)[0].split("?")[0],
+        "requests": requests,
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "errors": requests - len(latencies),
+        "statuses": statuses,
+        "throughput_rps": round(len(latencies) / wall, 1) if wall > 0 else 0.0,
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "p50_ms": _percentile(q, 50),
+        "p95_ms": _percentile(q, 95),
+        "p99_ms": _percentile(q, 99),
+        "max_ms": round(max(latencies), 2) if latencies else 0.0,
+    }
+
+
+async def run_suite(selected: List[Scenario], users: List[dict], requests: int, concurrency: int, warmup: int) -> List[dict]:
+    import httpx
+
+    from ai.study_goal import app as ai_app
+    from app.core.database import async_engine
+    from app.main import app
+
+    clients = {
+        "app": httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app"),
+        "ai": httpx.AsyncClient(transport=httpx.ASGITransport(app=ai_app), base_url="http://ai"),
+    }
+    results = []
+    try:
+        for scenario in selected:
+            client = clients[scenario.service]
+            # 시나리오마다 같은 유저 순서 → complete-records는 calculate가 만든 목표를 완료
+            # (이 둘은 웜업 요청이 목표를 바꿔버리므로 웜업 없이)
+            if warmup and scenario.name not in ("calculate", "complete-records"):
+                await _drive(client, scenario, users, warmup, concurrency)
+            result = await _drive(client, scenario, users, requests, concurrency)
+            results.append(result)
+            print(_format(result), file=sys.stderr)
+    finally:
+        for client in clients.values():
+            await client.aclose()
+        # async 커넥션 풀은 이벤트 루프에 묶이므로 같은 루프에서 정리
+        await async_engine.dispose()
+    return results
+
+
+# =====================
+# 출력 / 비교
+# =====================
+def _format(r: dict) -> str:
+    return (
+        f"{r['name']:<28} {r['throughput_rps']:>8.1f} req/s  p50 {r['p50_ms']:>7.2f}  p95 {r['p95_ms']:>7.2f}"
+        f"  p99 {r['p99_ms']:>7.2f} ms  errors {r['errors']}"
+    )
+
+
+def _compare(results: List[dict], baseline_path: str) -> None:
+    baseline = {r["name"]: r for r in json.loads(Path(baseline_path).read_text(encoding="utf-8"))["results"]}
+    print(f"\n비교 기준: {baseline_path}  (변화율: 처리량은 +가 좋음, 지연은 -가 좋음)")
+    for r in results:
+        old = baseline.get(r["name"])
+        if old is None:
+            continue
+        cells = []
+        for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            before, after = old[key], r[key]
+            change = (after - before) / before * 100 if before else 0.0
+            cells.append(f"{key.split('_')[0]} {before}→{after} ({change:+.1f}%)")
+        print(f"{r['name']:<28} " + "  ".join(cells))
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="benchmarks.dataset으로 만든 DB (없으면 임시 SQLite 생성)")
+    parser.add_argument("--users", type=int, default=1000, help="임시 DB를 만들 때 유저 수")
+    parser.add_argument("--months", type=int, default=3, help="임시 DB를 만들 때 기록 기간")
+    parser.add_argument("--requests", type=int, default=500, help="엔드포인트마다 보내는 요청 수")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시에 처리 중인 요청 수")
+    parser.add_argument("--warmup", type=int, default=20, help="측정 전에 버리는 요청 수 (조회 엔드포인트만)")
+    parser.add_argument("--only", default=None, help="쉼표로 구분한 시나리오 이름")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", default=None, help="이전 결과 JSON과 비교")
+    args = parser.parse_args()
+
+    # app 모듈을 import하기 전에 DB를 지정 (실제 study.db를 건드리지 않도록)
+    tmpdir = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        tmpdir = tempfile.TemporaryDirectory(prefix="bench_endpoints_")
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmpdir.name) / 'bench.db'}"
+
+    from app.core.database import SessionLocal, engine
+    from app.migrations import upgrade
+    from benchmarks import dataset
+
+    upgrade(engine)
+    dataset_info = None
+    if tmpdir is not None:
+        print(f"임시 DB 생성: 유저 {args.users}명, {args.months}개월", file=sys.stderr)
+        with SessionLocal() as db:
+            dataset_info = dataset.generate(db, args.users, args.months, seed=args.seed,
+                                            log=lambda m: print(m, file=sys.stderr))
+
+    users = _load_users(max(args.requests, 100), args.seed)
+    if not users:
+        print("과목이 있는 유저가 없습니다. benchmarks.dataset으로 먼저 데이터를 만드세요.", file=sys.stderr)
+        return 1
+    if len(users) < args.requests:
+        print(f"주의: 유저 {len(users)}명 < 요청 {args.requests}개 → complete-records 일부는 완료할 목표가 없음",
+              file=sys.stderr)
+
+    selected = scenarios(users)
+    if args.only:
+        names = set(args.only.split(","))
+        unknown = names - {s.name for s in selected}
+        if unknown:
+            print(f"알 수 없는 시나리오: {', '.join(sorted(unknown))}", file=sys.stderr)
+            return 1
+        selected = [s for s in selected if s.name in names]
+        if "complete-records" in names and "calculate" not in names:
+            print("주의: calculate 없이 complete-records만 돌리면 완료할 오늘 목표가 없어 빈 응답을 잽니다.", file=sys.stderr)
+
+    results = asyncio.run(run_suite(selected, users, args.requests, args.concurrency, args.warmup))
+    engine.dispose()
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "database": engine.url.get_backend_name(),
+            "dataset": dataset_info,
+            "users_in_rotation": len(users),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"저장: {args.out}", file=sys.stderr)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.compare:
+        _compare(results, args.compare)
+    if tmpdir is not None:
+        tmpdir.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+시험 일정 계획 벤치마크: app.services.exam_schedule.plan_schedule (DB 접근 없음)
+
+무작위 과목/시험 날짜/요일별 시간으로 계획을 만들고 시간을 잰다.
+매 케이스마다 결과도 검사한다:
+- 하루 배분 합 ≤ 그날 시간, 시험 날짜 이후 배분 없음, 과목별 페이지 합 = 남은 페이지 - 부족분
+- EDF 조건(마감일 t까지의 필요량 ≤ t까지의 시간)을 만족하는 케이스는 부족분 0 (feasible)
+
+실행:
+    python -m benchmarks.exam_schedule --days 90 --subjects 15 --cases 200
+"""
+import argparse
+import math
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from app.services.exam_schedule import ExamSubject, _last_study_day, pages_per_minute, plan_schedule
+
+
+def _make_case(rnd: random.Random, start: date, days: int, subjects: int, load: float):
+    weekday = [rnd.choice([60, 120, 180, 240]) for _ in range(7)]
+    capacity = [0 if rnd.random() < 0.05 else weekday[(start + timedelta(days=d)).weekday()] for d in range(days)]
+    items = []
+    for i in range(subjects):
+        exam = start + timedelta(days=rnd.randint(days // 4, days))
+        items.append(ExamSubject(
+            subject_id=i + 1,
+            name=f"과목{i}",
+            remaining_pages=0,
+            difficulty=rnd.randint(1, 5),
+            pace=round(rnd.uniform(0.6, 1.5), 2),
+            exam_date=exam,
+            importance=rnd.randint(1, 5),
+        ))
+    # 전체 시간의 load배 만큼 공부량을 나눠줌 (load > 1이면 시간이 모자란 케이스)
+    budget = sum(capacity) * load / subjects
+    items = [s._replace(remaining_pages=max(1, int(budget * rnd.uniform(0.3, 1.7) * pages_per_minute(s)))) for s in items]
+    return capacity, items
+
+
+def _edf_feasible(start: date, capacity, subjects) -> bool:
+    deadlines = [_last_study_day(s, start, len(capacity), False) for s in subjects]
+    work = [math.ceil(s.remaining_pages / pages_per_minute(s) - 1e-9) for s in subjects]
+    for t in sorted(set(deadlines)):
+        need = sum(w for w, dl in zip(work, deadlines) if dl <= t)
+        if t < 0 or need > sum(capacity[: t + 1]):
+            return False
+    return True
+
+
+def _validate(start: date, capacity, subjects, plan) -> None:
+    by_id = {s.subject_id: s for s in subjects}
+    pages = {s.subject_id: 0 for s in subjects}
+    for d, day in enumerate(plan["days"]):
+        assert sum(g["minutes"] for g in day["goals"]) + day["free_minutes"] == capacity[d]
+        for g in day["goals"]:
+            assert day["date"] < by_id[g["subject_id"]].exam_date
+            pages[g["subject_id"]] += g["pages"]
+    for row in plan["subjects"]:
+        assert pages[row["subject_id"]] == row["planned_pages"] == row["remaining_pages"] - row["shortfall_pages"]
+    # 반대 방향은 성립 안 할 수 있음: 1분 모자라도 페이지 반올림으로 다 채워지는 경우
+    if _edf_feasible(start, capacity, subjects):
+        assert plan["feasible"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--subjects", type=int, default=15)
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    start = date.today()
+    times, feasible = [], 0
+    for k in range(args.cases):
+        capacity, subjects = _make_case(rnd, start, args.days, args.subjects, load=rnd.uniform(0.5, 1.3))
+        t0 = time.perf_counter()
+        plan = plan_schedule(start, capacity, subjects)
+        times.append((time.perf_counter() - t0) * 1000)
+        _validate(start, capacity, subjects, plan)
+        feasible += plan["feasible"]
+
+    times.sort()
+    print(f"days={args.days} subjects={args.subjects} cases={args.cases} feasible={feasible} checks=ok")
+    print({
+        "median_ms": round(statistics.median(times), 2),
+        "p95_ms": round(times[int(len(times) * 0.95) - 1], 2),
+        "max_ms": round(times[-1], 2),
+    })
+
+
+if __name__ == "__main__":
+    main()
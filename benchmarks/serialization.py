@@ -0,0 +1,147 @@
+"""
+응답 직렬화 벤치마크: 스터디 주간 리포트(GET /studies/{study_id}/weekly-report), 멤버 300명
+
+DB 없이 멤버별 기록을 만들어 build_weekly_summary로 요약한 뒤, 응답 단계별 비용을 잰다.
+- 요약 생성: 모델마다 검증하며 생성(이전 방식) vs model_construct(지금)
+- 응답: response_model 재검증 + json.dumps(이전 FastAPI 기본 경로)
+        response_model 재검증 + orjson(default_response_class만 바꾼 경우)
+        재검증 없이 orjson(trusted_json, 지금 라우터)
+세 응답의 JSON이 같은지도 확인한다.
+
+실행:
+    python -m benchmarks.serialization --members 300 --subjects 5 --rounds 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# 앱 모듈을 import하기 전에 임시 DB로 바꿔둠 (DB 접근은 없지만 엔진 생성 시 실제 study.db를 건드리지 않도록)
+_tmpdir = tempfile.mkdtemp(prefix="serialization_")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_tmpdir) / 'bench.db'}"
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+
+from ai.weekly_summary_ai import (  # noqa: E402
+    SubjectWeeklySummary,
+    WeeklyOverallSummary,
+    WeeklySummaryResponse,
+    build_weekly_summary,
+)
+from app.core.responses import ORJSONResponse, trusted_json  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.study_report import ReportRow  # noqa: E402
+
+NAMES = ["국어", "수학", "영어", "한국사", "물리", "화학", "생명과학", "지구과학", "경제", "선형대수학"]
+
+
+def _make_members(members: int, subjects: int, week_start: date, seed: int):
+    rnd = random.Random(seed)
+    result = []
+    for uid in range(1, members + 1):
+        names = rnd.sample(NAMES, subjects)
+        records = [
+            ReportRow(week_start + timedelta(days=d), name, 60, 9, rnd.randint(30, 90), rnd.randint(3, 15))
+            for d in range(7)
+            for name in names
+            if rnd.random() < 0.7
+        ]
+        paces = {name: round(rnd.uniform(0.7, 1.4), 2) for name in names}
+        result.append((uid, records, paces))
+    return result
+
+
+def _validated(summary: WeeklySummaryResponse) -> WeeklySummaryResponse:
+    """이전 방식: 과목/전체 요약을 모델 생성자로 하나씩 검증하며 만듦"""
+    return WeeklySummaryResponse(
+        overall=WeeklyOverallSummary(**dict(summary.overall)),
+        subjects=[SubjectWeeklySummary(**dict(s)) for s in summary.subjects],
+    )
+
+
+def _report(study_id: int, week_start: date, week_end: date, summaries: dict) -> dict:
+    return {
+        "study_id": study_id,
+        "week_start": week_start,
+        "week_end": week_end,
+        "members": [
+            {"user_id": uid, "name": f"멤버{uid}", "email": f"member{uid}@example.com", "summary": summaries.get(uid)}
+            for uid in sorted(summaries)
+        ],
+    }
+
+
+def _timeit(fn, rounds: int):
+    times = []
+    result = None
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=300)
+    parser.add_argument("--subjects", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    week_start = date.today() - timedelta(days=date.today().weekday())
+    week_end = week_start + timedelta(days=6)
+    members = _make_members(args.members, args.subjects, week_start, args.seed)
+    route = next(r for r in app.routes if getattr(r, "path", None) == "/studies/{study_id}/weekly-report")
+
+    # 1) 멤버별 요약 생성
+    def build_validated():
+        return {uid: _validated(build_weekly_summary(rows, paces, week_start, week_end)).model_dump()
+                for uid, rows, paces in members}
+
+    def build_constructed():
+        return {uid: build_weekly_summary(rows, paces, week_start, week_end).model_dump()
+                for uid, rows, paces in members}
+
+    t_build_old, summaries_old = _timeit(build_validated, args.rounds)
+    t_build_new, summaries = _timeit(build_constructed, args.rounds)
+    assert summaries_old == summaries
+    report = _report(1, week_start, week_end, summaries)
+
+    # 2) 응답 만들기 (라우터가 돌려준 dict → body bytes)
+    loop = asyncio.new_event_loop()
+
+    def validated_body(response_class):
+        content = loop.run_until_complete(serialize_response(field=route.response_field, response_content=report))
+        return response_class(content).body
+
+    t_std, body_std = _timeit(lambda: validated_body(JSONResponse), args.rounds)
+    t_orjson, body_orjson = _timeit(lambda: validated_body(ORJSONResponse), args.rounds)
+    t_trusted, body_trusted = _timeit(lambda: trusted_json(report).body, args.rounds)
+    loop.close()
+
+    assert json.loads(body_std) == json.loads(body_orjson) == json.loads(body_trusted)
+
+    members_with_summary = sum(1 for m in report["members"] if m["summary"])
+    print(f"members={args.members} (요약 있음 {members_with_summary}) subjects={args.subjects} "
+          f"rounds={args.rounds} body={len(body_trusted) / 1024:.0f}KiB checks=ok")
+    print({
+        "build_validated_ms": round(t_build_old, 2),
+        "build_model_construct_ms": round(t_build_new, 2),
+        "response_validate_json_ms": round(t_std, 2),
+        "response_validate_orjson_ms": round(t_orjson, 2),
+        "response_trusted_orjson_ms": round(t_trusted, 2),
+        "total_before_ms": round(t_build_old + t_std, 2),
+        "total_after_ms": round(t_build_new + t_trusted, 2),
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+주간 요약 집계 벤치마크: 예전 방식(과목별 리스트 → 정렬 → 여러 번 순회) vs 스트리밍 누적기
+
+POST /ai/weekly-summary 핸들러를 직접 호출한다 (HTTP/pydantic 파싱 비용 제외).
+두 방식의 응답이 같은지도 확인한다.
+
+실행:
+    python -m benchmarks.weekly_summary --records 100000 --subjects 12 --rounds 5
+"""
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+import ai.weekly_summary_ai as ws
+
+
+def _make_request(n: int, subjects: int, days: int, seed: int) -> ws.WeeklySummaryRequest:
+    rnd = random.Random(seed)
+    start = date.today() - timedelta(days=days)
+    names = [f"과목{i}" for i in range(subjects)]
+    records = []
+    for _ in range(n):
+        t_min = rnd.randint(20, 120)
+        records.append(ws.WeeklyStudyRecord.model_construct(
+            record_date=start + timedelta(days=rnd.randrange(days)),
+            subject_name=rnd.choice(names),
+            target_minutes=t_min,
+            target_pages=rnd.randint(0, 30),
+            actual_minutes=max(1, int(t_min * rnd.uniform(0.5, 1.5))),
+            actual_pages=rnd.randint(0, 35),
+            difficulty=None,
+        ))
+    return ws.WeeklySummaryRequest.model_construct(records=records, week_start=None, week_end=None)
+
+
+# =====================
+# 예전 구현 (비교용)
+# =====================
+def _weighted_avg(pairs: List[Tuple[float, int]]) -> float:
+    total_w = sum(w for _, w in pairs)
+    if total_w <= 0:
+        return 0.0
+    return sum(val * w for val, w in pairs) / total_w
+
+
+def _legacy(request: ws.WeeklySummaryRequest) -> ws.WeeklySummaryResponse:
+    dates = sorted({r.record_date for r in request.records})
+    by_subject: Dict[str, list] = {}
+    for r in request.records:
+        by_subject.setdefault(r.subject_name, []).append(r)
+
+    def ratio(r):
+        return ws._calc_efficiency_ratio(r.target_pages, r.target_minutes, r.actual_pages, r.actual_minutes)
+
+    subjects_out = []
+    totals = [0, 0, 0, 0]
+    overall_pairs = []
+    for name, records in by_subject.items():
+        rs = sorted(records, key=lambda x: (x.record_date, x.subject_name))
+        t_min = sum(r.target_minutes for r in rs)
+        a_min = sum(r.actual_minutes for r in rs)
+        t_pg = sum(r.target_pages for r in rs)
+        a_pg = sum(r.actual_pages for r in rs)
+        for i, v in enumerate((t_min, a_min, t_pg, a_pg)):
+            totals[i] += v
+
+        pairs = [(ratio(r), r.actual_minutes) for r in rs]
+        ratios = [p for p, _ in pairs]
+        overall_pairs.extend(pairs)
+        eff = ws._round2(_weighted_avg(pairs))
+
+        n = len(ratios)
+        mean = sum(ratios) / n
+        consistency = ws._consistency_from_var(sum((x - mean) ** 2 for x in ratios) / n, n)
+
+        # 날짜 단위로 초반/후반: n//2번째 기록이 걸친 날짜는 기록이 더 많이 속한 쪽으로
+        halves = ([], [])
+        seen = 0
+        days: Dict[date, list] = {}
+        for r in rs:
+            days.setdefault(r.record_date, []).append(r)
+        for d in sorted(days):
+            day = days[d]
+            halves[0 if seen * 2 + len(day) <= (len(rs) // 2) * 2 else 1].extend(day)
+            seen += len(day)
+        if len(rs) < 4 or not halves[0] or not halves[1]:
+            trend = "UNKNOWN"
+        else:
+            a = _weighted_avg([(ratio(r), r.actual_minutes) for r in halves[0]])
+            b = _weighted_avg([(ratio(r), r.actual_minutes) for r in halves[1]])
+            trend = ws._trend_from_halves(a, b)
+
+        subjects_out.append(ws.SubjectWeeklySummary(
+            subject_name=name,
+            total_target_minutes=t_min,
+            total_actual_minutes=a_min,
+            total_target_pages=t_pg,
+            total_actual_pages=a_pg,
+            avg_target_speed_ppm=ws._round2(ws._safe_div(t_pg, t_min)),
+            avg_actual_speed_ppm=ws._round2(ws._safe_div(a_pg, a_min)),
+            weighted_efficiency_ratio=eff,
+            consistency_score=consistency,
+            trend=trend,
+            feedback=ws._feedback_from_efficiency(name, eff),
+        ))
+    subjects_out.sort(key=lambda s: s.total_actual_minutes, reverse=True)
+
+    overall_eff = ws._round2(_weighted_avg(overall_pairs))
+    overall = ws.WeeklyOverallSummary(
+        week_start=dates[0],
+        week_end=dates[-1],
+        total_target_minutes=totals[0],
+        total_actual_minutes=totals[1],
+        total_target_pages=totals[2],
+        total_actual_pages=totals[3],
+        avg_target_speed_ppm=ws._round2(ws._safe_div(totals[2], totals[0])),
+        avg_actual_speed_ppm=ws._round2(ws._safe_div(totals[3], totals[1])),
+        weighted_efficiency_ratio=overall_eff,
+        overall_feedback=ws._overall_feedback(overall_eff, totals[1]),
+    )
+    return ws.WeeklySummaryResponse(overall=overall, subjects=subjects_out)
+
+
+def _measure(fn, request, rounds: int) -> dict:
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(request)
+        times.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    fn(request)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(times), 1),
+        "min_ms": round(min(times), 1),
+        "peak_extra_kb": round(peak / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--subjects", type=int, default=12)
+    parser.add_argument("--days", type=int, default=120, help="기록 날짜 범위 (한 학기 ≈ 120일)")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # pace_factor 조회(DB)는 비교 대상이 아니므로 끔
+    ws.get_pace_factors = None
+    request = _make_request(args.records, args.subjects, args.days, args.seed)
+
+    same = _legacy(request).model_dump() == ws.build_weekly_summary(request.records).model_dump()
+    print(f"records={args.records} subjects={args.subjects} identical_output={same}")
+    print("legacy   ", _measure(_legacy, request, args.rounds))
+    print("streaming", _measure(ws.weekly_summary, request, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
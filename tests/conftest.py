@@ -0,0 +1,101 @@
+"""
+테스트 공통 설정.
+
+- 임시 SQLite DB에 마이그레이션 + 가상 데이터(benchmarks.dataset)를 한 번 채워서 세션 동안 공유
+- app.pytest_plugin: 요청당 SQL 예산 검사 (query_budget fixture / assert_every_route_has_budget)
+앱 모듈이 settings를 읽기 전에 환경 변수를 정해야 하므로 여기서는 앱을 import하지 않고 fixture 안에서 import한다.
+"""
+import os
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+ADMIN_EMAIL = "bench1@example.com"  # benchmarks.dataset의 첫 번째 유저
+
+_tmpdir = tempfile.mkdtemp(prefix="study_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_tmpdir) / 'test.db'}"
+os.environ["ADMIN_EMAILS"] = ADMIN_EMAIL
+os.environ["PREPLAN_ENABLED"] = "false"
+os.environ["PROFILING_ENABLED"] = "true"  # 미들웨어만 붙음. 실제로 켜는 건 PUT /admin/profiling
+
+pytest_plugins = ["app.pytest_plugin"]
+
+
+@pytest.fixture(scope="session")
+def seeded_db():
+    """마이그레이션 + 가상 데이터 (유저 40명, 1개월). 반환: 테이블별 생성 건수"""
+    from app.core.database import SessionLocal, engine
+    from app.migrations import upgrade
+    from benchmarks.dataset import generate
+
+    upgrade(engine)
+    with SessionLocal() as db:
+        return generate(db, users=40, months=1, seed=7, log=lambda _: None)
+
+
+@pytest.fixture(scope="session")
+def app(seeded_db):
+    from app.main import app as fastapi_app
+
+    return fastapi_app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _auth(user_id: int) -> dict:
+    from app.core.security import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token({'user_id': user_id})}"}
+
+
+@pytest.fixture(scope="session")
+def owner(seeded_db) -> dict:
+    """관리자이자 스터디 owner인 유저(ADMIN_EMAIL)와 그 스터디 / 과목"""
+    from sqlalchemy import select
+
+    from app.core.database import SessionLocal
+    from app.models import StudyMember, Subject, User
+
+    with SessionLocal() as db:
+        user_id = db.execute(select(User.id).where(User.email == ADMIN_EMAIL)).scalar_one()
+        study_id = db.execute(
+            select(StudyMember.study_id)
+            .where(StudyMember.user_id == user_id, StudyMember.role == "owner")
+            .order_by(StudyMember.study_id)
+        ).scalars().first()
+        subjects = db.execute(
+            select(Subject.id, Subject.difficulty).where(Subject.user_id == user_id).order_by(Subject.id)
+        ).all()
+    return {
+        "user_id": user_id,
+        "headers": _auth(user_id),
+        "study_id": study_id,
+        "subjects": [{"subject_id": sid, "difficulty": difficulty or 3} for sid, difficulty in subjects],
+    }
+
+
+@pytest.fixture(scope="session")
+def member(seeded_db, owner) -> dict:
+    """owner와 다른 유저 (초대 수락 / 탈퇴용)"""
+    from sqlalchemy import select
+
+    from app.core.database import SessionLocal
+    from app.models import User
+
+    with SessionLocal() as db:
+        user_id = db.execute(select(User.id).where(User.id != owner["user_id"]).order_by(User.id)).scalars().first()
+    return {"user_id": user_id, "headers": _auth(user_id)}
+
+
+@pytest.fixture
+def month_range() -> dict:
+    today = date.today()
+    return {"start": str(today - timedelta(days=30)), "end": str(today)}
@@ -0,0 +1,24 @@
+"""
+인증 없는 /ai/daily-goal/batch: item의 user_id는 표시용이고, 그 유저의 개인 pace를 읽지 않는다.
+"""
+from fastapi.testclient import TestClient
+
+from app.services.pace_store import pace_store
+
+
+def test_batch_uses_shared_paces_only(seeded_db, owner):
+    from ai.study_goal import app as ai_app
+
+    name = "배치 pace 확인용 과목"
+    pace_store.set_many(owner["user_id"], {name: 1.8})
+    body = {"total_minutes": 120, "subjects": [{"name": name, "importance": 3, "difficulty": 3, "total_pages": 300}]}
+
+    with TestClient(ai_app) as client:
+        res = client.post("/ai/daily-goal/batch", json={"items": [{"user_id": owner["user_id"], **body}, body]})
+        single = client.post("/ai/daily-goal", json=body).json()
+
+    assert res.status_code == 200
+    tagged, anonymous = res.json()["results"]
+    assert tagged["user_id"] == owner["user_id"]
+    assert tagged["goals"] == anonymous["goals"] == single["goals"]
+    assert tagged["goals"][0]["pace_factor"] == 1.0
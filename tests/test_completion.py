@@ -0,0 +1,38 @@
+"""
+complete-records 처리(completion.complete_pending): 같은 PENDING 목표를 두 번 제출해도 한 번만 완료·집계된다.
+"""
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from app.core.database import SessionLocal
+from app.services import completion, daily_stats, ranking, weekly_summary
+from app.services.daily_plan import plan_day
+
+
+def _submit(owner, subject):
+    item = SimpleNamespace(subject_id=subject["subject_id"], actual_minutes=40, actual_pages=5)
+    with SessionLocal() as db:
+        done = completion.complete_pending(db, owner["user_id"], [item])
+        db.commit()
+    return done
+
+
+def test_same_record_submitted_twice_is_counted_once(owner, monkeypatch):
+    subject = owner["subjects"][0]
+    plan_date = date.today() + timedelta(days=40)
+    with SessionLocal() as db:
+        plan_day(db, owner["user_id"], 60, [(subject["subject_id"], subject["difficulty"])], plan_date)
+        db.commit()
+        # 두 요청이 동시에 같은 PENDING 기록을 읽은 상황: 두 번째 제출도 이 (이미 완료된) 기록을 대상으로 함
+        stale = completion.latest_pending(db, owner["user_id"], [subject["subject_id"]])
+    monkeypatch.setattr(completion, "latest_pending", lambda db, user_id, subject_ids: stale)
+
+    first = _submit(owner, subject)
+    second = _submit(owner, subject)
+
+    assert [d["record_id"] for d in first] == [stale[subject["subject_id"]].id]
+    assert second == []
+    with SessionLocal() as db:
+        assert ranking.check(db) == []
+        assert weekly_summary.check(db, user_id=owner["user_id"]) == []
+        assert daily_stats.check(db, user_id=owner["user_id"]) == []
@@ -0,0 +1,45 @@
+"""
+/study-goal/calculate의 계획(daily_plan.plan_day) SQL 개수: 과목 수와 상관없이
+과목 IN 조회 1번 + pace 조회 1번 + 기존 PENDING 삭제 1번 + bulk INSERT 1번.
+"""
+from datetime import date, timedelta
+
+from app.core.database import SessionLocal
+from app.core.query_budget import counting
+from app.services.daily_plan import plan_day
+from app.services.pace_store import pace_store
+
+PLAN_DAY_STATEMENTS = 4
+
+
+def _plan(user_id: int, subjects: list, plan_date: date):
+    pace_store.invalidate(user_id)  # 캐시 상태와 상관없이 pace 조회까지 세도록
+    with SessionLocal() as db, counting() as queries:
+        goals = plan_day(db, user_id, 180, [(s["subject_id"], s["difficulty"]) for s in subjects], plan_date)
+        db.rollback()
+    return goals, queries
+
+
+def test_plan_day_statements_do_not_grow_with_subjects(owner):
+    subjects = owner["subjects"]
+    assert len(subjects) > 1
+    plan_date = date.today() + timedelta(days=30)
+
+    one_goals, one = _plan(owner["user_id"], subjects[:1], plan_date)
+    all_goals, many = _plan(owner["user_id"], subjects, plan_date)
+
+    assert len(one_goals) == 1 and len(all_goals) == len(subjects)
+    assert one.total == many.total == PLAN_DAY_STATEMENTS, dict(many.shapes)
+    assert max(many.shapes.values()) == 1, dict(many.shapes)
+
+
+def test_calculate_route_statements(client, owner, query_budget):
+    client.get("/study-goal/today", headers=owner["headers"])  # 인증 캐시를 채워서 유저 조회를 빼고 셈
+    pace_store.invalidate(owner["user_id"])
+    res = client.post(
+        "/study-goal/calculate",
+        headers=owner["headers"],
+        json={"total_minutes": 180, "subjects": owner["subjects"]},
+    )
+    assert res.status_code == 200, res.text
+    assert int(res.headers["x-query-count"]) == PLAN_DAY_STATEMENTS
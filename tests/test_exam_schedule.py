@@ -0,0 +1,74 @@
+"""
+시험 일정 계획(exam_schedule.plan_schedule / replan): 시간이 충분하면 남은 페이지를 다 배분하고,
+모자라면 과목별로 같은 비율만큼 줄이며, replan은 실제로 한 페이지를 빼고 다음 날부터 다시 계산한다.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.exam_schedule import ExamSubject, pages_per_minute, plan_schedule, replan
+
+START = date(2026, 3, 2)
+
+
+def _subjects(exam_days):
+    return [
+        ExamSubject(subject_id=1, name="국어", remaining_pages=180, difficulty=2, pace=1.0,
+                    exam_date=START + timedelta(days=exam_days[0]), importance=4),
+        ExamSubject(subject_id=2, name="수학", remaining_pages=120, difficulty=5, pace=0.8,
+                    exam_date=START + timedelta(days=exam_days[1]), importance=5),
+        ExamSubject(subject_id=3, name="영어", remaining_pages=250, difficulty=None, pace=1.3,
+                    exam_date=START + timedelta(days=exam_days[2]), importance=2),
+    ]
+
+
+def _pages_by_subject(plan):
+    pages = {}
+    for day in plan["days"]:
+        for goal in day["goals"]:
+            pages[goal["subject_id"]] = pages.get(goal["subject_id"], 0) + goal["pages"]
+    return pages
+
+
+def test_enough_capacity_plans_every_remaining_page():
+    subjects = _subjects([7, 12, 20])
+    plan = plan_schedule(START, [240] * 20, subjects)
+
+    assert plan["feasible"]
+    assert _pages_by_subject(plan) == {s.subject_id: s.remaining_pages for s in subjects}
+    exams = {s.subject_id: s.exam_date for s in subjects}
+    for day in plan["days"]:
+        assert sum(g["minutes"] for g in day["goals"]) + day["free_minutes"] == day["capacity"]
+        assert all(day["date"] < exams[g["subject_id"]] for g in day["goals"])
+
+
+def test_shortfall_is_shared_in_proportion():
+    subjects = _subjects([10, 10, 10])
+    capacity = [60] * 10
+    needed = sum(s.remaining_pages / pages_per_minute(s) for s in subjects)
+    ratio = sum(capacity) / needed
+    assert ratio < 0.5
+
+    plan = plan_schedule(START, capacity, subjects)
+
+    assert not plan["feasible"]
+    for row in plan["subjects"]:
+        assert row["shortfall_pages"] > 0
+        assert row["planned_pages"] / row["remaining_pages"] == pytest.approx(ratio, abs=0.02)
+    assert _pages_by_subject(plan) == {row["subject_id"]: row["planned_pages"] for row in plan["subjects"]}
+
+
+def test_replan_subtracts_actual_pages():
+    subjects = _subjects([7, 12, 20])
+    capacity = [240] * 20
+    actual = {1: 40, 2: 500}  # 남은 양보다 많이 하면 0으로
+
+    plan = replan(START, capacity, subjects, actual, paces={3: 1.5})
+
+    remaining = {row["subject_id"]: row["remaining_pages"] for row in plan["subjects"]}
+    assert remaining == {1: 140, 2: 0, 3: 250}
+    assert plan["days"][0]["date"] == START + timedelta(days=1)
+    assert len(plan["days"]) == len(capacity) - 1
+    assert plan["feasible"]
+    assert {sid: pages for sid, pages in _pages_by_subject(plan).items() if pages} == {1: 140, 3: 250}
+    assert next(row for row in plan["subjects"] if row["subject_id"] == 3)["pace_factor"] == 1.5
@@ -0,0 +1,38 @@
+"""
+pace 재계산(pace_replay): 기록 이력을 벡터화해서 다시 흘린 값이
+complete-records의 실시간 갱신(completion.efficiency_ratio → pace_store.ema)과 같다.
+"""
+import random
+
+import numpy as np
+
+from app.services import pace_replay
+from app.services.completion import efficiency_ratio
+from app.services.pace_store import DEFAULT_PACE, EMA_ALPHA, ema
+
+
+def _record(rnd):
+    """(target_minutes, target_pages, actual_minutes, actual_pages). 0분 / 0페이지 같은 경계값 포함"""
+    return (rnd.choice([0, 30, 60, 90]), rnd.choice([0, 5, 12]), rnd.choice([0, 20, 45, 75]), rnd.randint(0, 20))
+
+
+def test_replay_series_matches_live_ema():
+    rnd = random.Random(3)
+    lengths = [0, 1, 2, 7, 30, 30, 120]  # 길이가 다른 시리즈 (빈 시리즈 포함)
+    series = [[_record(rnd) for _ in range(n)] for n in lengths]
+    records = [r for s in series for r in s]
+    series_ids = np.repeat(np.arange(len(series)), lengths)
+    t_min, t_pg, a_min, a_pg = (np.array(col, dtype=np.float64) for col in zip(*records))
+
+    for alpha in (EMA_ALPHA, 0.5, 1.0):
+        live = []
+        for s in series:
+            pace = DEFAULT_PACE
+            for tm, tp, am, ap in s:
+                pace = ema(pace, efficiency_ratio(tp, tm, ap, am), alpha)
+            live.append(pace)
+
+        ratios = pace_replay.efficiency_ratios(t_min, t_pg, a_min, a_pg)
+        replayed = pace_replay.replay_series(series_ids, ratios, len(series), alpha)
+
+        assert replayed.tolist() == live
@@ -0,0 +1,104 @@
+"""
+다음 날 목표 미리 계산(preplan): daily_plan.allocate와 같은 결과, 중단 후 이어하기, 이미 계획한 유저 건너뛰기.
+"""
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.database import SessionLocal
+from app.models import StudyRecord
+from app.services import preplan
+from app.services.daily_plan import allocate, plan_day
+
+
+def _planned(db, plan_date):
+    """plan_date에 배치가 만든 목표 {user_id: [(subject_id, target_minutes, target_pages)]}"""
+    planned = {}
+    for uid, sid, minutes, pages in db.execute(
+        select(StudyRecord.user_id, StudyRecord.subject_id, StudyRecord.target_minutes, StudyRecord.target_pages)
+        .where(StudyRecord.record_date == plan_date, StudyRecord.source == preplan.SOURCE)
+        .order_by(StudyRecord.user_id, StudyRecord.id)
+    ):
+        planned.setdefault(uid, []).append((sid, minutes, pages))
+    return planned
+
+
+def test_plan_chunk_matches_daily_plan_allocate():
+    rnd = random.Random(11)
+    users, paces = {}, {}
+    for uid in range(1, 60):
+        subjects = {}
+        for k in range(rnd.randint(1, 6)):
+            sid = uid * 10 + k
+            subjects[sid] = SimpleNamespace(
+                subject_id=sid,
+                target_minutes=rnd.choice([0, 25, 40, 90]),
+                name=f"과목{k}",
+                importance=0 if uid % 13 == 0 else rnd.randint(1, 5),  # 가중치 합이 0인 유저도 섞음
+                total_pages=rnd.randint(1, 600),
+                difficulty=rnd.choice([None, 1, 2, 3, 4, 5]),
+            )
+            paces[(uid, f"과목{k}")] = round(rnd.uniform(0.5, 1.8), 2)
+        users[uid] = subjects
+
+    expected = []
+    for uid, subjects in users.items():
+        total = sum(row.target_minutes for row in subjects.values())
+        goals = allocate(
+            total,
+            [(SimpleNamespace(id=row.subject_id, name=row.name, importance=row.importance, total_pages=row.total_pages),
+              row.difficulty) for row in subjects.values()],
+            {name: pace for (u, name), pace in paces.items() if u == uid},
+        )
+        expected += [
+            {"user_id": uid, "subject_id": g["subject_id"], "target_minutes": g["target_minutes"], "target_pages": g["target_pages"]}
+            for g in goals
+        ]
+
+    assert {g["user_id"] for g in expected} < set(users)
+    assert preplan.plan_chunk(users, paces) == expected
+
+
+def test_run_resumes_from_checkpoint(seeded_db):
+    plan_date = date.today() + timedelta(days=1)
+    with SessionLocal() as db:
+        _, everyone = preplan._load_chunk(db, plan_date, 0, 10**6)
+        expected = {g["user_id"] for g in preplan.plan_chunk(everyone, preplan._load_paces(db, everyone))}
+
+        def crash(progress):
+            raise RuntimeError("중단")
+
+        with pytest.raises(RuntimeError):
+            preplan.run(db, plan_date=plan_date, chunk_size=7, on_chunk=crash)
+        first = _planned(db, plan_date)
+        assert 0 < len(first) < len(expected)
+
+        stats = preplan.run(db, plan_date=plan_date, chunk_size=7)
+        assert stats["resumed_from_user_id"] == max(first)
+        assert stats["users"] == len(expected) - len(first)
+
+        planned = _planned(db, plan_date)
+        assert set(planned) == expected
+        assert {uid: planned[uid] for uid in first} == first  # 이미 처리한 청크는 다시 만들지 않음
+        assert preplan.run(db, plan_date=plan_date)["already_done"]
+
+
+def test_run_skips_users_already_planned(seeded_db, owner):
+    plan_date = date.today() + timedelta(days=2)
+    subject = owner["subjects"][0]
+    with SessionLocal() as db:
+        assert owner["user_id"] in preplan._load_chunk(db, plan_date, 0, 10**6)[1]  # 활성 유저
+        plan_day(db, owner["user_id"], 45, [(subject["subject_id"], subject["difficulty"])], plan_date)
+        db.commit()
+
+        stats = preplan.run(db, plan_date=plan_date)
+
+        assert stats["users"] > 0
+        assert owner["user_id"] not in _planned(db, plan_date)
+        assert db.execute(
+            select(func.count()).select_from(StudyRecord)
+            .where(StudyRecord.user_id == owner["user_id"], StudyRecord.record_date == plan_date)
+        ).scalar() == 1
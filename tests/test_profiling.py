@@ -0,0 +1,47 @@
+"""관리자 전용 요청 프로파일링 (app.core.profiling): 관리자가 켠 동안에만, 관리자 자신의 권한으로만 실행"""
+import pytest
+from sqlalchemy import event
+
+from app.core.database import engine
+from app.core.profiling import _before
+
+
+@pytest.fixture
+def profiling_on(client, owner):
+    assert client.put("/admin/profiling", params={"active": True}, headers=owner["headers"]).json()["active"]
+    yield
+    client.put("/admin/profiling", params={"active": False}, headers=owner["headers"])
+
+
+def test_profile_flag_is_ignored_until_turned_on(client, owner):
+    assert client.get("/admin/profiling", headers=owner["headers"]).json() == {"enabled": True, "active": False}
+    res = client.get("/studies/list", headers={**owner["headers"], "X-Profile": "1"})
+    assert res.status_code == 200
+    assert "x-profile-id" not in res.headers
+    # 꺼져 있으면 SQL 훅도 붙어 있지 않음
+    assert not event.contains(engine, "before_cursor_execute", _before)
+
+
+def test_admin_can_profile_request(client, owner, profiling_on):
+    assert event.contains(engine, "before_cursor_execute", _before)
+    res = client.get("/studies/list", headers={**owner["headers"], "X-Profile": "1"})
+    assert res.status_code == 200
+    profile = client.get(f"/admin/profiles/{res.headers['x-profile-id']}", headers=owner["headers"]).json()
+    assert profile["admin_user_id"] == owner["user_id"]
+    assert profile["sql_summary"]["statements"] >= 1
+
+
+def test_profile_flag_is_ignored_for_non_admin(client, member, profiling_on):
+    res = client.get("/studies/list", headers={**member["headers"], "X-Profile": "1"})
+    assert res.status_code == 200
+    assert "x-profile-id" not in res.headers
+
+
+def test_profile_runs_as_the_admin_only(client, owner, member, profiling_on):
+    # 예전 X-Profile-User 헤더로 다른 유저 권한을 얻을 수 없어야 함
+    res = client.get(
+        "/studies/list",
+        headers={**owner["headers"], "X-Profile": "1", "X-Profile-User": str(member["user_id"])},
+    )
+    assert res.status_code == 200
+    assert res.json() == client.get("/studies/list", headers=owner["headers"]).json()
@@ -0,0 +1,89 @@
+"""
+라우트별 SQL 예산(@query_budget) 검사: 가상 데이터가 채워진 DB에 모든 라우트를 실제로 호출한다.
+예산을 넘거나 같은 SQL이 반복(N+1)되면 앱이 500으로 응답하고 query_budget fixture가 위반 내용을 보여준다.
+새 라우트를 추가하면 test_routes_within_budget에도 호출을 추가할 것 (빠지면 마지막 검사에서 실패).
+"""
+from datetime import date, timedelta
+
+from app.pytest_plugin import assert_every_route_has_budget
+
+# Google OAuth 서버와 통신해야 해서 테스트에서 호출하지 않는 라우트
+EXTERNAL = {("GET", "/auth/google/login"), ("GET", "/auth/google/callback")}
+
+
+def _api_routes(app) -> set:
+    return {
+        (method, route.path)
+        for route in app.routes
+        if getattr(route, "endpoint", None) is not None and getattr(route, "include_in_schema", True)
+        for method in getattr(route, "methods", None) or ()
+    }
+
+
+def test_every_route_has_budget(app):
+    assert_every_route_has_budget(app)
+
+
+def test_routes_within_budget(app, client, owner, member, month_range, query_budget):
+    called = set()
+
+    def call(method, template, expected=200, headers=owner["headers"], params=None, json=None, **path):
+        res = client.request(method, template.format(**path), headers=headers, params=params, json=json)
+        assert res.status_code == expected, f"{method} {template}: {res.status_code} {res.text[:1000]}"
+        called.add((method, template))
+        return res
+
+    study_id = owner["study_id"]
+    subjects = owner["subjects"]
+    today = date.today()
+
+    call("GET", "/", headers=None)
+    call("GET", "/ping", headers=None)
+    call("POST", "/users/", headers=None, json={"email": "new-user@example.com", "name": "새 유저"})
+    call("GET", "/users/", headers=None)
+
+    # 스터디 / 과목
+    new_study = call("POST", "/studies/", json={"name": "테스트 스터디", "fine_per_absence": 1000}).json()["id"]
+    call("GET", "/studies/list")
+    call("POST", "/subjects/{study_id}", json={"name": "새 과목"}, study_id=new_study)
+    call("PATCH", "/studies/{study_id}/fine", params={"fine_per_absence": 2000}, study_id=new_study)
+
+    # 오늘 목표 → 완료
+    call("POST", "/study-goal/calculate", json={"total_minutes": 180, "subjects": subjects})
+    call("GET", "/study-goal/today")
+    call("POST", "/study-goal/complete-records", json={
+        "records": [{"subject_id": s["subject_id"], "actual_minutes": 50, "actual_pages": 6} for s in subjects],
+    })
+    call("POST", "/study-goal/schedule", json={
+        "exams": [{"subject_id": s["subject_id"], "exam_date": str(today + timedelta(days=14))} for s in subjects],
+        "daily_minutes": 180,
+    })
+
+    # 조회 / 리포트
+    call("GET", "/records/my-monthly-settlement")
+    call("GET", "/studies/{study_id}/ranking", study_id=study_id)
+    call("GET", "/studies/{study_id}/ranking/me", study_id=study_id)
+    call("GET", "/studies/{study_id}/weekly-report", study_id=study_id)
+    call("GET", "/studies/{study_id}/settlement", study_id=study_id)
+    call("GET", "/ai/weekly-summary")
+    call("GET", "/ai/analytics", params={**month_range, "group_by": "week"})
+
+    # 초대 → 가입 → 탈퇴, 초대 폐기, 스터디 삭제
+    invite = call("POST", "/studies/{study_id}/invites", json={}, study_id=new_study).json()
+    token = invite["invite_url"].rsplit("/", 1)[1]
+    call("GET", "/invites/{token}", headers=None, token=token)
+    call("POST", "/invites/{token}/accept", headers=member["headers"], token=token)
+    call("DELETE", "/studies/{study_id}/leave", headers=member["headers"], study_id=new_study)
+    call("POST", "/studies/{study_id}/invites/{invite_id}/revoke", study_id=new_study, invite_id=invite["invite_id"])
+    call("DELETE", "/studies/{study_id}/delete", study_id=new_study)
+
+    # 관리자
+    call("POST", "/admin/pace/replay", params={"dry_run": True})
+    call("GET", "/admin/profiling")
+    call("PUT", "/admin/profiling", params={"active": False})
+    call("GET", "/admin/profiles")
+    call("GET", "/admin/profiles/{profile_id}", expected=404, profile_id="missing")
+    call("GET", "/admin/profiles/{profile_id}/collapsed", expected=404, profile_id="missing")
+
+    missing = _api_routes(app) - EXTERNAL - called
+    assert not missing, "호출하지 않은 라우트: " + ", ".join(f"{m} {p}" for m, p in sorted(missing))
@@ -0,0 +1,38 @@
+"""
+스터디 랭킹 조회(ranking.top / my_rank): 랭킹 행이 없는 멤버까지 같은 멤버 집합 · 같은 순위로 센다.
+"""
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models import Study, StudyMember, StudyRanking, User
+from app.services import ranking
+
+
+def test_top_and_my_rank_agree_on_ties_pages_and_members_without_row(seeded_db):
+    # (출석, 분). None = 랭킹 행 없음 (아직 완료 기록이 없는 멤버)
+    scores = [(5, 100), (3, 50), (3, 50), (1, 10), None, (0, 0), None]
+    with SessionLocal() as db:
+        users = db.execute(select(User).order_by(User.id.desc()).limit(len(scores) + 1)).scalars().all()
+        members, outsider = users[:-1], users[-1]
+        study = Study(name="랭킹 확인용 스터디", fine_per_absence=0)
+        db.add(study)
+        db.flush()
+        for user, score in zip(members, scores):
+            db.add(StudyMember(study_id=study.id, user_id=user.id))
+            if score is not None:
+                db.add(StudyRanking(study_id=study.id, user_id=user.id, attendance_count=score[0], total_minutes=score[1]))
+        # 탈퇴한 유저의 랭킹 행은 어느 쪽에도 안 보임
+        db.add(StudyRanking(study_id=study.id, user_id=outsider.id, attendance_count=9, total_minutes=999))
+        db.commit()
+
+        full = ranking.top(db, study.id, limit=100)
+        assert full["total"] == len(members)
+        assert [item["rank"] for item in full["items"]] == [1, 2, 2, 4, 5, 5, 5]
+        assert outsider.id not in {item["user_id"] for item in full["items"]}
+
+        # 페이지를 나눠도 순위가 같고 (동점이 페이지 경계에 걸쳐도), my_rank와도 같음
+        paged = [item for offset in range(0, len(members), 2) for item in ranking.top(db, study.id, 2, offset)["items"]]
+        assert paged == full["items"]
+        for item in full["items"]:
+            user = next(u for u in members if u.id == item["user_id"])
+            assert ranking.my_rank(db, study.id, user) == item
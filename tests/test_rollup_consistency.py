@@ -0,0 +1,57 @@
+"""
+롤업 정합성: 가상 데이터 DB에서 목표 → complete-records → 일 마감 정산을 거친 뒤
+증분 반영한 롤업이 study_records 전체 재집계(check)와 같아야 한다.
+"""
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models import Subject
+from app.services import completion, daily_stats, settlement, weekly_summary
+from app.services.daily_plan import plan_day
+
+
+def _complete_and_settle(db, day: date, seed: int, users: int = 12) -> int:
+    """
+    유저 몇 명의 day 목표를 만들고 일부만 제출(🔺 / O / X 섞임)한 뒤 그날을 마감.
+    반환: 완료 처리된 기록 수
+    """
+    rnd = random.Random(seed)
+    by_user = {}
+    for user_id, subject_id, difficulty in db.execute(
+        select(Subject.user_id, Subject.id, Subject.difficulty)
+        .where(Subject.study_id.is_not(None))
+        .order_by(Subject.user_id, Subject.id)
+    ):
+        by_user.setdefault(user_id, []).append((subject_id, difficulty or 3))
+
+    completed = 0
+    for user_id in list(by_user)[:users]:
+        subjects = by_user[user_id]
+        plan_day(db, user_id, rnd.choice([60, 120, 240]), subjects, day)
+        db.commit()
+        submitted = [
+            SimpleNamespace(subject_id=sid, actual_minutes=rnd.randint(0, 150), actual_pages=rnd.randint(0, 25))
+            for sid, _ in subjects
+            if rnd.random() < 0.6
+        ]
+        completed += len(completion.complete_pending(db, user_id, submitted))
+        db.commit()
+
+    settlement.run_day(db, day)
+    return completed
+
+
+def test_weekly_summary_matches_records_after_completion_and_settlement(seeded_db):
+    with SessionLocal() as db:
+        assert _complete_and_settle(db, date.today() - timedelta(days=5), seed=1) > 0
+        assert weekly_summary.check(db) == []
+
+
+def test_daily_stats_match_records_after_completion_and_settlement(seeded_db):
+    with SessionLocal() as db:
+        assert _complete_and_settle(db, date.today() - timedelta(days=4), seed=2) > 0
+        assert daily_stats.check(db) == []
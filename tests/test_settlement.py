@@ -0,0 +1,51 @@
+"""
+일 마감 정산(settlement.settle_study_day): 남은 PENDING만 목표 미달(X)로 바꾸고, 바꾼 행만 롤업에 한 번 반영한다.
+"""
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models import Study, StudyRecord, Subject
+from app.services import completion, daily_stats, ranking, settlement, weekly_summary
+from app.services.daily_plan import plan_day
+
+
+def test_settlement_counts_only_rows_still_pending(owner):
+    day = date.today() - timedelta(days=2)
+    with SessionLocal() as db:
+        study_id, fine = db.execute(
+            select(Study.id, Study.fine_per_absence).join(Subject, Subject.study_id == Study.id)
+            .where(Subject.user_id == owner["user_id"])
+        ).first()
+        subject_ids = db.execute(
+            select(Subject.id).where(Subject.user_id == owner["user_id"], Subject.study_id == study_id)
+        ).scalars().all()
+        plan_day(db, owner["user_id"], 120, [(sid, 3) for sid in subject_ids], day)
+        db.commit()
+
+        # 첫 과목은 정산 전에 완료됨 → 정산은 나머지만 X로
+        done = completion.complete_pending(
+            db, owner["user_id"], [SimpleNamespace(subject_id=subject_ids[0], actual_minutes=30, actual_pages=4)]
+        )
+        db.commit()
+        result = settlement.settle_study_day(db, study_id, fine, day)
+        db.commit()
+
+        assert len(done) == 1
+        assert result["missed"] == len(subject_ids) - 1
+        # 정산 뒤에 들어온 제출은 그날 남은 PENDING이 없으므로 그날 기록을 바꾸지 않음
+        day_statuses = select(StudyRecord.id, StudyRecord.status).where(
+            StudyRecord.subject_id == subject_ids[-1], StudyRecord.record_date == day
+        )
+        settled = db.execute(day_statuses).all()
+        completion.complete_pending(
+            db, owner["user_id"], [SimpleNamespace(subject_id=subject_ids[-1], actual_minutes=30, actual_pages=4)]
+        )
+        db.commit()
+        assert db.execute(day_statuses).all() == settled
+
+        assert ranking.check(db, study_id=study_id) == []
+        assert weekly_summary.check(db, user_id=owner["user_id"]) == []
+        assert daily_stats.check(db, user_id=owner["user_id"]) == []